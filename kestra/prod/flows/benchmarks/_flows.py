@@ -0,0 +1,30 @@
+"""
+Lädt die Flow-Skripte (Dateinamen mit Bindestrich) als Module für die Benchmarks.
+"""
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+FLOWS_DIR = Path(__file__).resolve().parent.parent
+
+
+def ensure_lib_path() -> None:
+    """Macht lib.* importierbar; die Skripte importieren relativ zum Flow-Verzeichnis."""
+    if str(FLOWS_DIR) not in sys.path:
+        sys.path.insert(0, str(FLOWS_DIR))
+
+
+ensure_lib_path()
+
+
+def load_flow(file_name: str) -> ModuleType:
+    """Importiert z. B. 'import-dogs-from-chromosoft-csv.py' einmalig als Modul."""
+    module_name = file_name[:-3].replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, FLOWS_DIR / file_name)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Differenzieller Vergleich und Benchmark der Datumsparser.
+
+Prüft lib.date_parsing.DateParser gegen die bisherigen strptime-Implementierungen
+(parse_iso_date der Hunde, ChromosoftMember.parse_date der Mitglieder, unten
+eingefroren) auf allen Kalendertagen eines Zeitraums in allen Schreibweisen sowie auf
+Grenzfällen und Zufallswerten. Jede Abweichung beendet das Skript mit Exit-Code 1.
+
+# python benchmarks/bench_date_parsing.py --values 200000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, List, Optional
+
+import _flows
+
+_flows.ensure_lib_path()
+
+from lib.chromosoft_member import MEMBER_DATE_FORMATS  # noqa: E402
+from lib.date_parsing import DateParser  # noqa: E402
+
+DOG_DATE_FORMATS = ('%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d.%m.%Y')
+
+
+def legacy_parse_iso_date(value: str) -> Optional[str]:
+    """parse_iso_date vor der Umstellung (Hunde-Import)."""
+    value = value.strip()
+    if not value or value == '-':
+        return None
+    for fmt in ('%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d.%m.%Y'):
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def legacy_member_parse_date(date_str: str) -> Optional[str]:
+    """ChromosoftMember.parse_date vor der Umstellung."""
+    if not date_str or date_str.strip() in ['-', '']:
+        return None
+    try:
+        return datetime.strptime(date_str.strip(), '%d/%m/%Y').strftime('%Y-%m-%d')
+    except ValueError:
+        try:
+            return datetime.strptime(date_str.strip(), '%Y-%m-%d').strftime('%Y-%m-%d')
+        except ValueError:
+            return None
+
+
+EDGE_CASES = [
+    '', ' ', '-', ' - ', '--', '0', '00/00/0000', '29/02/2023', '29/02/2024', '31/04/2020', '32/01/2020',
+    '1/1/2020', '01/1/2020', '1/01/2020', ' 1/ 1/2020', '2020-1-1', '2020-01- 5', '2020-1-35', '2020-01-123',
+    '01/13/2020', '0/1/2020', '1/0/2020', '01/01/20', '01/01/02020', '01/01/0999', '01/01/0000', '0999-12-31',
+    '01.01.2020', '1.1.2020', '01-01-2020', '2020/01/01', '2020.01.01', '01/01/2020 ', ' 01/01/2020',
+    '01/01/2020x', 'x01/01/2020', '01/01/2020\n', '\t2020-12-31\t', '١٢/٠٣/٢٠٢٠', '01-02-03', 'n/a', 'unbekannt',
+]
+
+
+def calendar_values(start: date, end: date) -> Iterable[str]:
+    day = start
+    while day <= end:
+        yield day.strftime('%d/%m/%Y')
+        yield f'{day.day}/{day.month}/{day.year}'
+        yield day.strftime('%d-%m-%Y')
+        yield day.isoformat()
+        yield f'{day.year}-{day.month}-{day.day}'
+        yield day.strftime('%d.%m.%Y')
+        day += timedelta(days=1)
+
+
+def random_values(count: int, seed: int = 7) -> List[str]:
+    rnd = random.Random(seed)
+    alphabet = '0123456789/-. x'
+    values = []
+    for _ in range(count):
+        if rnd.random() < 0.5:
+            values.append(''.join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 12))))
+        else:
+            sep = rnd.choice('/-.')
+            values.append(f'{rnd.randint(0, 40)}{sep}{rnd.randint(0, 14)}{sep}{rnd.randint(0, 2100):0{rnd.choice((2, 4))}d}')
+    return values
+
+
+def compare(label: str, legacy: Callable[[str], Optional[str]], parser: DateParser, values: Iterable[str]) -> int:
+    mismatches = 0
+    checked = 0
+    for value in values:
+        checked += 1
+        expected = legacy(value)
+        actual = parser(value)
+        if expected != actual or type(expected) is not type(actual):
+            mismatches += 1
+            if mismatches <= 10:
+                print(f'  Abweichung {label}: {value!r}: erwartet {expected!r}, erhalten {actual!r}', file=sys.stderr)
+    print(f'{label:<8} {checked:>9} Werte geprüft, {mismatches} Abweichungen')
+    return mismatches
+
+
+def export_like_values(count: int, seed: int = 3) -> List[str]:
+    """Werte wie in einer Datumsspalte eines Exports: viele '-' und wiederkehrende Daten."""
+    rnd = random.Random(seed)
+    days = [date(1990, 1, 1) + timedelta(days=rnd.randint(0, 12000)) for _ in range(3000)]
+    return ['-' if rnd.random() < 0.3 else rnd.choice(days).strftime('%d/%m/%Y') for _ in range(count)]
+
+
+def measure(label: str, parse: Callable[[str], Optional[str]], values: List[str]) -> float:
+    started = time.perf_counter()
+    for value in values:
+        parse(value)
+    elapsed = time.perf_counter() - started
+    print(f'{label:<24} {len(values) / elapsed:14,.0f} Werte/s')
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Differenzieller Test und Benchmark der Datumsparser')
+    parser.add_argument('--values', type=int, default=200000, help='Anzahl Werte für den Benchmark (Standard: 200000)')
+    parser.add_argument('--random', type=int, default=200000, help='Anzahl Zufallswerte im Vergleich (Standard: 200000)')
+    args = parser.parse_args()
+
+    samples = EDGE_CASES + list(calendar_values(date(1899, 12, 1), date(2031, 1, 31))) + random_values(args.random)
+    # Reihenfolge mischen, damit auch die Formaterkennung (Umsortieren) mitgeprüft wird
+    random.Random(11).shuffle(samples)
+    mismatches = compare('Hunde', legacy_parse_iso_date, DateParser(DOG_DATE_FORMATS), samples)
+    mismatches += compare('Mitglied', legacy_member_parse_date, DateParser(MEMBER_DATE_FORMATS, output_format='%Y-%m-%d'), samples)
+
+    values = export_like_values(args.values)
+    before = measure('strptime (vorher)', legacy_parse_iso_date, values)
+    after = measure('DateParser (nachher)', DateParser(DOG_DATE_FORMATS), values)
+    print(f'Faktor: {before / after:.1f}x')
+
+    if mismatches:
+        sys.exit(1)
+    print('Ergebnisse identisch.')
+
+
+if __name__ == '__main__':
+    main()
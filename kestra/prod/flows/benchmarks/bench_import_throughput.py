@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Durchsatz-Benchmark der Import-Pipelines gegen den lokalen Strapi-Ersatz.
+
+Für jede Größe werden synthetische Mitglieder- und Hunde-Exporte erzeugt und
+import-members-from-chromosoft-csv.py sowie import-dogs-from-chromosoft-csv.py
+nacheinander als eigene Prozesse gegen einen frischen fake_strapi ausgeführt (die
+Mitglieder legen die User und Breeder an, auf die die Hunde verweisen). Gemessen
+werden Zeilen/s, Anfragen je Zeile, maximaler RSS und Laufzeit; die Ergebnisse
+(inklusive Branch, Commit und Phasen-Laufzeiten der Importer) werden als JSON
+gespeichert, um Branches vor dem Deployment auf die Kestra-Worker zu vergleichen.
+
+# python benchmarks/bench_import_throughput.py --sizes 1000 10000 --latency-ms 5
+# python benchmarks/bench_import_throughput.py --dog-args "--lookup batch --batch-size 50 --delay 0"
+"""
+import argparse
+import json
+import os
+import platform
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from _flows import FLOWS_DIR
+from fake_strapi import Faults, FakeStrapiServer, start_server
+from synthetic_exports import write_dog_export, write_member_export
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_DOG_ARGS = '--delay 0 --batch-size 50'
+DEFAULT_MEMBER_ARGS = ''
+
+
+def git_revision() -> Dict[str, Optional[str]]:
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ['git', *args], cwd=FLOWS_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip() or None
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        'branch': git('rev-parse', '--abbrev-ref', 'HEAD'),
+        'commit': git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+    }
+
+
+def fetch_stats(server: FakeStrapiServer, reset: bool = False) -> Dict[str, Any]:
+    snapshot = server.stats.snapshot()
+    snapshot['records'] = server.store.counts()
+    if reset:
+        server.stats.reset()
+    return snapshot
+
+
+def run_importer(
+    label: str,
+    script: str,
+    csv_path: Path,
+    rows: int,
+    extra_args: List[str],
+    server: FakeStrapiServer,
+    work_dir: Path,
+) -> Dict[str, Any]:
+    """Startet ein Import-Skript als Prozess und misst Laufzeit, RSS und Anfragen."""
+    metrics_path = work_dir / f'{label}-metrics.json'
+    log_path = work_dir / f'{label}.log'
+    env = dict(os.environ, ENDPOINT=server.endpoint, TOKEN='benchmark', PYTHONUNBUFFERED='1')
+    command = [sys.executable, script, str(csv_path), '--metrics-json', str(metrics_path), *extra_args]
+    fetch_stats(server, reset=True)
+    started = time.perf_counter()
+    with log_path.open('w', encoding='utf-8') as log:
+        process = subprocess.Popen(command, cwd=FLOWS_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+        # wait4 liefert die Ressourcen genau dieses Prozesses (ru_maxrss = maximaler RSS)
+        _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - started
+    exit_code = os.waitstatus_to_exitcode(status)
+    server_stats = fetch_stats(server)
+    # Linux: KiB, macOS: Bytes
+    peak_rss_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    requests = server_stats['requests']
+    result: Dict[str, Any] = {
+        'pipeline': label,
+        'rows': rows,
+        'args': extra_args,
+        'exitCode': exit_code,
+        'wallTime': wall,
+        'rowsPerSecond': rows / wall if wall else None,
+        'requests': requests,
+        'requestsPerRow': requests / rows if rows else None,
+        'peakRssMb': peak_rss_mb,
+        'cpuTime': usage.ru_utime + usage.ru_stime,
+        'operations': server_stats['operations'],
+        'statuses': server_stats['statuses'],
+        'records': server_stats['records'],
+    }
+    if metrics_path.is_file():
+        with metrics_path.open('r', encoding='utf-8') as handle:
+            result['importer'] = json.load(handle)
+    if exit_code != 0:
+        tail = log_path.read_text(encoding='utf-8', errors='replace').splitlines()[-20:]
+        print(f'FEHLER: {script} endete mit Exit-Code {exit_code}:', file=sys.stderr)
+        print('\n'.join(f'  {line}' for line in tail), file=sys.stderr)
+    return result
+
+
+def print_row(result: Dict[str, Any]) -> None:
+    print(
+        f'{result["pipeline"]:<8} {result["rows"]:>8} {result["wallTime"]:>10.2f} {result["rowsPerSecond"]:>10,.0f} '
+        f'{result["requests"]:>9} {result["requestsPerRow"]:>8.3f} {result["peakRssMb"]:>9.1f} '
+        f'{"" if result["exitCode"] == 0 else "FEHLER"}'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Durchsatz-Benchmark der Hunde- und Mitglieder-Importe')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Zeilen je Export (Standard: 1000 10000 100000)')
+    parser.add_argument('--pipelines', nargs='+', choices=('members', 'dogs'), default=['members', 'dogs'])
+    parser.add_argument('--dog-args', default=DEFAULT_DOG_ARGS, help=f'Zusätzliche Argumente für den Hunde-Import (Standard: "{DEFAULT_DOG_ARGS}")')
+    parser.add_argument('--member-args', default=DEFAULT_MEMBER_ARGS, help='Zusätzliche Argumente für den Mitglieder-Import')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latenz des Strapi-Ersatzes je Anfrage')
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--max-rps', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, default=0, help='Gleichzeitig bearbeitete Anfragen im Strapi-Ersatz (0 = unbegrenzt)')
+    parser.add_argument('--output', type=Path, default=None, help='Ergebnis-JSON (Standard: benchmarks/results/import-throughput-<branch>-<commit>.json)')
+    parser.add_argument('--keep-files', type=Path, default=None, help='Exporte, Logs und Metriken in diesem Verzeichnis behalten')
+    args = parser.parse_args()
+
+    revision = git_revision()
+    output = args.output or RESULTS_DIR / f'import-throughput-{revision["branch"] or "unknown"}-{revision["commit"] or "unknown"}.json'
+    config = {
+        'sizes': args.sizes,
+        'pipelines': args.pipelines,
+        'dogArgs': args.dog_args,
+        'memberArgs': args.member_args,
+        'latencyMs': args.latency_ms,
+        'jitterMs': args.jitter_ms,
+        'errorRate': args.error_rate,
+        'throttleRate': args.throttle_rate,
+        'maxRps': args.max_rps,
+        'workers': args.workers,
+    }
+    results: List[Dict[str, Any]] = []
+
+    print(f'{"Pipeline":<8} {"Zeilen":>8} {"Dauer s":>10} {"Zeilen/s":>10} {"Anfragen":>9} {"Anf/Zeile":>8} {"RSS MiB":>9}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            work_dir = (args.keep_files or Path(tmp)) / str(size)
+            work_dir.mkdir(parents=True, exist_ok=True)
+            members_csv, dogs_csv = work_dir / 'mitglieder.csv', work_dir / 'hunde.csv'
+            members = write_member_export(members_csv, size)
+            write_dog_export(dogs_csv, size, members)
+
+            server = start_server(faults=Faults(
+                latency_ms=args.latency_ms,
+                jitter_ms=args.jitter_ms,
+                error_rate=args.error_rate,
+                throttle_rate=args.throttle_rate,
+                max_rps=args.max_rps,
+                workers=args.workers,
+                seed=size,
+            ))
+            try:
+                if 'members' in args.pipelines:
+                    result = run_importer(
+                        'members', 'import-members-from-chromosoft-csv.py', members_csv, size,
+                        shlex.split(args.member_args), server, work_dir,
+                    )
+                    results.append(result)
+                    print_row(result)
+                if 'dogs' in args.pipelines:
+                    result = run_importer(
+                        'dogs', 'import-dogs-from-chromosoft-csv.py', dogs_csv, size,
+                        shlex.split(args.dog_args), server, work_dir,
+                    )
+                    results.append(result)
+                    print_row(result)
+            finally:
+                server.shutdown()
+                server.server_close()
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': revision,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'results': results,
+    }
+    with output.open('w', encoding='utf-8') as handle:
+        json.dump(document, handle, ensure_ascii=False, indent=2)
+    print(f'Ergebnisse nach {output} geschrieben.')
+    if any(result['exitCode'] != 0 for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
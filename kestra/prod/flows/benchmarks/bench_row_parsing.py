@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark: Zeilen pro Sekunde beim Einlesen eines breiten Hunde-Exports.
+
+Vergleicht das bisherige Verfahren (csv.DictReader + Spaltensuche pro Zeile, unten als
+legacy_row_to_record eingefroren) mit dem einmal pro Datei aufgelösten DogCsvSchema
+und prüft dabei, dass beide Verfahren identische Datensätze liefern.
+
+# python benchmarks/bench_row_parsing.py --rows 20000 --extra-columns 150
+"""
+import argparse
+import csv
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from _flows import load_flow
+
+dogs = load_flow('import-dogs-from-chromosoft-csv.py')
+
+BASE_COLUMNS = [
+    'ID Animal', 'Given Name', 'Full Name', 'ID Breeder', 'ID Owner', 'chip number', 'sex',
+    'date of birth', 'date of death', 'color', 'Richterbericht', 'fertile', 'Name of Breeding Station',
+    'studbook number', 'studbook number (sire)', 'studbook number (dam)', 'fullname (sire)',
+    'fullname (dam)', 'HD', 'HD(G)', 'Gentest SOD1', 'Augenuntersuchung', 'DNA-Profil',
+    'Herzuntersuchung', 'D-Lokus', 'Fellabweichung',
+]
+
+
+def legacy_row_to_record(row):
+    """Stand vor dem kompilierten Schema (nur für den Vergleich)."""
+    c_id_value = dogs.parse_int(row.get('ID Animal', ''))
+    if c_id_value is None:
+        raise ValueError('Jeder Datensatz benötigt eine gültige "ID Animal" (cId).')
+    breed_survey_parts = []
+    for key, value in row.items():
+        if key and value:
+            key_lower = key.strip().lower()
+            value_stripped = value.strip()
+            if value_stripped and value_stripped != '-':
+                if key_lower.startswith('verhalten') or key_lower.startswith('körung'):
+                    breed_survey_parts.append(f"{value_stripped}")
+    breed_survey = '\n'.join(breed_survey_parts) if breed_survey_parts else ''
+    kennel_name = ''
+    possible_keys = ['Name of Breeding Station', 'name of breeding station', 'Name of breeder station', 'name of breeder station']
+    for key in possible_keys:
+        if key in row:
+            kennel_name = (row.get(key) or '').strip()
+            if kennel_name:
+                break
+    if not kennel_name:
+        for key, value in row.items():
+            if key:
+                key_lower = key.strip().lower()
+                if key_lower in ['name of breeding station', 'name of breeder station']:
+                    kennel_name = value.strip() if value else ''
+                    if kennel_name:
+                        break
+    d_lokus = dogs.parse_bool_check(row.get('D-Lokus', ''))
+    fellabweichung = dogs.parse_bool_check(row.get('Fellabweichung', ''))
+    return dogs.ChromosoftDogRecord(
+        c_id=c_id_value,
+        given_name=(row.get('Given Name') or '').strip(),
+        full_name=(row.get('Full Name') or '').strip(),
+        breeder_id=dogs.parse_int(row.get('ID Breeder', '')),
+        owner_id=dogs.parse_int(row.get('ID Owner', '')),
+        chip_number=(row.get('chip number') or '').strip(),
+        sex=(row.get('sex') or '').strip(),
+        date_of_birth=(row.get('date of birth') or '').strip(),
+        date_of_death=(row.get('date of death') or '').strip(),
+        richterbericht=(row.get('Richterbericht') or '').strip(),
+        breed_survey=breed_survey,
+        breeder_kennel_name=kennel_name,
+        color=(row.get('color') or '').strip(),
+        fertile=row.get('fertile'),
+        studbook_number=(row.get('studbook number') or '').strip(),
+        sire_studbook_number=(row.get('studbook number (sire)') or '').strip(),
+        dam_studbook_number=(row.get('studbook number (dam)') or '').strip(),
+        sire_full_name=(row.get('fullname (sire)') or '').strip(),
+        dam_full_name=(row.get('fullname (dam)') or '').strip(),
+        hd=dogs.map_hd_enum(row.get('HD', ''), row.get('HD(G)', '')),
+        sod1=dogs.map_sod1_enum(row.get('Gentest SOD1', '')),
+        eyes_check=dogs.parse_bool_check(row.get('Augenuntersuchung', '')),
+        genprofil=dogs.parse_bool_check(row.get('DNA-Profil', '')),
+        heart_check=dogs.parse_bool_check(row.get('Herzuntersuchung', '')),
+        color_check=d_lokus or fellabweichung or None,
+    )
+
+
+def write_wide_export(path: Path, rows: int, extra_columns: int, seed: int = 1) -> None:
+    """Synthetischer Export: Basisspalten, Verhalten-/Körung-Spalten und weitere Füllspalten."""
+    rnd = random.Random(seed)
+    survey = [f'Verhalten {i}' for i in range(extra_columns // 3)] + [f'Körung {i}' for i in range(extra_columns // 3)]
+    filler = [f'Feld {i}' for i in range(extra_columns - len(survey))]
+    header = BASE_COLUMNS + survey + filler
+    with path.open('w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        for i in range(1, rows + 1):
+            base = [
+                str(i), f'Hund {i}', f'Hund {i} vom Zwinger', str(rnd.randint(1, 500)), str(rnd.randint(1, 5000)),
+                f'276{i:012d}', rnd.choice(['Rüde', 'Hündin']), f'{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/20{rnd.randint(0, 24):02d}',
+                '-', rnd.choice(['schwarz', 'blond', 'schwarzmarken']), '', '1', f'vom Zwinger {i % 300}',
+                f'HZD {i}', f'HZD {max(1, i - 10)}', f'HZD {max(1, i - 20)}', f'Hund {max(1, i - 10)} vom Zwinger',
+                f'Hund {max(1, i - 20)} vom Zwinger', rnd.choice(['A1', 'A2', 'B1', '-']), '', rnd.choice(['N/N', 'N/DM', '-']),
+                rnd.choice(['o. B.', '-']), rnd.choice(['1', '']), '-', '', '-',
+            ]
+            writer.writerow(base + [rnd.choice(['-', '', 'gut', 'sehr gut']) for _ in survey] + ['x'] * len(filler))
+
+
+def read_legacy(path: Path) -> List:
+    with path.open('r', encoding='utf-8', newline='') as handle:
+        return [legacy_row_to_record(row) for row in csv.DictReader(handle)]
+
+
+def read_compiled(path: Path) -> List:
+    return dogs.read_chromosoft_csv(path)
+
+
+def measure(label: str, read: Callable[[Path], List], path: Path, repeat: int) -> List:
+    best = float('inf')
+    records: List = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        records = read(path)
+        best = min(best, time.perf_counter() - started)
+    print(f'{label:<10} {len(records):>8} Zeilen  {best:8.3f} s  {len(records) / best:12,.0f} Zeilen/s')
+    return records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark: Einlesen eines breiten Chromosoft-Hunde-Exports')
+    parser.add_argument('--rows', type=int, default=20000, help='Anzahl Zeilen (Standard: 20000)')
+    parser.add_argument('--extra-columns', type=int, default=150, help='Zusätzliche Spalten (Standard: 150)')
+    parser.add_argument('--repeat', type=int, default=3, help='Wiederholungen, gewertet wird die schnellste (Standard: 3)')
+    parser.add_argument('--csv', type=Path, default=None, help='Vorhandenen Export statt synthetischer Daten verwenden')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv
+        if path is None:
+            path = Path(tmp) / 'wide-export.csv'
+            write_wide_export(path, args.rows, args.extra_columns)
+        before = measure('vorher', read_legacy, path, args.repeat)
+        after = measure('nachher', read_compiled, path, args.repeat)
+
+    if before != after:
+        print('FEHLER: Die Verfahren liefern unterschiedliche Datensätze.', file=sys.stderr)
+        sys.exit(1)
+    print('Ergebnisse identisch.')
+
+
+if __name__ == '__main__':
+    main()
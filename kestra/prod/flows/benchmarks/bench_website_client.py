@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Latenz je Anfrage des WebsiteClient: requests.post ohne Session (bisher, unten
+eingefroren) gegen die gemeinsame Keep-Alive-Session mit Verbindungspool.
+
+Gemessen wird eine kleine Abfrage (FindUserByCId) und eine große Seite
+(GetAllUsers mit 100 Usern, optional gzip-komprimiert) gegen den lokalen
+Strapi-Ersatz, zusätzlich mit mehreren Threads über einen Client. Mit --endpoint
+lässt sich stattdessen ein echter Endpoint (z. B. Staging über HTTPS, wo der
+TLS-Handshake deutlich stärker ins Gewicht fällt) messen.
+
+# python benchmarks/bench_website_client.py --requests 1000 --threads 8 --gzip
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+import _flows
+from fake_strapi import FakeStrapiStore, start_server
+
+_flows.ensure_lib_path()
+
+from lib.website_user import WebsiteClient  # noqa: E402
+
+SMALL_QUERY = """
+query FindUserByCId($cId: Int!) {
+    usersPermissionsUsers(filters: { cId: { eq: $cId } }) {
+        documentId
+    }
+}
+"""
+
+PAGE_QUERY = """
+query GetAllUsers($page: Int!, $pageSize: Int!) {
+    usersPermissionsUsers(pagination: { page: $page, pageSize: $pageSize }) {
+        documentId cEmail cId blocked firstName lastName title sex address1 zip city
+        region countryCode phone membershipNumber dateOfBirth memberSince cancellationOn
+    }
+}
+"""
+
+
+class LegacyClient:
+    """WebsiteClient._post vor der Umstellung: requests.post ohne Session (nur für den Vergleich)."""
+
+    def __init__(self, api_url: str, api_token: Optional[str] = None):
+        self.api_url = api_url
+        self.headers = {'Content-Type': 'application/json'}
+        if api_token:
+            self.headers['Authorization'] = f'Bearer {api_token}'
+
+    def _post(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        response = requests.post(
+            self.api_url,
+            json={'query': query, 'variables': variables or {}},
+            headers=self.headers,
+            timeout=60
+        )
+        if response.status_code == 200:
+            return response.json().get('data')
+        return None
+
+
+def seed_store(users: int) -> FakeStrapiStore:
+    store = FakeStrapiStore()
+    for i in range(1, users + 1):
+        store.insert('user', {
+            'username': str(20000 + i), 'email': f'user-{i}@hovawarte.com', 'cEmail': f'mitglied.{i}@example.com',
+            'cId': 10000 + i, 'firstName': 'Vorname', 'lastName': f'Nachname {i}', 'address1': f'Straße {i}',
+            'zip': '12345', 'city': 'Berlin', 'countryCode': 'DE', 'membershipNumber': 20000 + i,
+            'dateOfBirth': '1970-01-01', 'memberSince': '2000-01-01',
+        })
+    return store
+
+
+def measure(label: str, call: Callable[[int], Any], count: int, threads: int = 1) -> Dict[str, float]:
+    """Führt call(i) count-mal aus und gibt Latenz-Kennzahlen in ms aus."""
+
+    def timed(i: int) -> float:
+        started = time.perf_counter()
+        result = call(i)
+        elapsed = time.perf_counter() - started
+        if result is None:
+            raise RuntimeError(f'{label}: Anfrage {i} ohne Ergebnis')
+        return elapsed
+
+    started = time.perf_counter()
+    if threads <= 1:
+        latencies = [timed(i) for i in range(count)]
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            latencies = list(executor.map(timed, range(count)))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    row = {
+        'mean': statistics.fmean(latencies) * 1000,
+        'p50': latencies[len(latencies) // 2] * 1000,
+        'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        'rps': count / wall,
+    }
+    print(f'{label:<34} {row["mean"]:>8.2f} {row["p50"]:>8.2f} {row["p95"]:>8.2f} {row["rps"]:>10,.0f}')
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Latenz-Benchmark: requests.post gegen gepoolte Keep-Alive-Session')
+    parser.add_argument('--requests', type=int, default=500, help='Anfragen je Messung (Standard: 500)')
+    parser.add_argument('--threads', type=int, default=8, help='Threads für die parallele Messung (Standard: 8)')
+    parser.add_argument('--users', type=int, default=1000, help='User im Strapi-Ersatz (Standard: 1000)')
+    parser.add_argument('--gzip', action='store_true', help='Strapi-Ersatz komprimiert große Antworten')
+    parser.add_argument('--endpoint', default=None, help='Echten Endpoint messen (TOKEN aus der Umgebung) statt des Strapi-Ersatzes')
+    args = parser.parse_args()
+
+    server = None
+    endpoint, token = args.endpoint, os.getenv('TOKEN')
+    if endpoint is None:
+        server = start_server(store=seed_store(args.users), gzip_responses=args.gzip)
+        endpoint = server.endpoint
+    pages = max(1, args.users // 100)
+
+    legacy = LegacyClient(endpoint, token)
+    pooled = WebsiteClient(endpoint, token, pool_size=max(1, args.threads))
+
+    print(f'{"Messung":<34} {"Ø ms":>8} {"p50 ms":>8} {"p95 ms":>8} {"Anfr./s":>10}')
+    results = {}
+    for label, client in (('vorher (requests.post)', legacy), ('nachher (Session-Pool)', pooled)):
+        if server is not None:
+            server.stats.reset()
+        results[label] = [
+            measure(f'{label} klein', lambda i: client._post(SMALL_QUERY, {'cId': 10001 + i % args.users}), args.requests),
+            measure(
+                f'{label} Seite', lambda i: client._post(PAGE_QUERY, {'page': i % pages + 1, 'pageSize': 100}),
+                max(1, args.requests // 5),
+            ),
+            measure(
+                f'{label} {args.threads} Threads',
+                lambda i: client._post(SMALL_QUERY, {'cId': 10001 + i % args.users}),
+                args.requests,
+                args.threads,
+            ),
+        ]
+        if server is not None:
+            stats = server.stats.snapshot()
+            print(f'  -> {stats["requests"]} Anfragen über {stats["connections"]} TCP-Verbindungen')
+    pooled.close()
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+    before, after = results['vorher (requests.post)'], results['nachher (Session-Pool)']
+    print(f'Faktor Ø-Latenz klein: {before[0]["mean"] / after[0]["mean"]:.1f}x, '
+          f'parallel: {after[2]["rps"] / before[2]["rps"]:.1f}x Anfragen/s')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
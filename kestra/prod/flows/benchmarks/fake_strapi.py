@@ -0,0 +1,857 @@
+#!/usr/bin/env python3
+"""
+Lokaler Strapi-GraphQL-Ersatz für Lasttests der Import-Flows.
+
+Implementiert den Ausschnitt aus schema.graphql, den die Skripte verwenden: Listen- und
+_connection-Queries für Hunde, Breeder und User mit Filtern (eq, eqi, in, gt, ...,
+auch über Relationen wie user.breeders), Paginierung und Sortierung, create/update-Mutationen (auch mehrere mit Aliassen in
+einem Dokument) sowie register und updateUserAdmin. Die Daten liegen nur im Speicher.
+
+Latenz, Fehlerquote (HTTP 500), 429-Antworten mit Retry-After und eine begrenzte Zahl
+gleichzeitig bearbeiteter Anfragen sind einstellbar, damit sich die Importer unter
+realistischer Last messen lassen. GET /__stats liefert Anfragen je Operation und die
+Anzahl der Datensätze (?reset=1 setzt die Zähler zurück).
+
+# python benchmarks/fake_strapi.py --port 1337 --latency-ms 20 --throttle-rate 0.01
+# ENDPOINT=http://127.0.0.1:1337/graphql TOKEN=x python import-dogs-from-chromosoft-csv.py hunde.csv
+"""
+import argparse
+import gzip
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Wie backend/config/api.ts (defaultLimit, maxLimit)
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+ENTITY_TYPES = {
+    'dog': 'HzdPluginDog',
+    'breeder': 'HzdPluginBreeder',
+    'user': 'UsersPermissionsUser',
+}
+
+# Query-Felder (Liste, _connection, Einzelabfrage per documentId) je Entität
+COLLECTION_ROOTS = {
+    'hzdPluginDogs': 'dog',
+    'hzdPluginBreeders': 'breeder',
+    'usersPermissionsUsers': 'user',
+}
+SINGLE_ROOTS = {
+    'hzdPluginDog': 'dog',
+    'hzdPluginBreeder': 'breeder',
+    'usersPermissionsUser': 'user',
+}
+
+# Relationen (Feld -> Ziel-Entität); gespeichert wird die documentId des Ziels
+RELATIONS = {
+    'dog': {'father': 'dog', 'mother': 'dog', 'owner': 'user', 'breeder': 'breeder'},
+    'breeder': {'member': 'user'},
+    'user': {},
+}
+
+# Rückwärts-Relationen (Feld -> (Entität, Feld der Gegenseite))
+REVERSE_RELATIONS = {
+    'user': {'breeders': ('breeder', 'member')},
+}
+
+TIMESTAMP_FIELDS = ('createdAt', 'updatedAt', 'publishedAt')
+
+# Kleinere Antworten werden auch mit --gzip unkomprimiert gesendet (wie bei nginx gzip_min_length)
+GZIP_MIN_BYTES = 1024
+
+# Eindeutige User-Felder (ohne Groß-/Kleinschreibung) wie bei users-permissions
+UNIQUE_USER_FIELDS = ('username', 'email')
+
+
+class GraphQLError(Exception):
+    def __init__(self, message: str, code: str = 'BAD_USER_INPUT'):
+        super().__init__(message)
+        self.code = code
+
+
+# ---------------------------------------------------------------------------
+# Parser (Ausschnitt der GraphQL-Grammatik: Operationen, Variablen, Felder, Aliasse)
+# ---------------------------------------------------------------------------
+
+_TOKEN = re.compile(
+    r'(?P<skip>[\s,]+|#[^\n]*)'
+    r'|(?P<punct>\.\.\.|[!$():=@\[\]{}|&])'
+    r'|(?P<name>[_A-Za-z][_0-9A-Za-z]*)'
+    r'|(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)'
+    r'|(?P<string>"(?:[^"\\\n]|\\.)*")'
+)
+
+
+class Field(NamedTuple):
+    alias: str
+    name: str
+    args: Dict[str, Any]
+    selections: Tuple['Field', ...]
+
+
+def _tokenize(source: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    while position < len(source):
+        match = _TOKEN.match(source, position)
+        if match is None:
+            raise GraphQLError(f'Syntax Error: Unexpected character "{source[position]}".', 'GRAPHQL_PARSE_FAILED')
+        position = match.end()
+        kind = match.lastgroup
+        if kind != 'skip':
+            tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, source: str, variables: Dict[str, Any]):
+        self.tokens = _tokenize(source)
+        self.position = 0
+        self.variables = dict(variables or {})
+
+    def _peek(self) -> Tuple[str, str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else ('eof', '')
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token[0] == 'eof':
+            raise GraphQLError('Syntax Error: Unexpected <EOF>.', 'GRAPHQL_PARSE_FAILED')
+        self.position += 1
+        return token
+
+    def _expect(self, value: str) -> None:
+        token = self._next()
+        if token[1] != value:
+            raise GraphQLError(f'Syntax Error: Expected "{value}", found "{token[1]}".', 'GRAPHQL_PARSE_FAILED')
+
+    def _accept(self, value: str) -> bool:
+        if self._peek()[1] == value and self._peek()[0] != 'string':
+            self.position += 1
+            return True
+        return False
+
+    def parse(self) -> Tuple[str, Tuple[Field, ...]]:
+        operation = 'query'
+        if self._peek() in (('name', 'query'), ('name', 'mutation')):
+            operation = self._next()[1]
+            if self._peek()[0] == 'name':
+                self._next()
+            if self._accept('('):
+                self._variable_definitions()
+        selections = self._selection_set()
+        if self._peek()[0] != 'eof':
+            raise GraphQLError('Nur ein Operationsdokument pro Anfrage wird unterstützt.', 'GRAPHQL_PARSE_FAILED')
+        return operation, selections
+
+    def _variable_definitions(self) -> None:
+        while not self._accept(')'):
+            self._expect('$')
+            name = self._next()[1]
+            self._expect(':')
+            self._type()
+            if self._accept('='):
+                default = self._value()
+                self.variables.setdefault(name, default)
+
+    def _type(self) -> None:
+        if self._accept('['):
+            self._type()
+            self._expect(']')
+        else:
+            self._next()
+        self._accept('!')
+
+    def _selection_set(self) -> Tuple[Field, ...]:
+        self._expect('{')
+        fields: List[Field] = []
+        while not self._accept('}'):
+            if self._peek()[1] == '...':
+                raise GraphQLError('Fragmente werden nicht unterstützt.', 'GRAPHQL_PARSE_FAILED')
+            fields.append(self._field())
+        return tuple(fields)
+
+    def _field(self) -> Field:
+        alias = name = self._next()[1]
+        if self._accept(':'):
+            name = self._next()[1]
+        args: Dict[str, Any] = {}
+        if self._accept('('):
+            while not self._accept(')'):
+                arg = self._next()[1]
+                self._expect(':')
+                args[arg] = self._value()
+        selections: Tuple[Field, ...] = ()
+        if self._peek()[1] == '{':
+            selections = self._selection_set()
+        return Field(alias, name, args, selections)
+
+    def _value(self) -> Any:
+        kind, token = self._next()
+        if token == '$' and kind == 'punct':
+            return self.variables.get(self._next()[1])
+        if kind == 'string':
+            return json.loads(token)
+        if kind == 'number':
+            return float(token) if any(c in token for c in '.eE') else int(token)
+        if token == '[':
+            items = []
+            while not self._accept(']'):
+                items.append(self._value())
+            return items
+        if token == '{':
+            fields = {}
+            while not self._accept('}'):
+                key = self._next()[1]
+                self._expect(':')
+                fields[key] = self._value()
+            return fields
+        if kind == 'name':
+            return {'true': True, 'false': False, 'null': None}.get(token, token)
+        raise GraphQLError(f'Syntax Error: Unexpected "{token}".', 'GRAPHQL_PARSE_FAILED')
+
+
+def parse_operation(query: str, variables: Optional[Dict[str, Any]] = None) -> Tuple[str, Tuple[Field, ...]]:
+    """Parst ein GraphQL-Dokument; Variablen werden direkt eingesetzt."""
+    return _Parser(query, variables or {}).parse()
+
+
+# ---------------------------------------------------------------------------
+# Speicher und Auswertung
+# ---------------------------------------------------------------------------
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def _timestamp(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+    return value
+
+
+class _Ref(NamedTuple):
+    """Verweis auf einen gespeicherten Datensatz im Ergebnis eines Resolvers."""
+    kind: str
+    record: Dict[str, Any]
+
+
+class FakeStrapiStore:
+    """In-Memory-Datenbestand mit den Resolvern der unterstützten Queries und Mutationen."""
+
+    def __init__(self, default_page_size: int = DEFAULT_PAGE_SIZE, max_page_size: int = MAX_PAGE_SIZE):
+        self.default_page_size = default_page_size
+        self.max_page_size = max_page_size
+        self.lock = threading.RLock()
+        # Einfügereihenfolge = Standard-Sortierung
+        self.records: Dict[str, Dict[str, Dict[str, Any]]] = {kind: {} for kind in ENTITY_TYPES}
+        # Indizes, damit Lookups per cId und Eindeutigkeitsprüfungen auch bei 100k Datensätzen nicht linear suchen
+        self._position: Dict[str, Dict[str, int]] = {kind: {} for kind in ENTITY_TYPES}
+        self._by_cid: Dict[str, Dict[Any, List[str]]] = {kind: {} for kind in ENTITY_TYPES}
+        self._unique: Dict[str, Dict[str, str]] = {field: {} for field in UNIQUE_USER_FIELDS}
+        # Rückwärts-Relationen: (Entität, Feld) -> documentId des Ziels -> documentIds (z. B. Breeder je User)
+        self._by_relation: Dict[Tuple[str, str], Dict[str, List[str]]] = {
+            (other, back): {} for reverse in REVERSE_RELATIONS.values() for other, back in reverse.values()
+        }
+        self._sequence = 0
+        # Filter auf Rückwärts-Relationen je Ausführung: (Entität, Feld, Bedingung) -> passende documentIds
+        self._reverse_matches: Dict[Tuple[str, str, str], Set[str]] = {}
+
+    def insert(self, kind: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            now = _now()
+            record = {'createdAt': now, 'updatedAt': now, 'publishedAt': now}
+            record.update(data)
+            record.setdefault('documentId', uuid.uuid4().hex[:24])
+            if kind == 'user':
+                record.setdefault('provider', 'local')
+                record.setdefault('confirmed', True)
+                record.setdefault('blocked', False)
+            self.records[kind][record['documentId']] = record
+            self._sequence += 1
+            self._position[kind][record['documentId']] = self._sequence
+            self._index(kind, record)
+            return record
+
+    def _index(self, kind: str, record: Dict[str, Any]) -> None:
+        document_id = record['documentId']
+        if record.get('cId') is not None:
+            self._by_cid[kind].setdefault(record['cId'], []).append(document_id)
+        for (other, back), index in self._by_relation.items():
+            if other == kind and record.get(back):
+                index.setdefault(record[back], []).append(document_id)
+        if kind == 'user':
+            for field in UNIQUE_USER_FIELDS:
+                if record.get(field):
+                    self._unique[field][str(record[field]).lower()] = document_id
+
+    def _unindex(self, kind: str, record: Dict[str, Any]) -> None:
+        document_id = record['documentId']
+        ids = self._by_cid[kind].get(record.get('cId'))
+        if ids and document_id in ids:
+            ids.remove(document_id)
+        for (other, back), index in self._by_relation.items():
+            related = index.get(record.get(back)) if other == kind else None
+            if related and document_id in related:
+                related.remove(document_id)
+        if kind == 'user':
+            for field in UNIQUE_USER_FIELDS:
+                key = str(record.get(field) or '').lower()
+                if self._unique[field].get(key) == document_id:
+                    del self._unique[field][key]
+
+    def load_seed(self, seed: Dict[str, Iterable[Dict[str, Any]]]) -> None:
+        """Lädt Datensätze im Format {"users": [...], "breeders": [...], "dogs": [...]}."""
+        for kind in ENTITY_TYPES:
+            for data in seed.get(f'{kind}s') or []:
+                self.insert(kind, data)
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            return {f'{kind}s': len(records) for kind, records in self.records.items()}
+
+    # -- Ausführung ---------------------------------------------------------
+
+    def execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Führt ein Dokument aus und liefert {data, errors} wie Strapi."""
+        operation, fields = parse_operation(query, variables)
+        data: Dict[str, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        with self.lock:
+            self._reverse_matches = {}
+            for field in fields:
+                try:
+                    value = self._resolve_root(operation, field)
+                    data[field.alias] = self._project(value, field.selections)
+                except GraphQLError as exc:
+                    data[field.alias] = None
+                    errors.append({'message': str(exc), 'path': [field.alias], 'extensions': {'code': exc.code}})
+        result: Dict[str, Any] = {'data': data}
+        if errors:
+            result['errors'] = errors
+        return result
+
+    def _resolve_root(self, operation: str, field: Field) -> Any:
+        name, args = field.name, field.args
+        if name == '__typename':
+            return 'Mutation' if operation == 'mutation' else 'Query'
+        if operation == 'query':
+            if name in COLLECTION_ROOTS:
+                records, _ = self._query(COLLECTION_ROOTS[name], args)
+                return [_Ref(COLLECTION_ROOTS[name], record) for record in records]
+            if name.endswith('_connection') and name[:-len('_connection')] in COLLECTION_ROOTS:
+                kind = COLLECTION_ROOTS[name[:-len('_connection')]]
+                records, page_info = self._query(kind, args)
+                return {'nodes': [_Ref(kind, record) for record in records], 'pageInfo': page_info}
+            if name in SINGLE_ROOTS:
+                record = self.records[SINGLE_ROOTS[name]].get(args.get('documentId'))
+                return _Ref(SINGLE_ROOTS[name], record) if record else None
+        else:
+            for kind, type_name in ENTITY_TYPES.items():
+                if name == f'create{type_name}':
+                    return _Ref(kind, self._create(kind, args.get('data') or {}))
+                if name == f'update{type_name}':
+                    return _Ref(kind, self._update(kind, args.get('documentId'), args.get('data') or {}))
+                if name == f'delete{type_name}':
+                    return {'documentId': self._delete(kind, args.get('documentId'))}
+            if name == 'register':
+                return self._register(args.get('input') or {})
+            if name == 'updateUserAdmin':
+                return {'data': _Ref('user', self._update('user', args.get('id'), args.get('data') or {}))}
+        raise GraphQLError(f'Cannot query field "{name}" on type "{operation.capitalize()}".', 'GRAPHQL_VALIDATION_FAILED')
+
+    def _project(self, value: Any, selections: Tuple[Field, ...]) -> Any:
+        """Wendet das Selection-Set auf ein Resolver-Ergebnis an."""
+        if isinstance(value, list):
+            return [self._project(item, selections) for item in value]
+        if isinstance(value, _Ref):
+            return {field.alias: self._project(self._entity_field(value, field), field.selections) for field in selections}
+        if isinstance(value, dict) and selections:
+            return {field.alias: self._project(value.get(field.name), field.selections) for field in selections}
+        return value
+
+    def _entity_field(self, ref: _Ref, field: Field) -> Any:
+        kind, record = ref
+        name = field.name
+        if name == '__typename':
+            return ENTITY_TYPES[kind]
+        target = RELATIONS[kind].get(name)
+        if target:
+            related = self.records[target].get(record.get(name))
+            return _Ref(target, related) if related else None
+        reverse = REVERSE_RELATIONS.get(kind, {}).get(name.replace('_connection', ''))
+        if reverse:
+            other, back = reverse
+            records, page_info = self._query(other, field.args, self._related(other, back, record['documentId']))
+            refs = [_Ref(other, related) for related in records]
+            return {'nodes': refs, 'pageInfo': page_info} if name.endswith('_connection') else refs
+        return record.get(name)
+
+    # -- Filter, Sortierung, Paginierung -------------------------------------
+
+    def _query(
+        self, kind: str, args: Dict[str, Any], candidates: Optional[Iterable[Dict[str, Any]]] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        filters = args.get('filters') or {}
+        if candidates is None:
+            candidates = self._candidates(kind, filters)
+        matched = [record for record in candidates if self._matches(kind, record, filters)]
+        sort = args.get('sort') or []
+        for spec in reversed([sort] if isinstance(sort, str) else sort):
+            field, _, direction = spec.partition(':')
+            matched.sort(
+                key=lambda record: (record.get(field) is None, _timestamp(record.get(field)) if record.get(field) is not None else 0),
+                reverse=direction.lower() == 'desc',
+            )
+        pagination = args.get('pagination') or {}
+        page_size = pagination.get('pageSize') or pagination.get('limit') or self.default_page_size
+        page_size = max(1, min(int(page_size), self.max_page_size))
+        if 'start' in pagination:
+            start = max(0, int(pagination.get('start') or 0))
+            page = start // page_size + 1
+        else:
+            page = max(1, int(pagination.get('page') or 1))
+            start = (page - 1) * page_size
+        total = len(matched)
+        page_info = {
+            'total': total,
+            'page': page,
+            'pageSize': page_size,
+            'pageCount': math.ceil(total / page_size),
+        }
+        return matched[start:start + page_size], page_info
+
+    def _candidates(self, kind: str, filters: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Vorauswahl über den cId-Index bei cId: { eq } bzw. { in }; sonst alle Datensätze."""
+        condition = filters.get('cId')
+        if not isinstance(condition, dict) or not condition or set(condition) - {'eq', 'in'}:
+            return self.records[kind].values()
+        wanted = [condition['eq']] if 'eq' in condition else list(condition['in'] or [])
+        ids = {document_id for c_id in wanted for document_id in self._by_cid[kind].get(c_id, ())}
+        position = self._position[kind]
+        return [self.records[kind][document_id] for document_id in sorted(ids, key=position.__getitem__)]
+
+    def _related(self, kind: str, field: str, target_id: str) -> List[Dict[str, Any]]:
+        """Datensätze von kind, deren Relation field auf target_id zeigt (in Einfügereihenfolge)."""
+        ids = self._by_relation[(kind, field)].get(target_id, ())
+        position = self._position[kind]
+        return [self.records[kind][document_id] for document_id in sorted(ids, key=position.__getitem__)]
+
+    def _matches(self, kind: str, record: Optional[Dict[str, Any]], filters: Dict[str, Any]) -> bool:
+        for key, condition in filters.items():
+            if condition is None:
+                continue
+            if key == 'and':
+                if not all(self._matches(kind, record, sub) for sub in condition):
+                    return False
+            elif key == 'or':
+                if not any(self._matches(kind, record, sub) for sub in condition):
+                    return False
+            elif key == 'not':
+                if self._matches(kind, record, condition):
+                    return False
+            elif key in RELATIONS[kind]:
+                target = RELATIONS[kind][key]
+                related = self.records[target].get(record.get(key)) if record else None
+                if related is None:
+                    if not _null_condition(condition):
+                        return False
+                elif not self._matches(target, related, condition):
+                    return False
+            elif key in REVERSE_RELATIONS.get(kind, {}):
+                # To-many-Relation: erfüllt, wenn mindestens ein verknüpfter Datensatz passt
+                if record is None or record['documentId'] not in self._reverse_matching(kind, key, condition):
+                    return False
+            elif not _compare(record.get(key) if record else None, condition, key in TIMESTAMP_FIELDS):
+                return False
+        return True
+
+    def _reverse_matching(self, kind: str, key: str, condition: Dict[str, Any]) -> Set[str]:
+        other, back = REVERSE_RELATIONS[kind][key]
+        memo_key = (kind, key, json.dumps(condition, sort_keys=True, default=str))
+        matching = self._reverse_matches.get(memo_key)
+        if matching is None:
+            matching = {
+                related[back]
+                for related in self.records[other].values()
+                if related.get(back) and self._matches(other, related, condition)
+            }
+            self._reverse_matches[memo_key] = matching
+        return matching
+
+    # -- Mutationen ----------------------------------------------------------
+
+    def _check_relations(self, kind: str, data: Dict[str, Any]) -> None:
+        for field, target in RELATIONS[kind].items():
+            value = data.get(field)
+            if value is not None and value not in self.records[target]:
+                raise GraphQLError(f'Document with id "{value}", locale "null" not found')
+
+    def _check_unique_user(self, data: Dict[str, Any], document_id: Optional[str] = None) -> None:
+        for field in UNIQUE_USER_FIELDS:
+            value = data.get(field)
+            if not value:
+                continue
+            owner = self._unique[field].get(str(value).lower())
+            if owner is not None and owner != document_id:
+                raise GraphQLError(f'{field} already taken' if document_id else 'Email or Username are already taken')
+
+    def _create(self, kind: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        self._check_relations(kind, data)
+        if kind == 'user':
+            self._check_unique_user(data)
+        return self.insert(kind, {key: value for key, value in data.items() if key != 'documentId'})
+
+    def _update(self, kind: str, document_id: Optional[str], data: Dict[str, Any]) -> Dict[str, Any]:
+        record = self.records[kind].get(document_id)
+        if record is None:
+            raise GraphQLError('Entity not found', 'NOT_FOUND')
+        self._check_relations(kind, data)
+        if kind == 'user':
+            self._check_unique_user(data, document_id)
+        self._unindex(kind, record)
+        record.update({key: value for key, value in data.items() if key != 'documentId'})
+        record['updatedAt'] = _now()
+        self._index(kind, record)
+        return record
+
+    def _delete(self, kind: str, document_id: Optional[str]) -> str:
+        record = self.records[kind].pop(document_id, None)
+        if record is None:
+            raise GraphQLError('Entity not found', 'NOT_FOUND')
+        self._unindex(kind, record)
+        del self._position[kind][document_id]
+        return document_id
+
+    def _register(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        username, email = data.get('username'), data.get('email')
+        if not username or not email or not data.get('password'):
+            raise GraphQLError('username, email and password are required')
+        if not re.match(r'^[^@\s]+@[^@\s]+\.[^@\s]+$', email):
+            raise GraphQLError('email must be a valid email')
+        self._check_unique_user(data)
+        record = self.insert('user', {'username': username, 'email': email.lower()})
+        return {'jwt': f'fake-jwt-{record["documentId"]}', 'user': _Ref('user', record)}
+
+
+def _null_condition(condition: Dict[str, Any]) -> bool:
+    return condition.get('null') is True or condition.get('notNull') is False
+
+
+def _compare(value: Any, condition: Any, timestamp: bool) -> bool:
+    """Wertet die Operatoren eines Feldfilters aus (Ausschnitt von StringFilterInput usw.)."""
+    if not isinstance(condition, dict):
+        return value == condition
+    convert = _timestamp if timestamp else (lambda item: item)
+    current = convert(value)
+    for operator, expected in condition.items():
+        if operator in ('null', 'notNull'):
+            if (value is None) != ((operator == 'null') == bool(expected)):
+                return False
+            continue
+        if expected is None and operator not in ('eq', 'ne'):
+            continue
+        if operator == 'eq':
+            ok = current == convert(expected)
+        elif operator == 'ne':
+            ok = current != convert(expected)
+        elif operator == 'eqi':
+            ok = value is not None and str(value).lower() == str(expected).lower()
+        elif operator == 'nei':
+            ok = value is None or str(value).lower() != str(expected).lower()
+        elif operator == 'in':
+            ok = current in [convert(item) for item in expected]
+        elif operator == 'notIn':
+            ok = current not in [convert(item) for item in expected]
+        elif operator in ('gt', 'gte', 'lt', 'lte'):
+            if value is None:
+                return False
+            target = convert(expected)
+            ok = {
+                'gt': current > target,
+                'gte': current >= target,
+                'lt': current < target,
+                'lte': current <= target,
+            }[operator]
+        elif operator == 'between':
+            ok = value is not None and convert(expected[0]) <= current <= convert(expected[1])
+        elif operator in ('contains', 'containsi', 'notContains', 'notContainsi'):
+            haystack, needle = str(value or ''), str(expected)
+            if operator.endswith('i'):
+                haystack, needle = haystack.lower(), needle.lower()
+            ok = (needle in haystack) != operator.startswith('not')
+        elif operator in ('startsWith', 'endsWith'):
+            ok = value is not None and getattr(str(value), operator.lower())(str(expected))
+        else:
+            raise GraphQLError(f'Filter-Operator "{operator}" wird nicht unterstützt.')
+        if not ok:
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# HTTP-Server mit Last- und Fehlerinjektion
+# ---------------------------------------------------------------------------
+
+class Faults:
+    """Einstellungen für Latenz, Fehler und Drosselung."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        max_rps: float = 0.0,
+        workers: int = 0,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.max_rps = max_rps
+        self.random = random.Random(seed)
+        # Begrenzte Bearbeitung: weitere Anfragen warten (Latenz steigt wie bei einem ausgelasteten Strapi)
+        self.slots = threading.BoundedSemaphore(workers) if workers > 0 else None
+        self._lock = threading.Lock()
+        self._tokens = max_rps
+        self._refilled = time.monotonic()
+
+    def latency(self) -> float:
+        with self._lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self.random.random() < rate
+
+    def throttle(self) -> Optional[int]:
+        """Sekunden für Retry-After, falls die Anfrage mit 429 abgewiesen wird."""
+        if self.roll(self.throttle_rate):
+            return max(0, math.ceil(self.retry_after))
+        if self.max_rps <= 0:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_rps, self._tokens + (now - self._refilled) * self.max_rps)
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return None
+            return max(1, math.ceil((1 - self._tokens) / self.max_rps))
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        # Angenommene TCP-Verbindungen (zeigt, ob Clients Keep-Alive nutzen)
+        self.connections = 0
+        self.operations: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.started = time.monotonic()
+
+    def count(self, operation: str, status: int) -> None:
+        with self.lock:
+            self.requests += 1
+            self.operations[operation] += 1
+            self.statuses[str(status)] += 1
+
+    def count_connection(self) -> None:
+        with self.lock:
+            self.connections += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'connections': self.connections,
+                'operations': dict(self.operations),
+                'statuses': dict(self.statuses),
+                'seconds': time.monotonic() - self.started,
+            }
+
+
+_OPERATION_NAME = re.compile(r'^\s*(?:query|mutation)\s+(\w+)')
+
+
+class FakeStrapiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        store: FakeStrapiStore,
+        faults: Faults,
+        verbose: bool = False,
+        gzip_responses: bool = False,
+    ):
+        super().__init__(address, FakeStrapiHandler)
+        self.store = store
+        self.faults = faults
+        self.gzip_responses = gzip_responses
+        self.stats = Stats()
+        self.verbose = verbose
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/graphql'
+
+
+class FakeStrapiHandler(BaseHTTPRequestHandler):
+    # Keep-Alive wie bei Strapi hinter einem Reverse-Proxy
+    protocol_version = 'HTTP/1.1'
+    # Header und Body gehen in getrennten Writes raus; ohne TCP_NODELAY kämen ~40 ms Delayed-ACK hinzu
+    disable_nagle_algorithm = True
+    server: FakeStrapiServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.stats.count_connection()
+
+    def _send_json(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        accepts_gzip = 'gzip' in (self.headers.get('Accept-Encoding') or '')
+        if self.server.gzip_responses and accepts_gzip and len(payload) >= GZIP_MIN_BYTES:
+            payload = gzip.compress(payload, compresslevel=5)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        if self.path.startswith('/__stats'):
+            snapshot = self.server.stats.snapshot()
+            snapshot['records'] = self.server.store.counts()
+            if 'reset=1' in self.path:
+                self.server.stats.reset()
+            self._send_json(200, snapshot)
+        else:
+            self._send_json(404, {'error': 'Not Found'})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+            query = request.get('query') or ''
+        except (ValueError, AttributeError):
+            self.server.stats.count('invalid', 400)
+            self._send_json(400, {'errors': [{'message': 'Invalid JSON body'}]})
+            return
+        match = _OPERATION_NAME.match(query)
+        operation = match.group(1) if match else 'anonymous'
+        faults = self.server.faults
+
+        retry_after = faults.throttle()
+        if retry_after is not None:
+            self.server.stats.count(operation, 429)
+            self._send_json(429, {'errors': [{'message': 'Too Many Requests'}]}, {'Retry-After': str(retry_after)})
+            return
+
+        if faults.slots:
+            faults.slots.acquire()
+        try:
+            delay = faults.latency()
+            if delay:
+                time.sleep(delay)
+            if faults.roll(faults.error_rate):
+                status, body = 500, {'errors': [{'message': 'Internal Server Error'}]}
+            else:
+                try:
+                    status, body = 200, self.server.store.execute(query, request.get('variables') or {})
+                except GraphQLError as exc:
+                    status, body = 400, {'errors': [{'message': str(exc), 'extensions': {'code': exc.code}}]}
+        finally:
+            if faults.slots:
+                faults.slots.release()
+        self.server.stats.count(operation, status)
+        self._send_json(status, body)
+
+
+def start_server(
+    host: str = '127.0.0.1',
+    port: int = 0,
+    store: Optional[FakeStrapiStore] = None,
+    faults: Optional[Faults] = None,
+    verbose: bool = False,
+    gzip_responses: bool = False,
+) -> FakeStrapiServer:
+    """Startet den Server in einem Hintergrund-Thread (port=0: freier Port, siehe .endpoint)."""
+    server = FakeStrapiServer((host, port), store or FakeStrapiStore(), faults or Faults(), verbose, gzip_responses)
+    threading.Thread(target=server.serve_forever, name='fake-strapi', daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Lokaler Strapi-GraphQL-Ersatz für Lasttests der Import-Flows')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1337)
+    parser.add_argument('--seed-json', help='Anfangsbestand {"users": [...], "breeders": [...], "dogs": [...]}')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Bearbeitungszeit je Anfrage in ms')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Zufällige Abweichung der Latenz (+/- ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Anteil der Anfragen mit HTTP 500 (0..1)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Anteil der Anfragen mit HTTP 429 (0..1)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After der zufälligen 429-Antworten in Sekunden')
+    parser.add_argument('--max-rps', type=float, default=0.0, help='Ratenlimit (Token-Bucket); darüber 429 mit Retry-After')
+    parser.add_argument('--workers', type=int, default=0, help='Gleichzeitig bearbeitete Anfragen (0 = unbegrenzt)')
+    parser.add_argument('--random-seed', type=int, default=None, help='Startwert für reproduzierbare Fehlerinjektion')
+    parser.add_argument('--gzip', action='store_true', help='Antworten ab 1 KiB gzip-komprimiert senden, wenn der Client es akzeptiert')
+    parser.add_argument('--verbose', action='store_true', help='Jede Anfrage protokollieren')
+    args = parser.parse_args()
+
+    store = FakeStrapiStore()
+    if args.seed_json:
+        with open(args.seed_json, 'r', encoding='utf-8') as handle:
+            store.load_seed(json.load(handle))
+    faults = Faults(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        max_rps=args.max_rps,
+        workers=args.workers,
+        seed=args.random_seed,
+    )
+    server = FakeStrapiServer((args.host, args.port), store, faults, args.verbose, args.gzip)
+    print(f'Fake-Strapi läuft: ENDPOINT={server.endpoint} ({store.counts()})', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Synthetische Chromosoft-Exporte (Mitglieder und Hunde) für Durchsatz-Benchmarks.
+
+Die Daten ähneln den echten Exporten: Familien teilen sich eine E-Mail-Adresse, ein
+Teil der Mitglieder sind (aktive) Züchter mit Zwingernamen, jeder Hund hat einen
+Züchter und meist einen Besitzer aus dem Mitgliederbestand, und die Eltern verweisen
+über Zuchtbuchnummer und vollständigen Namen auf Hunde früherer Generationen
+(einige Vorfahren fehlen im Export, einige Angaben sind leer).
+"""
+import csv
+import random
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+MEMBER_COLUMNS = [
+    'ID Person', 'salutation', 'title', 'firstname', 'lastname', 'street', 'zipcode', 'city', 'oblast',
+    'country', 'mobile', 'phone', 'email', 'person is a breeder', 'person is an active breeder',
+    'membership number', 'date of birth', 'date of death', 'date of joining', 'date of leaving',
+    'person is a member', 'breeding station',
+]
+
+DOG_COLUMNS = [
+    'ID Animal', 'Given Name', 'Full Name', 'ID Breeder', 'ID Owner', 'chip number', 'sex',
+    'date of birth', 'date of death', 'color', 'Richterbericht', 'fertile', 'Name of Breeding Station',
+    'studbook number', 'studbook number (sire)', 'studbook number (dam)', 'fullname (sire)',
+    'fullname (dam)', 'HD', 'HD(G)', 'Gentest SOD1', 'Augenuntersuchung', 'DNA-Profil',
+    'Herzuntersuchung', 'D-Lokus', 'Fellabweichung', 'Verhalten Wesenstest', 'Körung Ergebnis',
+]
+
+FIRST_NAMES = ['Anna', 'Bernd', 'Clara', 'Dieter', 'Eva', 'Frank', 'Gabi', 'Heinz', 'Ina', 'Jörg', 'Karin', 'Lutz']
+LAST_NAMES = ['Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Meyer', 'Wagner', 'Becker', 'Hoffmann', 'Koch']
+CITIES = [('10115', 'Berlin'), ('20095', 'Hamburg'), ('80331', 'München'), ('50667', 'Köln'), ('01067', 'Dresden')]
+REGIONS = ['Nord', 'Süd', 'Ost', 'West', 'Mitte']
+DOG_NAMES = ['Aron', 'Bella', 'Cora', 'Dago', 'Enzo', 'Finja', 'Gero', 'Hanka', 'Ilka', 'Jago', 'Kira', 'Lasko']
+
+# Anteile wie in den echten Exporten (grob geschätzt)
+SHARED_EMAIL_RATE = 0.08
+BREEDER_RATE = 0.1
+ACTIVE_BREEDER_RATE = 0.7
+FOUNDER_RATE = 0.05
+MISSING_PARENT_RATE = 0.03
+
+
+class MemberExport(NamedTuple):
+    c_ids: List[int]
+    breeder_ids: List[int]
+    kennel_names: dict
+
+
+def _date(rnd: random.Random, first_year: int, last_year: int) -> str:
+    return f'{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/{rnd.randint(first_year, last_year)}'
+
+
+def write_member_export(path: Path, rows: int, seed: int = 1) -> MemberExport:
+    """Schreibt einen Mitglieder-Export und gibt cIds, Züchter-cIds und Zwingernamen zurück."""
+    rnd = random.Random(seed)
+    c_ids: List[int] = []
+    breeder_ids: List[int] = []
+    kennel_names: dict = {}
+    emails: List[str] = []
+    with path.open('w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(MEMBER_COLUMNS)
+        for i in range(1, rows + 1):
+            c_id = 10000 + i
+            first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+            if emails and rnd.random() < SHARED_EMAIL_RATE:
+                # Familienmitglied mit derselben Adresse
+                email = rnd.choice(emails[-50:])
+            else:
+                email = f'{first}.{last}.{i}@example.com'.lower()
+                emails.append(email)
+            is_breeder = rnd.random() < BREEDER_RATE
+            kennel = f'vom {last}hof {i}' if is_breeder else ''
+            zipcode, city = rnd.choice(CITIES)
+            writer.writerow([
+                c_id, rnd.choice(['Herr', 'Frau']), rnd.choice(['', '', 'Dr.']), first, last,
+                f'{last}straße {rnd.randint(1, 120)}', zipcode, city, rnd.choice(REGIONS), 'Deutschland',
+                f'0170 {rnd.randint(1000000, 9999999)}', '', email, '1' if is_breeder else '0',
+                '1' if is_breeder and rnd.random() < ACTIVE_BREEDER_RATE else '0', 20000 + i,
+                _date(rnd, 1940, 2005), '-', _date(rnd, 1980, 2025), '-', '1', kennel,
+            ])
+            c_ids.append(c_id)
+            if is_breeder:
+                breeder_ids.append(c_id)
+                kennel_names[c_id] = kennel
+    return MemberExport(c_ids, breeder_ids, kennel_names)
+
+
+class _Dog(NamedTuple):
+    full_name: str
+    studbook_number: str
+    male: bool
+
+
+def write_dog_export(path: Path, rows: int, members: Optional[MemberExport] = None, seed: int = 2) -> None:
+    """Schreibt einen Hunde-Export mit Stammbaum-Verweisen auf frühere Hunde derselben Datei."""
+    rnd = random.Random(seed)
+    members = members or MemberExport([], [], {})
+    breeder_ids = members.breeder_ids or [None]
+    dogs: List[_Dog] = []
+
+    def parent(male: bool) -> Optional[_Dog]:
+        # Eltern aus den letzten Generationen (jüngere Hunde haben jüngere Eltern)
+        pool = dogs[-2000:]
+        for _ in range(8):
+            candidate = rnd.choice(pool)
+            if candidate.male == male:
+                return candidate
+        return None
+
+    with path.open('w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(DOG_COLUMNS)
+        for i in range(1, rows + 1):
+            breeder_id = rnd.choice(breeder_ids)
+            kennel = members.kennel_names.get(breeder_id, f'vom Zwinger {i % 300}')
+            male = rnd.random() < 0.5
+            given = f'{rnd.choice(DOG_NAMES)} {i}'
+            full_name = f'{given} {kennel}'
+            studbook = f'HZD {i:06d}'
+            sire = dam = None
+            if dogs and rnd.random() > FOUNDER_RATE:
+                sire, dam = parent(True), parent(False)
+            sire_studbook = sire.studbook_number if sire else '-'
+            dam_studbook = dam.studbook_number if dam else '-'
+            if sire and rnd.random() < MISSING_PARENT_RATE:
+                # Vorfahr fehlt im Export: nur der Name ist bekannt
+                sire_studbook = f'FCI {i:06d}'
+            owner = rnd.choice(members.c_ids) if members.c_ids and rnd.random() < 0.9 else ''
+            writer.writerow([
+                1000000 + i, given, full_name, breeder_id or '', owner, f'276{i:012d}', 'Rüde' if male else 'Hündin',
+                _date(rnd, 2000, 2025), rnd.choice(['-', '-', '-', _date(rnd, 2010, 2025)]),
+                rnd.choice(['schwarz', 'blond', 'schwarzmarken']), '', rnd.choice(['1', '0', '']), kennel,
+                studbook, sire_studbook, dam_studbook, sire.full_name if sire else '-', dam.full_name if dam else '-',
+                rnd.choice(['A1', 'A2', 'B1', '-']), '', rnd.choice(['N/N', 'N/DM', '-']), rnd.choice(['o. B.', '-']),
+                rnd.choice(['1', '']), '-', '', '-', rnd.choice(['-', 'bestanden']), rnd.choice(['-', 'angekört']),
+            ])
+            dogs.append(_Dog(full_name, studbook, male))
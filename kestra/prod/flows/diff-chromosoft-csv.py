@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Vergleicht einen neuen Chromosoft-Export mit dem vorherigen Snapshot und schreibt
+nur die neuen und geänderten Zeilen in eine Delta-CSV (gleicher Header wie der Export).
+
+Die Delta-Datei kann direkt an import-dogs-from-chromosoft-csv.py bzw.
+import-members-from-chromosoft-csv.py übergeben werden. Alternativ nehmen beide
+Importer den Snapshot über --since-snapshot entgegen.
+
+# python diff-chromosoft-csv.py snapshot/hzd-hunde-rueden.csv hzd-hunde-rueden.csv \
+#  --kind dogs --out delta-rueden.csv
+"""
+import argparse
+import sys
+
+from lib.csv_diff import DOG_KEY_COLUMN, MEMBER_KEY_COLUMN, diff_csv, write_rows
+
+KEY_COLUMNS = {
+    'dogs': DOG_KEY_COLUMN,
+    'members': MEMBER_KEY_COLUMN,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Zeilenweiser Diff zweier Chromosoft-CSV-Exporte')
+    parser.add_argument('previous', help='Vorheriger Export (Snapshot)')
+    parser.add_argument('current', help='Aktueller Export')
+    parser.add_argument('--kind', choices=sorted(KEY_COLUMNS), default='dogs',
+                        help='Art des Exports; bestimmt die Schlüsselspalte (Standard: dogs)')
+    parser.add_argument('--key', default=None, help='Schlüsselspalte explizit angeben')
+    parser.add_argument('--delimiter', default=',', help='CSV-Trennzeichen (Standard: Komma)')
+    parser.add_argument('--out', default=None, help='Delta-CSV mit neuen und geänderten Zeilen')
+    parser.add_argument('--removed-out', default=None,
+                        help='CSV mit den im aktuellen Export entfernten Zeilen (aus dem Snapshot)')
+    args = parser.parse_args()
+
+    key_column = args.key or KEY_COLUMNS[args.kind]
+    try:
+        diff = diff_csv(args.previous, args.current, key_column, args.delimiter)
+    except (OSError, ValueError) as e:
+        print(f'Fehler: {e}', file=sys.stderr)
+        sys.exit(1)
+
+    print(f'Diff {args.previous} -> {args.current}: {diff.summary()}')
+    if args.out:
+        written = write_rows(args.current, args.out, diff.upserted, key_column, args.delimiter)
+        print(f'{written} Zeilen nach {args.out} geschrieben.')
+    if args.removed_out:
+        written = write_rows(args.previous, args.removed_out, set(diff.removed), key_column, args.delimiter)
+        print(f'{written} entfernte Zeilen nach {args.removed_out} geschrieben.')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,17 +4,28 @@ from __future__ import annotations
 import argparse
 import csv
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional
 from dotenv import load_dotenv
 import os
 import requests
 
+from lib.adaptive_limiter import THROTTLE_STATUSES, AdaptiveLimiter, parse_retry_after
+from lib.csv_diff import DOG_KEY_COLUMN, diff_csv
+from lib.date_parsing import DateParser
+from lib.import_journal import ImportJournal, fingerprint_files
+from lib.query_cache import QueryCache, is_query
+from lib.stage_timings import StageTimings, operation_name
+from lib.sync_state import SyncStateStore, breeder_payload, payload_hash
+
 load_dotenv()
 
+# Laufzeiten je Phase und GraphQL-Operation (Zusammenfassung am Ende des Imports, --metrics-json)
+timings = StageTimings()
+
 
 try:
 	import requests
@@ -26,6 +37,10 @@ except ImportError as exc:  # pragma: no cover
 # python scripts/import-dogs-from-chromosoft-csv.py \
 #  pfad/zur/chromosoft.csv \
 #  --verbose
+#
+# Hündinnen und Rüden in einem Lauf (Breeder und Eltern werden über beide Dateien aufgelöst):
+# python scripts/import-dogs-from-chromosoft-csv.py \
+#  hzd-hunde-hundinnen.csv hzd-hunde-rueden.csv
 
 DOG_BY_CID_QUERY = """
 query DogByCId($cId: Int) {
@@ -91,6 +106,113 @@ query UserByCId($cId: Int!) {
 }
 """
 
+# Felder, die build_graphql_payload bzw. die Eltern-Verknüpfung setzen. Sie werden beim
+# Vorabladen mitgelesen, damit unveränderte Hunde ohne Mutation übersprungen werden können.
+DOG_STATE_FIELDS = """
+      documentId
+      cId
+      givenName
+      fullKennelName
+      cBreederId
+      cOwnerId
+      microchipNo
+      cFertile
+      HD
+      SOD1
+      EyesCheck
+      Genprofil
+      HeartCheck
+      ColorCheck
+      breeder { documentId }
+      owner { documentId }
+      father { documentId }
+      mother { documentId }
+      cStudBookNumber
+      cStudBookNumberFather
+      cStudBookNumberMother
+      sex
+      dateOfBirth
+      dateOfDeath
+      Exhibitions
+      BreedSurvey
+"""
+
+DOGS_BY_CIDS_QUERY = """
+query DogsByCIds($cIds: [Int], $page: Int!, $pageSize: Int!) {
+  hzdPluginDogs(filters: { cId: { in: $cIds } }, pagination: { page: $page, pageSize: $pageSize }) {""" + DOG_STATE_FIELDS + """  }
+}
+"""
+
+BREEDERS_BY_CIDS_QUERY = """
+query BreedersByCIds($cIds: [Int], $page: Int!, $pageSize: Int!) {
+  hzdPluginBreeders(filters: { cId: { in: $cIds } }, pagination: { page: $page, pageSize: $pageSize }) {
+    documentId
+    cId
+    kennelName
+    member { documentId }
+  }
+}
+"""
+
+USERS_BY_CIDS_QUERY = """
+query UsersByCIds($cIds: [Int], $page: Int!, $pageSize: Int!) {
+  usersPermissionsUsers(filters: { cId: { in: $cIds } }, pagination: { page: $page, pageSize: $pageSize }) {
+    documentId
+    cId
+  }
+}
+"""
+
+DOG_INDEX_QUERY = """
+query DogIndex($page: Int!, $pageSize: Int!) {
+  hzdPluginDogs_connection(pagination: { page: $page, pageSize: $pageSize }) {
+    nodes {""" + DOG_STATE_FIELDS + """    }
+    pageInfo {
+      pageCount
+    }
+  }
+}
+"""
+
+BREEDER_INDEX_QUERY = """
+query BreederIndex($page: Int!, $pageSize: Int!) {
+  hzdPluginBreeders_connection(pagination: { page: $page, pageSize: $pageSize }) {
+    nodes {
+      documentId
+      cId
+      kennelName
+      member { documentId }
+    }
+    pageInfo {
+      pageCount
+    }
+  }
+}
+"""
+
+DOGS_BY_STUDBOOK_NUMBERS_QUERY = """
+query DogsByStudBookNumbers($studBookNumbers: [String], $page: Int!, $pageSize: Int!) {
+  hzdPluginDogs(filters: { cStudBookNumber: { in: $studBookNumbers } }, pagination: { page: $page, pageSize: $pageSize }) {
+    documentId
+    cStudBookNumber
+  }
+}
+"""
+
+USER_INDEX_QUERY = """
+query UserIndex($page: Int!, $pageSize: Int!) {
+  usersPermissionsUsers_connection(pagination: { page: $page, pageSize: $pageSize }) {
+    nodes {
+      documentId
+      cId
+    }
+    pageInfo {
+      pageCount
+    }
+  }
+}
+"""
+
 SEX_ENUM_MAP = {
 	'': None,
 	'hündin': 'F',
@@ -142,46 +264,127 @@ class ChromosoftDogRecord:
 	color_check: Optional[bool]
 
 
+class ParentRef(NamedTuple):
+	"""Was Phase 2 von einem Hund noch braucht; ersetzt beim Streaming den vollständigen Record."""
+	c_id: int
+	given_name: str
+	sire_full_name: str
+	dam_full_name: str
+	sire_studbook_number: str = ''
+	dam_studbook_number: str = ''
+
+
 class GraphQLClient:
-	def __init__(self, endpoint: str, token: Optional[str], timeout: int = 30, max_retries: int = 3, retry_delay: float = 1.0, verbose: bool = False) -> None:
+	def __init__(self, endpoint: str, token: Optional[str], timeout: int = 30, max_retries: int = 3, retry_delay: float = 1.0, verbose: bool = False, pool_size: int = 10, state: Optional[SyncStateStore] = None, limiter: Optional[AdaptiveLimiter] = None, cache: Optional[QueryCache] = None) -> None:
 		self.endpoint = endpoint
 		self.timeout = timeout
 		self.max_retries = max_retries
 		self.retry_delay = retry_delay
 		self.verbose = verbose
-		self.session = requests.Session()
-		self.session.headers.update({'Content-Type': 'application/json'})
+		self.headers = {'Content-Type': 'application/json'}
 		if token:
-			self.session.headers['Authorization'] = f'Bearer {token}'
-
-	def execute(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
-		"""Führt eine GraphQL-Query/Mutation aus mit deterministischer Retry-Logik."""
+			self.headers['Authorization'] = f'Bearer {token}'
+		# Genug Verbindungen im Pool, damit parallele Worker (--concurrency) nicht blockieren;
+		# der Pool wird geteilt, die Sessions sind je Thread (requests.Session ist nicht thread-sicher)
+		self._adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+		self._local = threading.local()
+		# cId -> documentId, gefüllt durch preload_indexes(); None = keine Vorab-Ladung
+		self.dog_index: Optional[dict[int, str]] = None
+		self.breeder_index: Optional[dict[int, str]] = None
+		self.user_index: Optional[dict[int, str]] = None
+		# cId -> aktueller Serverstand des Hundes (siehe DOG_STATE_FIELDS)
+		self.dog_state: dict[int, dict[str, Any]] = {}
+		# cId -> aktueller kennelName/member des Breeders (aus Vorabladen bzw. Batch-Abfrage)
+		self.breeder_state: dict[int, dict[str, Any]] = {}
+		# Zuchtbuchnummer (normalisiert) -> documentId aller Hunde in Strapi; None = nicht geladen
+		self.studbook_index: Optional[dict[str, str]] = None
+		# Einzeln bzw. per Batch aufgelöste Zuchtbuchnummern (None = nicht in Strapi), ohne vollständigen Index
+		self.studbook_lookup: dict[str, Optional[str]] = {}
+		# True nach preload_indexes(): die Indizes sind dann vollständig
+		self.preloaded = False
+		# Persistenter Sync-Status aus früheren Läufen (optional, --state-db)
+		self.state = state
+		# Adaptive Begrenzung gleichzeitiger Anfragen (optional, --adaptive)
+		self.limiter = limiter
+		# Read-Through-Cache für Queries (optional, --query-cache-ttl)
+		self.cache = cache
+
+	@property
+	def session(self) -> requests.Session:
+		"""Session des aktuellen Threads (Verbindungen aus dem gemeinsamen Pool)."""
+		session = getattr(self._local, 'session', None)
+		if session is None:
+			session = requests.Session()
+			session.mount('http://', self._adapter)
+			session.mount('https://', self._adapter)
+			session.headers.update(self.headers)
+			self._local.session = session
+		return session
+
+	def execute(self, query: str, variables: dict[str, Any], raise_on_errors: bool = True) -> dict[str, Any]:
+		"""Führt eine GraphQL-Query/Mutation aus; Queries ggf. über den Cache, Mutationen invalidieren ihn."""
+		if self.cache is None:
+			return self._execute(query, variables, raise_on_errors)
+		if is_query(query):
+			return self.cache.get_or_load(query, variables, lambda: self._execute(query, variables, raise_on_errors))
+		# Vorher: laufende Abfragen speichern ihr Ergebnis nicht mehr; nachher: inzwischen gespeicherte verwerfen
+		self.cache.invalidate(query, variables)
+		try:
+			return self._execute(query, variables, raise_on_errors)
+		finally:
+			self.cache.invalidate(query, variables)
+
+	def _execute(self, query: str, variables: dict[str, Any], raise_on_errors: bool = True) -> dict[str, Any]:
+		"""Führt eine GraphQL-Query/Mutation aus mit deterministischer Retry-Logik.
+
+		Mit raise_on_errors=False werden GraphQL-Fehler nicht geworfen, sondern mit der
+		Antwort zurückgegeben (für gebündelte Mutationen mit Teilergebnissen).
+		Bei 429/503 wird vor der Wiederholung die Retry-After-Angabe des Servers
+		abgewartet; mit Limiter gilt die Pause für alle Worker.
+		"""
 		max_attempts = max(1, min(self.max_retries, 10))  # Begrenze auf 1-10 Versuche
 		last_exception = None
+		stage = f'graphql.{operation_name(query)}'
+		retry_after: Optional[float] = None
 
 		for attempt in range(max_attempts):
 			try:
 				if attempt > 0:
-					# Exponential backoff: 1s, 2s, 4s, etc.
-					delay = self.retry_delay * (2 ** (attempt - 1))
+					# Retry-After des Servers, sonst exponential backoff: 1s, 2s, 4s, etc.
+					delay = retry_after if retry_after is not None else self.retry_delay * (2 ** (attempt - 1))
 					if self.verbose:
 						print(f'Warte {delay:.1f}s vor Wiederholung {attempt + 1}/{max_attempts}...', file=sys.stderr)
-					time.sleep(delay)
+					timings.sleep(delay, 'retry.backoff')
+					retry_after = None
 
 				if self.verbose:
 					print(f'Verbinde mit: {self.endpoint}', file=sys.stderr)
 
-				response = self.session.post(
-					self.endpoint,
-					json={'query': query, 'variables': variables},
-					timeout=self.timeout,
-				)
-				if(response.status_code != 200):
+				started = self.limiter.acquire() if self.limiter else 0.0
+				try:
+					with timings.stage(stage):
+						response = self.session.post(
+							self.endpoint,
+							json={'query': query, 'variables': variables},
+							timeout=self.timeout,
+						)
+				except RequestException:
+					if self.limiter:
+						self.limiter.release(started, None)
+					raise
+				if response.status_code in THROTTLE_STATUSES:
+					retry_after = parse_retry_after(response.headers.get('Retry-After'))
+				if self.limiter:
+					self.limiter.release(started, response.status_code, retry_after)
+				if response.status_code in THROTTLE_STATUSES:
+					if self.verbose:
+						print(f'Server ausgelastet (HTTP {response.status_code}, Retry-After: {retry_after})', file=sys.stderr)
+				elif response.status_code != 200:
 					print(response.json())
 				response.raise_for_status()
 				payload = response.json()
 				errors = payload.get('errors', [])
-				if errors:
+				if errors and raise_on_errors:
 					# GraphQL-Fehler werden nicht wiederholt, da sie deterministisch sind
 					raise RuntimeError(f'GraphQL Fehler: {errors}')
 				return payload
@@ -207,31 +410,274 @@ class GraphQLClient:
 			raise last_exception
 		raise RuntimeError(f'Unerwarteter Fehler bei der Ausführung nach {max_attempts} Versuchen')
 
+	def _fetch_cid_index(
+		self,
+		query: str,
+		root: str,
+		page_size: int = 100,
+		on_node: Optional[Callable[[dict[str, Any]], None]] = None,
+	) -> dict[int, str]:
+		"""Lädt alle Einträge einer _connection-Query seitenweise und baut eine cId -> documentId Map."""
+		index: dict[int, str] = {}
+		page = 1
+		while True:
+			data = self.execute(query, {'page': page, 'pageSize': page_size})
+			connection = (data.get('data') or {}).get(root) or {}
+			for node in connection.get('nodes') or []:
+				c_id = node.get('cId')
+				document_id = node.get('documentId')
+				if c_id is not None and document_id:
+					# Wie bei den Einzel-Queries gewinnt der erste Treffer
+					if c_id not in index and on_node:
+						on_node(node)
+					index.setdefault(c_id, document_id)
+			page_count = (connection.get('pageInfo') or {}).get('pageCount') or 0
+			if page >= page_count:
+				return index
+			page += 1
+
+	def preload_indexes(self) -> None:
+		"""Lädt Hunde, Breeder und User einmalig vorab; find_*_by_cid antworten danach lokal."""
+		studbook_index: dict[str, str] = {}
+
+		def remember_dog(node: dict[str, Any]) -> None:
+			self._remember_dog_state(node)
+			remember_studbook_number(studbook_index, node)
+
+		self.dog_index = self._fetch_cid_index(DOG_INDEX_QUERY, 'hzdPluginDogs_connection', on_node=remember_dog)
+		self.studbook_index = studbook_index
+		self.breeder_index = self._fetch_cid_index(
+			BREEDER_INDEX_QUERY, 'hzdPluginBreeders_connection', on_node=self._remember_breeder_state
+		)
+		self.user_index = self._fetch_cid_index(USER_INDEX_QUERY, 'usersPermissionsUsers_connection')
+		self.preloaded = True
+		print(
+			f'Vorab geladen: {len(self.dog_index)} Hunde, {len(self.breeder_index)} Breeder, '
+			f'{len(self.user_index)} User',
+			file=sys.stderr,
+		)
+
+	def load_breeder_index(self) -> None:
+		"""Lädt alle Breeder mit kennelName und member seitenweise, falls noch kein Index vorliegt."""
+		if self.breeder_index is not None:
+			return
+		self.breeder_index = self._fetch_cid_index(
+			BREEDER_INDEX_QUERY, 'hzdPluginBreeders_connection', on_node=self._remember_breeder_state
+		)
+		print(f'Breeder geladen: {len(self.breeder_index)}', file=sys.stderr)
+
+	def load_studbook_numbers(self, studbook_numbers: Iterable[Optional[str]], chunk_size: int = 100) -> None:
+		"""Löst nur die angegebenen Zuchtbuchnummern per `in`-Filter auf (statt alle Hunde zu laden).
+
+		Ohne Treffer gemerkte Nummern gelten danach als nicht vorhanden, wie bei der Einzelabfrage.
+		Strapi vergleicht exakt: gesendet werden die Werte aus der CSV, gemerkt wird per studbook_key.
+		"""
+		if self.studbook_index is not None:
+			return
+		values_by_key: dict[str, list[str]] = {}
+		for number in studbook_numbers:
+			key = studbook_key(number)
+			if key and key not in self.studbook_lookup:
+				values = values_by_key.setdefault(key, [])
+				if number.strip() not in values:
+					values.append(number.strip())
+		wanted = list(values_by_key)
+		chunk_size = max(1, min(chunk_size, MAX_PAGE_SIZE))
+		found: dict[str, str] = {}
+		for start in range(0, len(wanted), chunk_size):
+			chunk = wanted[start:start + chunk_size]
+			numbers = [number for key in chunk for number in values_by_key[key]]
+			page = 1
+			while True:
+				data = self.execute(DOGS_BY_STUDBOOK_NUMBERS_QUERY, {'studBookNumbers': numbers, 'page': page, 'pageSize': MAX_PAGE_SIZE})
+				items = (data.get('data') or {}).get('hzdPluginDogs') or []
+				for item in items:
+					remember_studbook_number(found, item)
+				if len(items) < MAX_PAGE_SIZE or all(key in found for key in chunk):
+					break
+				page += 1
+		for key in wanted:
+			self.studbook_lookup[key] = found.get(key)
+		print(f'Zuchtbuchnummern per Batch aufgelöst: {len(found)} von {len(wanted)}', file=sys.stderr)
+
+	def load_indexes_for(
+		self,
+		dog_ids: Iterable[Optional[int]],
+		breeder_ids: Iterable[Optional[int]],
+		user_ids: Iterable[Optional[int]],
+		chunk_size: int = 100,
+	) -> None:
+		"""Löst nur die angegebenen cIds per Batch-Abfrage auf (gezielter Import statt Vollladung).
+
+		cIds, die bereits im Sync-Status bekannt sind, werden nicht erneut abgefragt.
+		"""
+		if self.state is not None:
+			dog_ids = [c_id for c_id in dog_ids if not self.state.document_id('dog', c_id)]
+			breeder_ids = [c_id for c_id in breeder_ids if not self.state.document_id('breeder', c_id)]
+			user_ids = [c_id for c_id in user_ids if not self.state.document_id('user', c_id)]
+		dog_index = self._find_many_by_cid(
+			DOGS_BY_CIDS_QUERY, 'hzdPluginDogs', self.dog_index, dog_ids, chunk_size, on_item=self._remember_dog_state
+		)
+		breeder_index = self._find_many_by_cid(
+			BREEDERS_BY_CIDS_QUERY, 'hzdPluginBreeders', self.breeder_index, breeder_ids, chunk_size,
+			on_item=self._remember_breeder_state,
+		)
+		user_index = self.find_many_users_by_cid(user_ids, chunk_size)
+		self.dog_index, self.breeder_index, self.user_index = dog_index, breeder_index, user_index
+		print(
+			f'Per Batch aufgelöst: {len(dog_index)} Hunde, {len(breeder_index)} Breeder, '
+			f'{len(user_index)} User',
+			file=sys.stderr,
+		)
+
+	def _lookup_local(self, kind: str, index: Optional[dict[int, str]], c_id: int) -> tuple[bool, Optional[str]]:
+		"""Löst eine cId ohne Anfrage auf. Gibt (bekannt, documentId) zurück."""
+		if index is not None and c_id in index:
+			return True, index[c_id]
+		if self.preloaded:
+			# Vollständig vorab geladen: was fehlt, gibt es in Strapi nicht
+			return True, None
+		if self.state is not None:
+			document_id = self.state.document_id(kind, c_id)
+			if document_id:
+				return True, document_id
+		if index is not None:
+			# Per Batch aufgelöst: die angefragten cIds ohne Treffer existieren nicht
+			return True, None
+		return False, None
+
+	def is_dog_unchanged(self, c_id: int, document_id: str, payload: dict[str, Any], kind: str = 'dog') -> bool:
+		"""Vergleicht den Payload mit dem Serverstand bzw. mit dem zuletzt gesendeten Payload-Hash."""
+		server_state = self.get_dog_state(c_id)
+		if server_state is not None:
+			return is_payload_unchanged(payload, server_state)
+		return self.state is not None and self.state.is_unchanged(kind, c_id, document_id, payload_hash(payload))
+
+	def remember_synced(self, kind: str, c_id: Optional[int], document_id: Optional[str], payload: dict[str, Any]) -> None:
+		"""Merkt sich einen erfolgreich synchronisierten Payload im Sync-Status."""
+		if self.state is not None:
+			self.state.set(kind, c_id, document_id, payload_hash(payload))
+
+	def _find_many_by_cid(
+		self,
+		query: str,
+		root: str,
+		index: Optional[dict[int, str]],
+		c_ids: Iterable[Optional[int]],
+		chunk_size: int,
+		on_item: Optional[Callable[[dict[str, Any]], None]] = None,
+	) -> dict[int, str]:
+		"""Löst mehrere cIds über `cId: { in: [...] }` in Blöcken von chunk_size auf."""
+		wanted = list(dict.fromkeys(c_id for c_id in c_ids if c_id is not None))
+		if index is not None:
+			return {c_id: index[c_id] for c_id in wanted if c_id in index}
+		# Strapi begrenzt pageSize standardmäßig auf 100
+		chunk_size = max(1, min(chunk_size, MAX_PAGE_SIZE))
+		found: dict[int, str] = {}
+		for start in range(0, len(wanted), chunk_size):
+			chunk = wanted[start:start + chunk_size]
+			page = 1
+			while True:
+				data = self.execute(query, {'cIds': chunk, 'page': page, 'pageSize': MAX_PAGE_SIZE})
+				items = (data.get('data') or {}).get(root) or []
+				for item in items:
+					c_id = item.get('cId')
+					document_id = item.get('documentId')
+					if c_id is not None and document_id:
+						# Wie bei den Einzel-Queries gewinnt der erste Treffer
+						if c_id not in found and on_item:
+							on_item(item)
+						found.setdefault(c_id, document_id)
+				# Eine volle Seite kann weitere Treffer haben (mehrere Dokumente mit derselben cId);
+				# sonst würden spätere cIds des Blocks fälschlich als fehlend gelten
+				if len(items) < MAX_PAGE_SIZE or all(c_id in found for c_id in chunk):
+					break
+				page += 1
+		return found
+
+	def _remember_dog_state(self, node: dict[str, Any]) -> None:
+		self.dog_state[node['cId']] = normalize_dog_state(node)
+
+	def get_dog_state(self, c_id: int) -> Optional[dict[str, Any]]:
+		"""Serverstand eines Hundes aus dem Vorabladen, sofern bekannt."""
+		return self.dog_state.get(c_id)
+
+	def _remember_breeder_state(self, node: dict[str, Any]) -> None:
+		self.breeder_state[node['cId']] = {
+			'kennelName': node.get('kennelName'),
+			'member': (node.get('member') or {}).get('documentId'),
+		}
+
+	def get_breeder_state(self, c_id: int) -> Optional[dict[str, Any]]:
+		"""Serverstand (kennelName, member-documentId) eines Breeders, sofern bekannt."""
+		return self.breeder_state.get(c_id)
+
+	def find_users_by_cid(self, c_ids: Iterable[Optional[int]], chunk_size: int = 100) -> dict[int, Optional[str]]:
+		"""Wie find_user_by_cid für mehrere cIds; lokal unbekannte werden gebündelt abgefragt."""
+		wanted = list(dict.fromkeys(c_id for c_id in c_ids if c_id is not None))
+		unknown = [c_id for c_id in wanted if not self._lookup_local('user', self.user_index, c_id)[0]]
+		found = self._find_many_by_cid(USERS_BY_CIDS_QUERY, 'usersPermissionsUsers', None, unknown, chunk_size)
+		if self.state is not None:
+			for c_id, document_id in found.items():
+				self.state.set('user', c_id, document_id)
+		return {
+			c_id: found.get(c_id) if c_id in unknown else self._lookup_local('user', self.user_index, c_id)[1]
+			for c_id in wanted
+		}
+
+	def find_many_by_cid(self, c_ids: Iterable[Optional[int]], chunk_size: int = 100) -> dict[int, str]:
+		"""Finde mehrere Hunde anhand ihrer cIds. Gibt cId -> documentId zurück."""
+		return self._find_many_by_cid(DOGS_BY_CIDS_QUERY, 'hzdPluginDogs', self.dog_index, c_ids, chunk_size)
+
+	def find_many_breeders_by_cid(self, c_ids: Iterable[Optional[int]], chunk_size: int = 100) -> dict[int, str]:
+		"""Finde mehrere Breeder anhand ihrer cIds. Gibt cId -> documentId zurück."""
+		return self._find_many_by_cid(BREEDERS_BY_CIDS_QUERY, 'hzdPluginBreeders', self.breeder_index, c_ids, chunk_size)
+
+	def find_many_users_by_cid(self, c_ids: Iterable[Optional[int]], chunk_size: int = 100) -> dict[int, str]:
+		"""Finde mehrere User anhand ihrer cIds. Gibt cId -> documentId zurück."""
+		return self._find_many_by_cid(USERS_BY_CIDS_QUERY, 'usersPermissionsUsers', self.user_index, c_ids, chunk_size)
+
 	def find_by_studbook_number(self, studbook_number: Optional[str]) -> Optional[str]:
 		if not studbook_number:
 			return None
-		data = self.execute(DOG_BY_STUDBOOK_NUMBER_QUERY, {"studBookNumber": studbook_number})
+		key = studbook_key(studbook_number)
+		if self.studbook_index is not None:
+			return self.studbook_index.get(key) if key else None
+		if key in self.studbook_lookup:
+			return self.studbook_lookup[key]
+		# Strapi vergleicht exakt: den Wert aus der CSV senden, nicht den Vergleichsschlüssel
+		data = self.execute(DOG_BY_STUDBOOK_NUMBER_QUERY, {"studBookNumber": studbook_number.strip()})
 		d = data.get('data') or {}
 		items = d.get('hzdPluginDogs') or []
-		if not items:
-			return None
-		return items[0].get('documentId')
+		document_id = items[0].get('documentId') if items else None
+		if key:
+			self.studbook_lookup[key] = document_id
+		return document_id
 
 	def find_by_cid(self, c_id: Optional[int]) -> Optional[str]:
 		if c_id is None:
 			return None
+		known, document_id = self._lookup_local('dog', self.dog_index, c_id)
+		if known:
+			return document_id
 		data = self.execute(DOG_BY_CID_QUERY, {"cId": c_id})
 		d = data.get('data') or {}
 		items = d.get('hzdPluginDogs') or []
 		if not items:
 			return None
-		return items[0].get('documentId')
+		document_id = items[0].get('documentId')
+		if self.state is not None:
+			self.state.set('dog', c_id, document_id)
+		return document_id
 
 	def create_dog(self, payload: dict[str, Any]) -> Optional[str]:
 		data = self.execute(CREATE_DOG_MUTATION, {'data': payload})
 		result = data.get('data', {}).get('createHzdPluginDog')
 		if result:
-			return result.get('documentId')
+			document_id = result.get('documentId')
+			if self.dog_index is not None and document_id and payload.get('cId') is not None:
+				self.dog_index[payload['cId']] = document_id
+			return document_id
 		return None
 
 	def update_dog(self, dog_id: str, payload: dict[str, Any]) -> Optional[str]:
@@ -243,23 +689,97 @@ class GraphQLClient:
 			return result.get('documentId')
 		return None
 
+	def upsert_dogs(self, items: list[tuple[Optional[str], dict[str, Any]]]) -> list[tuple[Optional[str], Optional[str]]]:
+		"""Sendet mehrere create/update-Mutationen für Hunde als ein GraphQL-Dokument mit Aliassen."""
+		return self._batch_upsert('Dog', 'Hunde', self.dog_index, items)
+
+	def upsert_breeders(self, items: list[tuple[Optional[str], dict[str, Any]]]) -> list[tuple[Optional[str], Optional[str]]]:
+		"""Sendet mehrere create/update-Mutationen für Breeder als ein GraphQL-Dokument mit Aliassen."""
+		return self._batch_upsert('Breeder', 'Breeder', self.breeder_index, items)
+
+	def _batch_upsert(
+		self,
+		entity: str,
+		label: str,
+		index: Optional[dict[int, str]],
+		items: list[tuple[Optional[str], dict[str, Any]]],
+	) -> list[tuple[Optional[str], Optional[str]]]:
+		"""Sendet mehrere create/update-Mutationen (HzdPlugin<entity>) als ein GraphQL-Dokument mit Aliassen.
+
+		items enthält (documentId bzw. None für Neuanlage, Payload). Zurückgegeben wird pro
+		Eintrag in gleicher Reihenfolge (documentId, Fehlermeldung).
+		"""
+		if not items:
+			return []
+		variable_defs: list[str] = []
+		fields: list[str] = []
+		variables: dict[str, Any] = {}
+		for i, (document_id, payload) in enumerate(items):
+			variable_defs.append(f'$d{i}: HzdPlugin{entity}Input!')
+			variables[f'd{i}'] = payload
+			if document_id:
+				variable_defs.append(f'$id{i}: ID!')
+				variables[f'id{i}'] = document_id
+				fields.append(f'  m{i}: updateHzdPlugin{entity}(documentId: $id{i}, data: $d{i}) {{ documentId }}')
+			else:
+				fields.append(f'  m{i}: createHzdPlugin{entity}(data: $d{i}) {{ documentId }}')
+		query = f'mutation BatchUpsert{entity}s({", ".join(variable_defs)}) {{\n' + '\n'.join(fields) + '\n}'
+		if self.verbose:
+			print(f'Sende {len(items)} {label}-Mutationen in einer Anfrage', file=sys.stderr)
+
+		response = self.execute(query, variables, raise_on_errors=False)
+		data = response.get('data') or {}
+		# Fehler über path[0] (= Alias) dem jeweiligen Datensatz zuordnen
+		errors_by_alias: dict[str, str] = {}
+		general_errors: list[str] = []
+		for error in response.get('errors') or []:
+			path = error.get('path') or []
+			message = error.get('message') or str(error)
+			if path:
+				errors_by_alias.setdefault(str(path[0]), message)
+			else:
+				general_errors.append(message)
+
+		results: list[tuple[Optional[str], Optional[str]]] = []
+		for i, (document_id, payload) in enumerate(items):
+			alias = f'm{i}'
+			result = data.get(alias)
+			if result and result.get('documentId'):
+				new_id = result['documentId']
+				if not document_id and index is not None and payload.get('cId') is not None:
+					index[payload['cId']] = new_id
+				results.append((new_id, None))
+			else:
+				error = errors_by_alias.get(alias) or '; '.join(general_errors) or 'keine documentId zurückgegeben'
+				results.append((None, error))
+		return results
+
 	def find_breeder_by_cid(self, c_id: Optional[int]) -> Optional[str]:
 		"""Finde Breeder anhand der Chromosoft-ID (cId)."""
 		if c_id is None:
 			return None
+		known, document_id = self._lookup_local('breeder', self.breeder_index, c_id)
+		if known:
+			return document_id
 		data = self.execute(BREEDER_BY_CID_QUERY, {"cId": c_id})
 		d = data.get('data') or {}
 		items = d.get('hzdPluginBreeders') or []
 		if not items:
 			return None
-		return items[0].get('documentId')
+		document_id = items[0].get('documentId')
+		if self.state is not None:
+			self.state.set('breeder', c_id, document_id)
+		return document_id
 
 	def create_breeder(self, payload: dict[str, Any]) -> Optional[str]:
 		"""Erstelle einen neuen Breeder."""
 		data = self.execute(CREATE_BREEDER_MUTATION, {'data': payload})
 		result = data.get('data', {}).get('createHzdPluginBreeder')
 		if result:
-			return result.get('documentId')
+			document_id = result.get('documentId')
+			if self.breeder_index is not None and document_id and payload.get('cId') is not None:
+				self.breeder_index[payload['cId']] = document_id
+			return document_id
 		return None
 
 	def update_breeder(self, breeder_id: str, payload: dict[str, Any]) -> Optional[str]:
@@ -274,12 +794,18 @@ class GraphQLClient:
 		"""Finde User anhand der Chromosoft-ID (cId)."""
 		if c_id is None:
 			return None
+		known, document_id = self._lookup_local('user', self.user_index, c_id)
+		if known:
+			return document_id
 		data = self.execute(USER_BY_CID_QUERY, {"cId": c_id})
 		d = data.get('data') or {}
 		items = d.get('usersPermissionsUsers') or []
 		if not items:
 			return None
-		return items[0].get('documentId')
+		document_id = items[0].get('documentId')
+		if self.state is not None:
+			self.state.set('user', c_id, document_id)
+		return document_id
 
 	def test_connection(self) -> bool:
 		"""Testet die Verbindung zum GraphQL-Endpoint mit einer einfachen Query."""
@@ -293,6 +819,42 @@ class GraphQLClient:
 			return False
 
 
+# Höchste pageSize (maxLimit in backend/config/api.ts)
+MAX_PAGE_SIZE = 100
+
+# Eltern-Updates in Phase 2 werden immer gebündelt, auch ohne --batch-size
+PARENT_LINK_BATCH_SIZE = 50
+
+# Breeder-Mutationen pro Anfrage beim Vorab-Abgleich (sofern --batch-size nicht größer gewählt ist)
+BREEDER_BATCH_SIZE = 50
+
+# Mindestzahl Worker bei --adaptive (Obergrenze des adaptiven Limits)
+ADAPTIVE_MAX_CONCURRENCY = 8
+
+_log_lock = threading.Lock()
+
+
+def log_line(message: str, file: Any = None) -> None:
+	"""Gibt eine Zeile aus, ohne dass sich Ausgaben paralleler Worker vermischen."""
+	with _log_lock:
+		print(message, file=file or sys.stdout)
+
+
+def studbook_key(value: Optional[str]) -> Optional[str]:
+	"""Vergleichsschlüssel einer Zuchtbuchnummer (Leerzeichen und Groß-/Kleinschreibung vereinheitlicht)."""
+	key = ' '.join((value or '').split()).upper()
+	if not key or key == '-':
+		return None
+	return key
+
+
+def remember_studbook_number(index: dict[str, str], node: dict[str, Any]) -> None:
+	"""Trägt die Zuchtbuchnummer eines Hundes aus einer GraphQL-Antwort in index ein (erster Treffer gewinnt)."""
+	key = studbook_key(node.get('cStudBookNumber'))
+	if key and node.get('documentId'):
+		index.setdefault(key, node['documentId'])
+
+
 def parse_int(value: str) -> Optional[int]:
 	value = value.strip()
 	if not value or value == '-':
@@ -303,17 +865,13 @@ def parse_int(value: str) -> Optional[int]:
 		return None
 
 
-def parse_iso_date(value: str) -> Optional[str]:
-	value = value.strip()
-	if not value or value == '-':
-		return None
-	# Unterstütze verschiedene Datumsformate: DD/MM/YYYY, DD-MM-YYYY, YYYY-MM-DD
-	for fmt in ('%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d.%m.%Y'):
-		try:
-			return datetime.strptime(value, fmt).date().isoformat()
-		except ValueError:
-			continue
-	return None
+# Unterstütze verschiedene Datumsformate: DD/MM/YYYY, DD-MM-YYYY, YYYY-MM-DD, DD.MM.YYYY
+DOG_DATE_FORMATS = ('%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d.%m.%Y')
+
+# Je Datumsspalte ein eigener Parser: das Format wird am ersten Wert erkannt, Werte werden gemerkt
+parse_iso_date = DateParser(DOG_DATE_FORMATS)
+parse_date_of_birth = DateParser(DOG_DATE_FORMATS)
+parse_date_of_death = DateParser(DOG_DATE_FORMATS)
 
 
 def map_sex_enum(raw: str) -> Optional[str]:
@@ -361,95 +919,209 @@ def parse_bool_check(value: Optional[str]) -> Optional[bool]:
 	return True
 
 
-def row_to_record(row: dict[str, str]) -> ChromosoftDogRecord:
-	c_id_value = parse_int(row.get('ID Animal', ''))
-	if c_id_value is None:
-		raise ValueError('Jeder Datensatz benötigt eine gültige "ID Animal" (cId).')
-
-	# Sammle alle Spalten mit "Verhalten..." oder "Körung..." für BreedSurvey
-	breed_survey_parts = []
-	for key, value in row.items():
-		if key and value:
-			key_lower = key.strip().lower()
-			value_stripped = value.strip()
-			# Nur relevante Werte (nicht leer, nicht "-")
-			if value_stripped and value_stripped != '-':
-				if key_lower.startswith('verhalten') or key_lower.startswith('körung'):
-					breed_survey_parts.append(f"{value_stripped}")
+# Spalten, deren Werte (in Header-Reihenfolge) zum BreedSurvey zusammengefasst werden
+BREED_SURVEY_COLUMN_PREFIXES = ('verhalten', 'körung')
+
+# Mögliche Spaltennamen für den kennelName: "Name of Breeding Station" (korrekt) oder "name of breeder station"
+KENNEL_NAME_COLUMNS = ('Name of Breeding Station', 'name of breeding station', 'Name of breeder station', 'name of breeder station')
+
 
-	breed_survey = '\n'.join(breed_survey_parts) if breed_survey_parts else ''
+class DogCsvSchema:
+	"""Einmal pro Datei aufgelöster Header: Spaltenname -> Index.
 
-	# Suche nach kennelName in verschiedenen möglichen Spaltennamen (case-insensitive)
-	kennel_name = ''
-	# Mögliche Spaltennamen: "Name of Breeding Station" (korrekt) oder "name of breeder station"
-	possible_keys = ['Name of Breeding Station', 'name of breeding station', 'Name of breeder station', 'name of breeder station']
+	Die Zeilen werden anschließend als Tupel aus csv.reader gelesen, statt für jede Zeile
+	ein Dict aufzubauen und nach den BreedSurvey- und kennelName-Spalten zu suchen.
+	"""
 
-	# Zuerst versuche exakte Übereinstimmungen
-	for key in possible_keys:
-		if key in row:
-			kennel_name = (row.get(key) or '').strip()
+	def __init__(self, header: list[str]) -> None:
+		# Wie bei csv.DictReader gewinnt bei doppelten Spaltennamen die letzte Spalte
+		self.columns: dict[str, int] = {}
+		for index, name in enumerate(header):
+			self.columns[name] = index
+		self.width = len(header)
+
+		# Sammle alle Spalten mit "Verhalten..." oder "Körung..." für BreedSurvey
+		self.breed_survey_columns = tuple(
+			index for name, index in self.columns.items()
+			if name and name.strip().lower().startswith(BREED_SURVEY_COLUMN_PREFIXES)
+		)
+
+		# Zuerst exakte Übereinstimmungen, danach case-insensitive; verwendet wird der erste nicht-leere Wert
+		kennel_columns = [self.columns[key] for key in KENNEL_NAME_COLUMNS if key in self.columns]
+		kennel_columns += [
+			index for name, index in self.columns.items()
+			if name and name.strip().lower() in ('name of breeding station', 'name of breeder station')
+		]
+		self.kennel_name_columns = tuple(kennel_columns)
+
+		column = self.columns.get
+		self.c_id = column('ID Animal')
+		self.given_name = column('Given Name')
+		self.full_name = column('Full Name')
+		self.breeder_id = column('ID Breeder')
+		self.owner_id = column('ID Owner')
+		self.chip_number = column('chip number')
+		self.sex = column('sex')
+		self.date_of_birth = column('date of birth')
+		self.date_of_death = column('date of death')
+		self.richterbericht = column('Richterbericht')
+		self.color = column('color')
+		self.fertile = column('fertile')
+		self.studbook_number = column('studbook number')
+		self.sire_studbook_number = column('studbook number (sire)')
+		self.dam_studbook_number = column('studbook number (dam)')
+		self.sire_full_name = column('fullname (sire)')
+		self.dam_full_name = column('fullname (dam)')
+		self.hd = column('HD')
+		self.hd_g = column('HD(G)')
+		self.sod1 = column('Gentest SOD1')
+		self.eyes_check = column('Augenuntersuchung')
+		self.genprofil = column('DNA-Profil')
+		self.heart_check = column('Herzuntersuchung')
+		self.d_lokus = column('D-Lokus')
+		self.fellabweichung = column('Fellabweichung')
+
+	def to_record(self, row: list[str]) -> ChromosoftDogRecord:
+		# Fehlende Spalten (oder zu kurze Zeilen) liefern None, wie csv.DictReader
+		def cell(index: Optional[int]) -> Optional[str]:
+			return row[index] if index is not None and index < len(row) else None
+
+		def text(index: Optional[int]) -> str:
+			return (cell(index) or '').strip()
+
+		c_id_value = parse_int(cell(self.c_id) or '')
+		if c_id_value is None:
+			raise ValueError('Jeder Datensatz benötigt eine gültige "ID Animal" (cId).')
+
+		# Nur relevante Werte (nicht leer, nicht "-")
+		breed_survey_parts = []
+		for index in self.breed_survey_columns:
+			value_stripped = text(index)
+			if value_stripped and value_stripped != '-':
+				breed_survey_parts.append(value_stripped)
+		breed_survey = '\n'.join(breed_survey_parts)
+
+		kennel_name = ''
+		for index in self.kennel_name_columns:
+			kennel_name = text(index)
 			if kennel_name:
 				break
 
-	# Falls nicht gefunden, suche case-insensitive
-	if not kennel_name:
-		for key, value in row.items():
-			if key:
-				key_lower = key.strip().lower()
-				if key_lower in ['name of breeding station', 'name of breeder station']:
-					kennel_name = value.strip() if value else ''
-					if kennel_name:
-						break
-
-	hd_val = map_hd_enum(row.get('HD', ''), row.get('HD(G)', ''))
-	sod1_val = map_sod1_enum(row.get('Gentest SOD1', ''))
-	eyes_check = parse_bool_check(row.get('Augenuntersuchung', ''))
-	genprofil = parse_bool_check(row.get('DNA-Profil', ''))
-	heart_check = parse_bool_check(row.get('Herzuntersuchung', ''))
-	
-	d_lokus = parse_bool_check(row.get('D-Lokus', ''))
-	fellabweichung = parse_bool_check(row.get('Fellabweichung', ''))
-	color_check = d_lokus or fellabweichung or None
-
-	return ChromosoftDogRecord(
-		c_id=c_id_value,
-		given_name=(row.get('Given Name') or '').strip(),
-		full_name=(row.get('Full Name') or '').strip(),
-		breeder_id=parse_int(row.get('ID Breeder', '')),
-		owner_id=parse_int(row.get('ID Owner', '')),
-		chip_number=(row.get('chip number') or '').strip(),
-		sex=(row.get('sex') or '').strip(),
-		date_of_birth=(row.get('date of birth') or '').strip(),
-		date_of_death=(row.get('date of death') or '').strip(),
-		richterbericht=(row.get('Richterbericht') or '').strip(),
-		breed_survey=breed_survey,
-		breeder_kennel_name=kennel_name,
-		color=(row.get('color') or '').strip(),
-		fertile=row.get('fertile'),
-		studbook_number=(row.get('studbook number') or '').strip(),
-		sire_studbook_number=(row.get('studbook number (sire)') or '').strip(),
-		dam_studbook_number=(row.get('studbook number (dam)') or '').strip(),
-		sire_full_name=(row.get('fullname (sire)') or '').strip(),
-		dam_full_name=(row.get('fullname (dam)') or '').strip(),
-		hd=hd_val,
-		sod1=sod1_val,
-		eyes_check=eyes_check,
-		genprofil=genprofil,
-		heart_check=heart_check,
-		color_check=color_check,
-	)
+		hd_val = map_hd_enum(cell(self.hd) or '', cell(self.hd_g) or '')
+		sod1_val = map_sod1_enum(cell(self.sod1) or '')
+		eyes_check = parse_bool_check(cell(self.eyes_check) or '')
+		genprofil = parse_bool_check(cell(self.genprofil) or '')
+		heart_check = parse_bool_check(cell(self.heart_check) or '')
+
+		d_lokus = parse_bool_check(cell(self.d_lokus) or '')
+		fellabweichung = parse_bool_check(cell(self.fellabweichung) or '')
+		color_check = d_lokus or fellabweichung or None
+
+		return ChromosoftDogRecord(
+			c_id=c_id_value,
+			given_name=text(self.given_name),
+			full_name=text(self.full_name),
+			breeder_id=parse_int(cell(self.breeder_id) or ''),
+			owner_id=parse_int(cell(self.owner_id) or ''),
+			chip_number=text(self.chip_number),
+			sex=text(self.sex),
+			date_of_birth=text(self.date_of_birth),
+			date_of_death=text(self.date_of_death),
+			richterbericht=text(self.richterbericht),
+			breed_survey=breed_survey,
+			breeder_kennel_name=kennel_name,
+			color=text(self.color),
+			fertile=cell(self.fertile),
+			studbook_number=text(self.studbook_number),
+			sire_studbook_number=text(self.sire_studbook_number),
+			dam_studbook_number=text(self.dam_studbook_number),
+			sire_full_name=text(self.sire_full_name),
+			dam_full_name=text(self.dam_full_name),
+			hd=hd_val,
+			sod1=sod1_val,
+			eyes_check=eyes_check,
+			genprofil=genprofil,
+			heart_check=heart_check,
+			color_check=color_check,
+		)
 
 
-def read_chromosoft_csv(file_path: Path) -> list[ChromosoftDogRecord]:
+def row_to_record(row: dict[str, str]) -> ChromosoftDogRecord:
+	"""Einzelne DictReader-Zeile umwandeln; für ganze Dateien DogCsvSchema verwenden."""
+	header = [key for key in row if key is not None]
+	return DogCsvSchema(header).to_record([row[key] for key in header])
+
+
+def iter_chromosoft_csv(file_path: Path) -> Iterator[ChromosoftDogRecord]:
+	"""Liest die CSV zeilenweise; es liegt immer nur der aktuelle Datensatz im Speicher."""
 	with file_path.open('r', encoding='utf-8', newline='') as handle:
-		reader = csv.DictReader(handle)
-		records = []
-		for row_num, row in enumerate(reader, start=2):
+		reader = csv.reader(handle)
+		# Leere Zeilen überspringt auch csv.DictReader
+		rows = (row for row in reader if row)
+		header = next(rows, None)
+		if header is None:
+			return
+		schema = DogCsvSchema(header)
+		for row in rows:
 			try:
-				records.append(row_to_record(row))
+				with timings.stage('csv.parse'):
+					record = schema.to_record(row)
 			except ValueError as e:
-				print(f'Warnung: Zeile {row_num} übersprungen: {e}', file=sys.stderr)
-		return records
+				print(f'Warnung: Zeile {reader.line_num} übersprungen: {e}', file=sys.stderr)
+				continue
+			yield record
+
+
+def read_chromosoft_csv(file_path: Path) -> list[ChromosoftDogRecord]:
+	return list(iter_chromosoft_csv(file_path))
+
+
+def iter_chromosoft_csvs(file_paths: Iterable[Path]) -> Iterator[ChromosoftDogRecord]:
+	"""Liest mehrere Exporte nacheinander; doppelte "ID Animal" werden nur beim ersten Auftreten geliefert."""
+	seen: set[int] = set()
+	for file_path in file_paths:
+		duplicates = 0
+		for record in iter_chromosoft_csv(file_path):
+			if record.c_id in seen:
+				duplicates += 1
+				continue
+			seen.add(record.c_id)
+			yield record
+		if duplicates:
+			print(f'Warnung: {duplicates} doppelte Datensätze (ID Animal) in {file_path} übersprungen.', file=sys.stderr)
+
+
+def read_chromosoft_csvs(file_paths: Iterable[Path]) -> list[ChromosoftDogRecord]:
+	return list(iter_chromosoft_csvs(file_paths))
+
+
+def normalize_dog_state(node: dict[str, Any]) -> dict[str, Any]:
+	"""Bringt einen Hund aus der GraphQL-Antwort in die Form von build_graphql_payload.
+
+	Relationen werden auf ihre documentId reduziert, leere Werte entfallen wie im Payload.
+	"""
+	state: dict[str, Any] = {}
+	for key, value in node.items():
+		if key == 'documentId':
+			continue
+		if isinstance(value, dict):
+			value = value.get('documentId')
+		if value is None or (isinstance(value, str) and not value.strip()):
+			continue
+		state[key] = value
+	return state
+
+
+def is_payload_unchanged(payload: dict[str, Any], state: Optional[dict[str, Any]]) -> bool:
+	"""True, wenn ein Update mit diesem Payload am Serverstand nichts ändern würde.
+
+	Verglichen werden nur die Schlüssel des Payloads, da Strapi fehlende Felder beim
+	Update nicht anfasst.
+	"""
+	if state is None:
+		return False
+	current = {key: state[key] for key in payload if key in state}
+	return payload_hash(current) == payload_hash(payload)
 
 
 def build_graphql_payload(
@@ -514,8 +1186,8 @@ def build_graphql_payload(
 	assign('sex', sex_enum)
 
 	# Daten
-	assign('dateOfBirth', parse_iso_date(record.date_of_birth))
-	assign('dateOfDeath', parse_iso_date(record.date_of_death))
+	assign('dateOfBirth', parse_date_of_birth(record.date_of_birth))
+	assign('dateOfDeath', parse_date_of_death(record.date_of_death))
 
 
 	# Exhibitions - Richterbericht
@@ -572,69 +1244,300 @@ def ensure_breeder_exists(client: GraphQLClient, breeder_c_id: Optional[int], ke
 		return None
 
 
-def import_records(
-	records: list[ChromosoftDogRecord],
+def breeder_kennel_name(record: ChromosoftDogRecord, verbose: bool = False) -> Optional[str]:
+	"""Bereinigter kennelName des Breeders eines Datensatzes ('-' und Leerwerte -> None)."""
+	kennel_name = record.breeder_kennel_name if record.breeder_kennel_name and record.breeder_kennel_name.strip() and record.breeder_kennel_name.strip() != '-' else None
+	if verbose and kennel_name:
+		print(f'Gefundener kennelName für Breeder cId={record.breeder_id}: {kennel_name}', file=sys.stderr)
+	elif verbose and not kennel_name:
+		print(f'Kein kennelName gefunden für Breeder cId={record.breeder_id} (Wert: "{record.breeder_kennel_name}")', file=sys.stderr)
+	return kennel_name
+
+
+def sync_breeder(
 	client: GraphQLClient,
+	breeder_c_id: int,
+	kennel_name: Optional[str],
+	stats: dict[str, int],
 	verbose: bool,
 	delay_between_requests: float = 0.1,
-) -> dict[str, int]:
-	stats = {'created': 0, 'updated': 0, 'failed': 0, 'breeders_created': 0}
+) -> Optional[str]:
+	"""Legt einen Breeder an bzw. aktualisiert seinen kennelName. Gibt die documentId zurück."""
+	try:
+		# Prüfe ob Breeder bereits existiert
+		existing_breeder_id = client.find_breeder_by_cid(breeder_c_id)
+		if existing_breeder_id:
+			# Aktualisiere kennelName falls vorhanden
+			kennel_info = f', kennelName: {kennel_name}' if kennel_name else ', kennelName: (nicht gefunden)'
+			if kennel_name:
+				update_payload = breeder_payload(kennel_name)
+				if breeder_kennel_name_unchanged(client, breeder_c_id, existing_breeder_id, kennel_name):
+					print(f'Breeder mit cId={breeder_c_id} unverändert (ID: {existing_breeder_id}{kennel_info})')
+					return existing_breeder_id
+				client.update_breeder(existing_breeder_id, update_payload)
+				client.remember_synced('breeder', breeder_c_id, existing_breeder_id, update_payload)
+				stats['breeders_updated'] += 1
+				print(f'Breeder mit cId={breeder_c_id} aktualisiert (ID: {existing_breeder_id}{kennel_info})')
+			else:
+				print(f'Breeder mit cId={breeder_c_id} bereits vorhanden (ID: {existing_breeder_id}{kennel_info})')
+				return existing_breeder_id
+			breeder_id = existing_breeder_id
+		else:
+			# Erstelle neuen Breeder
+			breeder_id = ensure_breeder_exists(client, breeder_c_id, kennel_name, verbose)
+			if breeder_id:
+				stats['breeders_created'] += 1
+				if kennel_name:
+					client.remember_synced('breeder', breeder_c_id, breeder_id, breeder_payload(kennel_name))
+		timings.sleep(delay_between_requests)
+		return breeder_id
+	except Exception as exc:
+		if verbose:
+			print(f'Fehler beim Erstellen von Breeder cId={breeder_c_id}: {exc}', file=sys.stderr)
+		return None
 
-	# Sammle alle eindeutigen Breeder-IDs und deren kennelName
-	breeder_data: dict[int, Optional[str]] = {}
-	for record in records:
-		if record.breeder_id:
-			# Verwende den ersten gefundenen kennelName für jeden Breeder
-			if record.breeder_id not in breeder_data:
-				kennel_name = record.breeder_kennel_name if record.breeder_kennel_name and record.breeder_kennel_name.strip() and record.breeder_kennel_name.strip() != '-' else None
-				breeder_data[record.breeder_id] = kennel_name
-				if verbose and kennel_name:
-					print(f'Gefundener kennelName für Breeder cId={record.breeder_id}: {kennel_name}', file=sys.stderr)
-				elif verbose and not kennel_name:
-					print(f'Kein kennelName gefunden für Breeder cId={record.breeder_id} (Wert: "{record.breeder_kennel_name}")', file=sys.stderr)
-
-	# Erstelle alle Breeder vorab
+
+def breeder_kennel_name_unchanged(client: GraphQLClient, breeder_c_id: int, document_id: str, kennel_name: str) -> bool:
+	"""True, wenn der Breeder in Strapi (bzw. beim letzten Sync) bereits diesen kennelName hat."""
+	server_state = client.get_breeder_state(breeder_c_id)
+	if server_state is not None:
+		return server_state.get('kennelName') == kennel_name
+	return client.state is not None and client.state.is_unchanged(
+		'breeder', breeder_c_id, document_id, payload_hash(breeder_payload(kennel_name))
+	)
+
+
+def sync_breeders(
+	client: GraphQLClient,
+	breeder_data: dict[int, Optional[str]],
+	stats: dict[str, int],
+	verbose: bool,
+	batch_size: int = BREEDER_BATCH_SIZE,
+) -> dict[int, Optional[str]]:
+	"""Gleicht alle Breeder (cId -> kennelName) vorab ab. Gibt cId -> documentId zurück.
+
+	Der Serverstand (kennelName, member) kommt aus wenigen seitenweisen Abfragen; angelegt
+	bzw. aktualisiert werden nur neue und geänderte Breeder, gebündelt per Alias-Mutation.
+	"""
 	breeder_map: dict[int, Optional[str]] = {}
+	if not breeder_data:
+		return breeder_map
+	client.load_breeder_index()
+	existing = {breeder_c_id: client.find_breeder_by_cid(breeder_c_id) for breeder_c_id in breeder_data}
+
+	# Breeder werden über ihre cId mit dem gleichnamigen User verknüpft: benötigt für neue
+	# Breeder und für vorhandene, deren member-Relation in Strapi noch leer ist
+	def needs_member(breeder_c_id: int) -> bool:
+		if not existing[breeder_c_id]:
+			return True
+		server_state = client.get_breeder_state(breeder_c_id)
+		return server_state is not None and not server_state.get('member')
+
+	user_ids = client.find_users_by_cid(c_id for c_id in breeder_data if needs_member(c_id))
+
+	changes: list[tuple[int, Optional[str], dict[str, Any]]] = []
 	for breeder_c_id, kennel_name in breeder_data.items():
-		try:
-			# Prüfe ob Breeder bereits existiert
-			existing_breeder_id = client.find_breeder_by_cid(breeder_c_id)
-			if existing_breeder_id:
-				breeder_map[breeder_c_id] = existing_breeder_id
-				# Aktualisiere kennelName falls vorhanden
-				kennel_info = f', kennelName: {kennel_name}' if kennel_name else ', kennelName: (nicht gefunden)'
-				if kennel_name:
-					update_payload: dict[str, Any] = {
-						'kennelName': kennel_name
-					}
-					client.update_breeder(existing_breeder_id, update_payload)
-					print(f'Breeder mit cId={breeder_c_id} aktualisiert (ID: {existing_breeder_id}{kennel_info})')
-				else:
-					print(f'Breeder mit cId={breeder_c_id} bereits vorhanden (ID: {existing_breeder_id}{kennel_info})')
+		document_id = existing[breeder_c_id]
+		user_id = user_ids.get(breeder_c_id)
+		kennel_info = f', kennelName: {kennel_name}' if kennel_name else ', kennelName: (nicht gefunden)'
+		if document_id:
+			breeder_map[breeder_c_id] = document_id
+			update_payload: dict[str, Any] = {}
+			if kennel_name and not breeder_kennel_name_unchanged(client, breeder_c_id, document_id, kennel_name):
+				update_payload['kennelName'] = kennel_name
+			if user_id:
+				update_payload['member'] = user_id
+			if update_payload:
+				changes.append((breeder_c_id, document_id, update_payload))
+			elif kennel_name:
+				print(f'Breeder mit cId={breeder_c_id} unverändert (ID: {document_id}{kennel_info})')
 			else:
-				# Erstelle neuen Breeder
-				breeder_id = ensure_breeder_exists(client, breeder_c_id, kennel_name, verbose)
-				breeder_map[breeder_c_id] = breeder_id
-				if breeder_id:
-					stats['breeders_created'] += 1
-			time.sleep(delay_between_requests)
-		except Exception as exc:
-			if verbose:
-				print(f'Fehler beim Erstellen von Breeder cId={breeder_c_id}: {exc}', file=sys.stderr)
-			breeder_map[breeder_c_id] = None
+				print(f'Breeder mit cId={breeder_c_id} bereits vorhanden (ID: {document_id}{kennel_info})')
+			continue
 
-	# Map aufbauen: Full Name -> Record
-	record_by_name: dict[str, ChromosoftDogRecord] = {}
-	for record in records:
-		if record.full_name:
-			record_by_name[record.full_name] = record
+		create_payload: dict[str, Any] = {'cId': breeder_c_id}
+		if user_id:
+			create_payload['member'] = user_id
+		elif verbose:
+			print(f'Warnung: Kein User mit cId={breeder_c_id} gefunden. Breeder wird ohne User-Verknüpfung erstellt.', file=sys.stderr)
+		if kennel_name:
+			create_payload['kennelName'] = kennel_name
+		changes.append((breeder_c_id, None, create_payload))
 
-	for idx, record in enumerate(records):
+	step = max(1, batch_size)
+	for start in range(0, len(changes), step):
+		chunk = changes[start:start + step]
 		try:
-			# Kleine Pause zwischen Anfragen, um den Server nicht zu überlasten
-			if idx > 0:
-				time.sleep(delay_between_requests)
+			with timings.stage('mutation.breeders'):
+				results = client.upsert_breeders([(document_id, payload) for _, document_id, payload in chunk])
+		except Exception as exc:
+			results = [(None, str(exc))] * len(chunk)
+		for (breeder_c_id, document_id, payload), (new_id, error) in zip(chunk, results):
+			kennel_name = breeder_data[breeder_c_id]
+			kennel_info = f', kennelName: {kennel_name}' if kennel_name else ', kennelName: (nicht gefunden)'
+			if error:
+				# Ein vorhandener Breeder bleibt verknüpfbar, auch wenn die Aktualisierung fehlschlägt
+				breeder_map[breeder_c_id] = document_id
+				action = 'Aktualisieren' if document_id else 'Erstellen'
+				print(f'Fehler beim {action} von Breeder cId={breeder_c_id}{kennel_info}: {error}', file=sys.stderr)
+				continue
+			breeder_map[breeder_c_id] = new_id
+			if kennel_name:
+				client.remember_synced('breeder', breeder_c_id, new_id, breeder_payload(kennel_name))
+			if document_id:
+				stats['breeders_updated'] += 1
+				print(f'Breeder mit cId={breeder_c_id} aktualisiert (ID: {new_id}{kennel_info})')
+			else:
+				stats['breeders_created'] += 1
+				print(f'Breeder mit cId={breeder_c_id} erstellt (ID: {new_id}{kennel_info})')
+	return breeder_map
 
+
+def import_records(
+	records: Iterable[ChromosoftDogRecord],
+	client: GraphQLClient,
+	verbose: bool,
+	delay_between_requests: float = 0.1,
+	batch_size: int = 1,
+	concurrency: int = 1,
+	skip_unchanged: bool = True,
+	only_c_ids: Optional[set[int]] = None,
+	stream: bool = False,
+	journal: Optional[ImportJournal] = None,
+) -> dict[str, int]:
+	"""Importiert die Hunde; mit only_c_ids nur diese (z. B. das Delta seit dem letzten Snapshot).
+
+	Alle übrigen Datensätze dienen dann nur noch der Auflösung der Eltern; verweisen sie selbst
+	auf einen importierten Hund, werden ihre Eltern in Phase 2 mit verknüpft. Mit stream=True
+	wird records (z. B. iter_chromosoft_csv) nur einmal durchlaufen und nicht im Speicher
+	gehalten; Breeder werden dann beim ersten Auftreten statt vorab synchronisiert.
+	Hunde, die laut journal bereits erledigt sind, werden nur noch für Phase 2 berücksichtigt.
+	"""
+	stats = {
+		'created': 0,
+		'updated': 0,
+		'unchanged': 0,
+		'failed': 0,
+		'resumed': 0,
+		'breeders_created': 0,
+		'breeders_updated': 0,
+		'parents_linked': 0,
+		'parents_unchanged': 0,
+		'parents_failed': 0,
+	}
+
+	breeder_map: dict[int, Optional[str]] = {}
+	if not stream:
+		# Alle eindeutigen Breeder vorab anlegen bzw. aktualisieren; dafür wird die CSV
+		# vollständig eingelesen. Verwendet wird der erste gefundene kennelName je Breeder.
+		records = list(records)
+		breeder_data: dict[int, Optional[str]] = {}
+		for record in records:
+			if journal is not None and journal.is_done('dog', record.c_id):
+				continue
+			if record.breeder_id and record.breeder_id not in breeder_data and (only_c_ids is None or record.c_id in only_c_ids):
+				breeder_data[record.breeder_id] = breeder_kennel_name(record, verbose)
+		with timings.stage('breeders.sync'):
+			breeder_map = sync_breeders(
+				client,
+				breeder_data,
+				stats,
+				verbose,
+				batch_size=max(batch_size, BREEDER_BATCH_SIZE),
+			)
+	else:
+		# Abgeglichen wird beim ersten Auftreten; der Serverstand (kennelName, member) kommt trotzdem
+		# vorab aus wenigen seitenweisen Abfragen, sodass unveränderte Breeder ohne Anfrage bleiben
+		with timings.stage('breeders.sync'):
+			client.load_breeder_index()
+	breeder_lock = threading.Lock()
+
+	def breeder_document_id(record: ChromosoftDogRecord) -> Optional[str]:
+		"""documentId des Breeders; beim Streaming wird er beim ersten Auftreten angelegt."""
+		if not record.breeder_id:
+			return None
+		if stream and record.breeder_id not in breeder_map:
+			with breeder_lock:
+				if record.breeder_id not in breeder_map:
+					with timings.stage('breeders.sync'):
+						breeder_map[record.breeder_id] = sync_breeder(
+							client, record.breeder_id, breeder_kennel_name(record, verbose), stats, verbose, delay_between_requests
+						)
+		return breeder_map.get(record.breeder_id)
+
+	# Für Phase 2 werden nur Name/Zuchtbuchnummer -> cId und die Eltern behalten, nicht die Records selbst
+	c_id_by_name: dict[str, int] = {}
+	c_id_by_studbook: dict[str, int] = {}
+	parent_refs: list[ParentRef] = []
+	# Delta: Eltern-Verweise unveränderter Zeilen und Name/Zuchtbuchnummer der importierten Zeilen.
+	# Verweist eine unveränderte Zeile auf einen neuen/geänderten Hund, wird sie in Phase 2 mit verknüpft.
+	unchanged_refs: list[ParentRef] = []
+	target_names: set[str] = set()
+	target_studbooks: set[str] = set()
+
+	# Statistik und Ausgaben werden bei --concurrency > 1 aus mehreren Threads geschrieben
+	stats_lock = threading.Lock()
+
+	def count(key: str, amount: int = 1) -> None:
+		with stats_lock:
+			stats[key] += amount
+
+	# Phase 1 sammelt cId -> documentId aller angelegten/aktualisierten Hunde für Phase 2
+	dog_ids: dict[int, str] = {}
+
+	def completed(record: ChromosoftDogRecord, outcome: str, document_id: str, payload: dict[str, Any]) -> None:
+		count(outcome)
+		dog_ids[record.c_id] = document_id
+		client.remember_synced('dog', record.c_id, document_id, payload)
+		if journal is not None:
+			journal.record('dog', record.c_id, outcome, document_id)
+
+	def failed(record: ChromosoftDogRecord) -> None:
+		count('failed')
+		if journal is not None:
+			journal.record('dog', record.c_id, 'failed')
+
+	# Gebündelte Mutationen: (Record, vorhandene documentId, Payload)
+	pending: list[tuple[ChromosoftDogRecord, Optional[str], dict[str, Any]]] = []
+	pending_lock = threading.Lock()
+
+	def flush_pending(batch: list[tuple[ChromosoftDogRecord, Optional[str], dict[str, Any]]]) -> None:
+		if not batch:
+			return
+		try:
+			with timings.stage('mutation.dog_batch'):
+				results = client.upsert_dogs([(existing_id, payload) for _, existing_id, payload in batch])
+		except Exception as exc:
+			results = [(None, str(exc))] * len(batch)
+		for (record, existing_id, payload), (document_id, error) in zip(batch, results):
+			if error:
+				failed(record)
+				action = 'Aktualisieren' if existing_id else 'Erstellen'
+				log_line(f'Fehler beim {action} von Hund cId={record.c_id}: {error}', file=sys.stderr)
+				# Eine veraltete documentId aus dem Sync-Status nicht erneut verwenden
+				if client.state is not None:
+					client.state.forget('dog', record.c_id)
+			elif existing_id:
+				completed(record, 'updated', existing_id, payload)
+				if verbose:
+					log_line(f'Aktualisiert Hund cId={record.c_id} (ID {existing_id})', file=sys.stderr)
+			else:
+				completed(record, 'created', document_id, payload)
+				if verbose:
+					log_line(f'Importiert Hund cId={record.c_id} (ID {document_id})', file=sys.stderr)
+		if concurrency <= 1:
+			timings.sleep(delay_between_requests)
+
+	def take_pending(force: bool = False) -> list[tuple[ChromosoftDogRecord, Optional[str], dict[str, Any]]]:
+		with pending_lock:
+			if not pending or (not force and len(pending) < batch_size):
+				return []
+			batch = pending[:]
+			pending.clear()
+			return batch
+
+	def import_record(record: ChromosoftDogRecord) -> None:
+		try:
 			# Prüfe Verknüpfungen und erstelle Logmeldung
 			owner_status = None
 			breeder_status = None
@@ -642,7 +1545,8 @@ def import_records(
 			# Prüfe Owner-Verknüpfung
 			owner_user_id = None
 			if record.owner_id:
-				owner_user_id = client.find_user_by_cid(record.owner_id)
+				with timings.stage('lookup.owner'):
+					owner_user_id = client.find_user_by_cid(record.owner_id)
 				if owner_user_id:
 					owner_status = f"gesetzt (User cId={record.owner_id})"
 				else:
@@ -651,8 +1555,8 @@ def import_records(
 				owner_status = "nicht vorhanden"
 
 			# Prüfe Breeder-Verknüpfung
+			breeder_id = breeder_document_id(record)
 			if record.breeder_id:
-				breeder_id = breeder_map.get(record.breeder_id)
 				if breeder_id:
 					breeder_status = f"gesetzt (Breeder cId={record.breeder_id}, Relation gesetzt)"
 				else:
@@ -660,70 +1564,235 @@ def import_records(
 			else:
 				breeder_status = "nicht vorhanden"
 
-			# Eltern ermitteln
-			father_id = None
-			mother_id = None
-			
-			if record.sire_full_name:
-				sire_record = record_by_name.get(record.sire_full_name)
-				if sire_record:
-					# Ermittle ID über API
-					father_id = client.find_by_cid(sire_record.c_id)
-			
-			if record.dam_full_name:
-				dam_record = record_by_name.get(record.dam_full_name)
-				if dam_record:
-					# Ermittle ID über API
-					mother_id = client.find_by_cid(dam_record.c_id)
-
-			# Logmeldung pro Hund
-			print(f"Hund cId={record.c_id} ({record.given_name}): Owner={owner_status}, Breeder={breeder_status}, Father={'gefunden' if father_id else 'fehlt'}, Mother={'gefunden' if mother_id else 'fehlt'}")
+			# Logmeldung pro Hund (Eltern werden erst in Phase 2 verknüpft)
+			log_line(f"Hund cId={record.c_id} ({record.given_name}): Owner={owner_status}, Breeder={breeder_status}")
 
 			# Erstelle Payload
 			# Die Verknüpfung Dog -> Owner erfolgt über cOwnerId (gemappt auf user.cId)
 			# Die Verknüpfung Dog -> Breeder erfolgt über breeder: ID (Relation)
-			breeder_id = breeder_map.get(record.breeder_id) if record.breeder_id else None
-			payload = build_graphql_payload(
-				record,
-				breeder_id=breeder_id,
-				owner_id=owner_user_id,
-				father_id=father_id,
-				mother_id=mother_id
-			)
+			with timings.stage('payload.build'):
+				payload = build_graphql_payload(
+					record,
+					breeder_id=breeder_id,
+					owner_id=owner_user_id,
+				)
 
-			existing_id = client.find_by_cid(record.c_id)
+			with timings.stage('lookup.dog'):
+				existing_id = client.find_by_cid(record.c_id)
+			if existing_id and skip_unchanged and client.is_dog_unchanged(record.c_id, existing_id, payload):
+				completed(record, 'unchanged', existing_id, payload)
+				if verbose:
+					log_line(f'Unverändert - Hund cId={record.c_id} (ID {existing_id})', file=sys.stderr)
+				return
+			if batch_size > 1:
+				with pending_lock:
+					pending.append((record, existing_id, payload))
+				flush_pending(take_pending())
+				return
 			if existing_id:
 				if verbose:
-					print(f'Gefunden - Hund cId={record.c_id} (ID {existing_id})', file=sys.stderr)
-				client.update_dog(existing_id, payload)
-				stats['updated'] += 1
+					log_line(f'Gefunden - Hund cId={record.c_id} (ID {existing_id})', file=sys.stderr)
+				with timings.stage('mutation.dog'):
+					client.update_dog(existing_id, payload)
+				completed(record, 'updated', existing_id, payload)
 				if verbose:
-					print(f'Aktualisiert Hund cId={record.c_id} (ID {existing_id})', file=sys.stderr)
+					log_line(f'Aktualisiert Hund cId={record.c_id} (ID {existing_id})', file=sys.stderr)
 			else:
 				if verbose:
-					print(f'Nicht gefunden - Hund cId={record.c_id}', file=sys.stderr)
-				created_id = client.create_dog(payload)
+					log_line(f'Nicht gefunden - Hund cId={record.c_id}', file=sys.stderr)
+				with timings.stage('mutation.dog'):
+					created_id = client.create_dog(payload)
 				if created_id:
-					stats['created'] += 1
+					completed(record, 'created', created_id, payload)
 					if verbose:
-						print(f'Importiert Hund cId={record.c_id} (ID {created_id})', file=sys.stderr)
+						log_line(f'Importiert Hund cId={record.c_id} (ID {created_id})', file=sys.stderr)
 				else:
-					stats['failed'] += 1
-					print(f'Fehler: Konnte Hund cId={record.c_id} nicht erstellen', file=sys.stderr)
+					failed(record)
+					log_line(f'Fehler: Konnte Hund cId={record.c_id} nicht erstellen', file=sys.stderr)
 		except Exception as exc:  # pragma: no cover
-			stats['failed'] += 1
-			print(f'Fehler beim Import von Hund cId={record.c_id}: {exc}', file=sys.stderr)
+			failed(record)
+			log_line(f'Fehler beim Import von Hund cId={record.c_id}: {exc}', file=sys.stderr)
+			if client.state is not None:
+				client.state.forget('dog', record.c_id)
 			if verbose:
 				import traceback
-				traceback.print_exc()
+				log_line(traceback.format_exc().rstrip(), file=sys.stderr)
+
+	def iter_targets() -> Iterator[ChromosoftDogRecord]:
+		# Alle Datensätze dienen der Auflösung der Eltern, importiert werden nur die Ziele
+		for record in records:
+			if record.full_name:
+				c_id_by_name[record.full_name] = record.c_id
+			key = studbook_key(record.studbook_number)
+			if key:
+				c_id_by_studbook.setdefault(key, record.c_id)
+			is_target = only_c_ids is None or record.c_id in only_c_ids
+			if record.sire_full_name or record.dam_full_name or record.sire_studbook_number or record.dam_studbook_number:
+				(parent_refs if is_target else unchanged_refs).append(ParentRef(
+					record.c_id,
+					record.given_name,
+					record.sire_full_name,
+					record.dam_full_name,
+					record.sire_studbook_number,
+					record.dam_studbook_number,
+				))
+			if not is_target:
+				continue
+			if only_c_ids is not None:
+				if record.full_name:
+					target_names.add(record.full_name)
+				if key:
+					target_studbooks.add(key)
+			entry = journal.get('dog', record.c_id) if journal is not None else None
+			if entry is not None:
+				# Im abgebrochenen Lauf bereits erledigt
+				stats['resumed'] += 1
+				if entry.get('documentId'):
+					dog_ids[record.c_id] = entry['documentId']
+				continue
+			yield record
+
+	if concurrency <= 1:
+		for idx, record in enumerate(iter_targets()):
+			# Kleine Pause zwischen Anfragen, um den Server nicht zu überlasten
+			# (im Batch-Modus erst nach jedem gesendeten Batch)
+			if idx > 0 and batch_size <= 1:
+				timings.sleep(delay_between_requests)
+			import_record(record)
+	else:
+		# Begrenzte Anzahl gleichzeitig laufender Datensätze statt fester Pausen;
+		# die Semaphore verhindert, dass alle Datensätze auf einmal eingereiht werden.
+		in_flight = threading.BoundedSemaphore(concurrency * 2)
+
+		def run(record: ChromosoftDogRecord) -> None:
+			try:
+				import_record(record)
+			finally:
+				in_flight.release()
+
+		with ThreadPoolExecutor(max_workers=concurrency) as executor:
+			for record in iter_targets():
+				in_flight.acquire()
+				executor.submit(run, record)
+	flush_pending(take_pending(force=True))
+
+	for ref in unchanged_refs:
+		if (
+			studbook_key(ref.sire_studbook_number) in target_studbooks
+			or studbook_key(ref.dam_studbook_number) in target_studbooks
+			or (ref.sire_full_name and ref.sire_full_name in target_names)
+			or (ref.dam_full_name and ref.dam_full_name in target_names)
+		):
+			# Unveränderter Nachkomme eines importierten Hundes: documentId aus Index bzw. Strapi
+			document_id = dog_ids.get(ref.c_id) or client.find_by_cid(ref.c_id)
+			if document_id:
+				dog_ids[ref.c_id] = document_id
+				parent_refs.append(ref)
+
+	# Phase 2: Eltern über die lokal gesammelten documentIds verknüpfen. So werden auch
+	# Eltern gefunden, die in der CSV erst nach ihren Nachkommen stehen.
+	link_parents(
+		parent_refs,
+		client,
+		c_id_by_name,
+		dog_ids,
+		stats,
+		verbose,
+		batch_size=batch_size if batch_size > 1 else PARENT_LINK_BATCH_SIZE,
+		skip_unchanged=skip_unchanged,
+		c_id_by_studbook=c_id_by_studbook,
+		journal=journal,
+	)
 	return stats
 
 
+def link_parents(
+	records: Iterable[ParentRef],
+	client: GraphQLClient,
+	c_id_by_name: dict[str, int],
+	dog_ids: dict[int, str],
+	stats: dict[str, int],
+	verbose: bool,
+	batch_size: int = PARENT_LINK_BATCH_SIZE,
+	skip_unchanged: bool = True,
+	c_id_by_studbook: Optional[dict[str, int]] = None,
+	journal: Optional[ImportJournal] = None,
+) -> None:
+	"""Setzt father/mother per gebündelter Update-Mutation, nachdem alle Hunde importiert sind.
+
+	Eltern werden vorrangig über die Zuchtbuchnummer aufgelöst (CSV, dann Strapi-Index),
+	erst danach über den vollständigen Namen.
+	"""
+	def resolve(parent_studbook_number: str, parent_name: str) -> Optional[str]:
+		key = studbook_key(parent_studbook_number)
+		if key:
+			parent_c_id = (c_id_by_studbook or {}).get(key)
+			document_id = None
+			if parent_c_id is not None:
+				# Elterntier aus der CSV: über seine cId (bei preload/batch ohne Anfrage)
+				document_id = dog_ids.get(parent_c_id) or client.find_by_cid(parent_c_id)
+			document_id = document_id or client.find_by_studbook_number(parent_studbook_number)
+			if document_id:
+				return document_id
+		parent_c_id = c_id_by_name.get(parent_name) if parent_name else None
+		if parent_c_id is None:
+			return None
+		return dog_ids.get(parent_c_id) or client.find_by_cid(parent_c_id)
+
+	updates: list[tuple[ParentRef, str, dict[str, Any]]] = []
+	for record in records:
+		document_id = dog_ids.get(record.c_id)
+		if not document_id:
+			continue
+		if journal is not None and journal.is_done('dog_parents', record.c_id):
+			continue
+		with timings.stage('lookup.parents'):
+			father_id = resolve(record.sire_studbook_number, record.sire_full_name)
+			mother_id = resolve(record.dam_studbook_number, record.dam_full_name)
+		if record.sire_full_name or record.dam_full_name or record.sire_studbook_number or record.dam_studbook_number:
+			log_line(f"Eltern Hund cId={record.c_id} ({record.given_name}): Father={'gefunden' if father_id else 'fehlt'}, Mother={'gefunden' if mother_id else 'fehlt'}")
+		parent_payload: dict[str, Any] = {}
+		if father_id:
+			parent_payload['father'] = father_id
+		if mother_id:
+			parent_payload['mother'] = mother_id
+		if parent_payload and skip_unchanged and client.is_dog_unchanged(record.c_id, document_id, parent_payload, kind='dog_parents'):
+			stats['parents_unchanged'] += 1
+			if journal is not None:
+				journal.record('dog_parents', record.c_id, 'unchanged', document_id)
+			continue
+		if parent_payload:
+			updates.append((record, document_id, parent_payload))
+
+	for start in range(0, len(updates), max(1, batch_size)):
+		chunk = updates[start:start + max(1, batch_size)]
+		try:
+			with timings.stage('mutation.parents'):
+				results = client.upsert_dogs([(document_id, payload) for _, document_id, payload in chunk])
+		except Exception as exc:
+			results = [(None, str(exc))] * len(chunk)
+		for (record, document_id, payload), (_, error) in zip(chunk, results):
+			if error:
+				stats['parents_failed'] += 1
+				log_line(f'Fehler beim Verknüpfen der Eltern von Hund cId={record.c_id}: {error}', file=sys.stderr)
+			else:
+				stats['parents_linked'] += 1
+				client.remember_synced('dog_parents', record.c_id, document_id, payload)
+				if journal is not None:
+					journal.record('dog_parents', record.c_id, 'linked', document_id)
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
 	parser = argparse.ArgumentParser(
 		description='Importiert Chromosoft-Hundedaten via GraphQL in Strapi.'
 	)
-	parser.add_argument('csv_path', type=Path, help='Pfad zur Chromosoft CSV-Datei')
+	parser.add_argument(
+		'csv_paths',
+		type=Path,
+		nargs='+',
+		metavar='csv_path',
+		help='Pfad zur Chromosoft CSV-Datei; mehrere Dateien (z. B. Hündinnen und Rüden) werden zusammengeführt'
+	)
 	parser.add_argument(
 		'--dry-run',
 		action='store_true',
@@ -746,6 +1815,104 @@ def build_arg_parser() -> argparse.ArgumentParser:
 		default=3,
 		help='Maximale Anzahl Wiederholungen bei Fehlern (Standard: 3)'
 	)
+	parser.add_argument(
+		'--batch-size',
+		type=int,
+		default=1,
+		help='Anzahl Hunde-Mutationen pro GraphQL-Anfrage (Aliasse); 1 = einzeln senden (Standard: 1, empfohlen: 25-50)'
+	)
+	parser.add_argument(
+		'--concurrency',
+		type=int,
+		default=1,
+		help='Anzahl parallel verarbeiteter Hunde; bei > 1 entfällt die feste Pause --delay (Standard: 1)'
+	)
+	parser.add_argument(
+		'--adaptive',
+		action='store_true',
+		help=(
+			'Anzahl gleichzeitiger Anfragen automatisch an Strapi anpassen (AIMD: steigt bei stabilen '
+			f'Antwortzeiten, halbiert sich bei 429/5xx oder Latenzspitzen); --concurrency ist die Obergrenze '
+			f'(mind. {ADAPTIVE_MAX_CONCURRENCY}), --delay entfällt'
+		)
+	)
+	parser.add_argument(
+		'--query-cache-ttl',
+		type=float,
+		default=0,
+		help=(
+			'Antworten von Queries (z. B. Besitzer/Breeder per cId) so viele Sekunden zwischenspeichern; '
+			'gleiche gleichzeitige Abfragen werden nur einmal gesendet (Standard: 0 = aus)'
+		)
+	)
+	parser.add_argument(
+		'--query-cache-size',
+		type=int,
+		default=10000,
+		help='Maximale Anzahl Einträge im Query-Cache (Standard: 10000)'
+	)
+	parser.add_argument(
+		'--force-update',
+		action='store_true',
+		help='Auch unveränderte Hunde aktualisieren (kein Vergleich mit dem Serverstand)'
+	)
+	parser.add_argument(
+		'--lookup',
+		choices=('preload', 'batch', 'single'),
+		default='preload',
+		help=(
+			'Auflösung von cId -> documentId: preload = alle Hunde/Breeder/User (und Zuchtbuchnummern) vorab laden, '
+			'batch = nur die cIds und die Zuchtbuchnummern nicht enthaltener Eltern der CSV per "in"-Filter, '
+			'single = pro Datensatz bzw. Elterntier einzeln (Standard: preload)'
+		)
+	)
+	parser.add_argument(
+		'--since-snapshot',
+		type=Path,
+		nargs='+',
+		default=None,
+		help=(
+			'Vorheriger Export je CSV-Datei (gleiche Reihenfolge); importiert werden nur neue und '
+			'geänderte Zeilen (Schlüssel "ID Animal")'
+		)
+	)
+	parser.add_argument(
+		'--state-db',
+		type=Path,
+		default=None,
+		help='SQLite-Datei mit dem Sync-Status früherer Läufe (cId -> documentId, Payload-Hash); wird angelegt, falls nicht vorhanden'
+	)
+	parser.add_argument(
+		'--stream',
+		action='store_true',
+		help=(
+			'CSV zeilenweise verarbeiten statt vorab vollständig einzulesen; Breeder werden beim ersten '
+			'Auftreten angelegt (nicht mit --lookup batch kombinierbar)'
+		)
+	)
+	parser.add_argument(
+		'--journal',
+		type=Path,
+		default=None,
+		help='Journal-Datei (JSON Lines) der erledigten Hunde; ermöglicht --resume nach einem Abbruch'
+	)
+	parser.add_argument(
+		'--resume',
+		action='store_true',
+		help='Abgebrochenen Lauf fortsetzen: im --journal erledigte Hunde überspringen'
+	)
+	parser.add_argument(
+		'--metrics-json',
+		type=Path,
+		default=None,
+		help='Laufzeiten je Phase/GraphQL-Operation (Anzahl, Summe, p50, p95, max) und Statistik als JSON schreiben'
+	)
+	parser.add_argument(
+		'--lookup-batch-size',
+		type=int,
+		default=100,
+		help='Anzahl cIds pro Batch-Abfrage bei --lookup batch (Standard: 100, max. 100)'
+	)
 	return parser
 
 
@@ -753,25 +1920,90 @@ def main() -> None:
 	parser = build_arg_parser()
 	args = parser.parse_args()
 
-	csv_path: Path = args.csv_path
-	if not csv_path.is_file():
-		parser.error(f'Datei nicht gefunden: {csv_path}')
+	csv_paths: list[Path] = args.csv_paths
+	for csv_path in csv_paths:
+		if not csv_path.is_file():
+			parser.error(f'Datei nicht gefunden: {csv_path}')
+	if args.since_snapshot and len(args.since_snapshot) != len(csv_paths):
+		parser.error('--since-snapshot benötigt genau einen Snapshot je CSV-Datei')
+	sources = ', '.join(str(csv_path) for csv_path in csv_paths)
 
 	token = os.getenv("TOKEN")
 	endpoint = os.getenv("ENDPOINT")
 
-	records = read_chromosoft_csv(csv_path)
-	print(f'{len(records)} Datensätze aus {csv_path} gelesen.')
+	if args.resume and not args.journal:
+		parser.error('--resume benötigt --journal')
+	if args.stream and args.lookup == 'batch':
+		parser.error('--stream ist nicht mit --lookup batch kombinierbar (benötigt alle cIds vorab)')
+
+	records: Iterable[ChromosoftDogRecord]
+	if args.stream:
+		records = iter_chromosoft_csvs(csv_paths)
+		print(f'Lese {sources} zeilenweise (Streaming).')
+	else:
+		records = read_chromosoft_csvs(csv_paths)
+		print(f'{len(records)} Datensätze aus {sources} gelesen.')
+
+	only_c_ids: Optional[set[int]] = None
+	if args.since_snapshot:
+		only_c_ids = set()
+		for snapshot, csv_path in zip(args.since_snapshot, csv_paths):
+			if not snapshot.is_file():
+				parser.error(f'Snapshot nicht gefunden: {snapshot}')
+			diff = diff_csv(snapshot, csv_path, DOG_KEY_COLUMN)
+			only_c_ids |= {c_id for c_id in (parse_int(key) for key in diff.upserted) if c_id is not None}
+			print(f'Delta {csv_path} seit {snapshot}: {diff.summary()}')
 
 	if args.dry_run:
 		print('Dry-Run aktiviert – es werden keine GraphQL-Mutationen gesendet.')
 		for record in records:
+			if only_c_ids is not None and record.c_id not in only_c_ids:
+				continue
 			payload = build_graphql_payload(record)
 			if args.verbose:
 				print(f'cId={record.c_id}: {payload}')
 		return
 
-	client = GraphQLClient(endpoint, token, max_retries=args.max_retries, verbose=args.verbose)
+	state = SyncStateStore(args.state_db) if args.state_db else None
+	if state is not None:
+		print(f'Sync-Status aus {args.state_db} geladen ({len(state)} Einträge).', file=sys.stderr)
+	limiter = None
+	if args.adaptive:
+		# Genug Worker, damit das Limit steigen kann; wie viele davon senden, regelt der Limiter
+		args.concurrency = max(args.concurrency, ADAPTIVE_MAX_CONCURRENCY)
+		limiter = AdaptiveLimiter(max_limit=args.concurrency)
+	client = GraphQLClient(
+		endpoint,
+		token,
+		max_retries=args.max_retries,
+		verbose=args.verbose,
+		pool_size=max(10, args.concurrency),
+		state=state,
+		limiter=limiter,
+		cache=QueryCache(args.query_cache_ttl, args.query_cache_size) if args.query_cache_ttl > 0 else None,
+	)
+	journal = ImportJournal(args.journal, fingerprint_files(csv_paths), resume=args.resume) if args.journal else None
+	if journal is not None and journal.resumed:
+		print(f'Setze Lauf aus {args.journal} fort ({journal.completed("dog")} Hunde bereits erledigt).', file=sys.stderr)
+	try:
+		run_import(client, records, args, only_c_ids, journal)
+		if journal is not None:
+			journal.finish()
+	finally:
+		if journal is not None:
+			journal.close()
+		if state is not None:
+			state.close()
+
+
+def run_import(
+	client: GraphQLClient,
+	records: Iterable[ChromosoftDogRecord],
+	args: argparse.Namespace,
+	only_c_ids: Optional[set[int]] = None,
+	journal: Optional[ImportJournal] = None,
+) -> None:
+	endpoint = client.endpoint
 
 	# Verbindungstest vor dem Import
 	print(f'Teste Verbindung zu {endpoint}...', file=sys.stderr)
@@ -790,12 +2022,63 @@ def main() -> None:
 		sys.exit(1)
 	print('Verbindung erfolgreich!', file=sys.stderr)
 
-	stats = import_records(records, client, verbose=args.verbose, delay_between_requests=args.delay)
+	if args.lookup == 'preload':
+		with timings.stage('lookup.preload'):
+			client.preload_indexes()
+	elif args.lookup == 'batch':
+		records = list(records)
+		breeder_ids = {record.breeder_id for record in records}
+		with timings.stage('lookup.batch'):
+			client.load_indexes_for(
+				dog_ids=(record.c_id for record in records),
+				breeder_ids=breeder_ids,
+				# Breeder werden über ihre cId mit dem gleichnamigen User verknüpft
+				user_ids={record.owner_id for record in records} | breeder_ids,
+				chunk_size=args.lookup_batch_size,
+			)
+			# Zuchtbuchnummern nur für Eltern, die nicht selbst in der CSV stehen (sonst über die cId);
+			# bei preload fallen sie mit dem Vorabladen an, bei single wird in Phase 2 einzeln gefragt
+			own_numbers = {studbook_key(record.studbook_number) for record in records}
+			client.load_studbook_numbers(
+				(
+					number
+					for record in records
+					for number in (record.sire_studbook_number, record.dam_studbook_number)
+					if studbook_key(number) not in own_numbers
+				),
+				chunk_size=args.lookup_batch_size,
+			)
+
+	stats = import_records(
+		records,
+		client,
+		verbose=args.verbose,
+		delay_between_requests=args.delay,
+		batch_size=args.batch_size,
+		concurrency=args.concurrency,
+		skip_unchanged=not args.force_update,
+		only_c_ids=only_c_ids,
+		stream=args.stream,
+		journal=journal,
+	)
 
 	print('Import abgeschlossen:')
 	for key, value in stats.items():
 		print(f'  {key}: {value}')
 
+	print('Laufzeiten je Phase:', file=sys.stderr)
+	print(timings.format_table(), file=sys.stderr)
+	extra: dict[str, Any] = {'stats': stats}
+	if client.limiter is not None:
+		print(client.limiter.format_summary(), file=sys.stderr)
+		extra['limiter'] = client.limiter.snapshot()
+	if client.cache is not None:
+		print(client.cache.format_summary(), file=sys.stderr)
+		extra['queryCache'] = client.cache.snapshot()
+	if args.metrics_json:
+		timings.write_json(args.metrics_json, extra)
+		print(f'Laufzeiten nach {args.metrics_json} geschrieben.', file=sys.stderr)
+
 
 if __name__ == '__main__':
 	main()
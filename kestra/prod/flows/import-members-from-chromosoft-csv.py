@@ -13,8 +13,16 @@ from typing import Dict, Optional, Any, List
 from datetime import datetime
 from dotenv import load_dotenv
 
-from lib.chromosoft_member import ChromosoftMember, sanitize_chromosoft_users, resolve_email_conflicts, validate_chromosoft_users
+from lib.chromosoft_member import (
+    ChromosoftMember, read_chromosoft_members, resolve_email_conflicts, sanitize_chromosoft_users,
+    select_delta_members, validate_chromosoft_users,
+)
 from lib.website_user import WebsiteClient, WebsiteUser
+from lib.user_snapshot import UserSnapshot
+from lib.sync_state import SyncStateStore, breeder_payload, payload_hash
+from lib.csv_diff import MEMBER_KEY_COLUMN, diff_csv
+from lib.import_journal import ImportJournal, fingerprint_files
+from lib.stage_timings import StageTimings
 
 load_dotenv()
 
@@ -36,6 +44,29 @@ def strapi_is_breeder(obj: Any) -> bool:
     return bool(raw)
 
 
+# Breeder-Feld -> Feld am WebsiteUser (geladen über die Breeder-Relation)
+BREEDER_USER_ATTRS = {'IsActive': 'IsActiveBreeder', 'kennelName': 'kennelName'}
+
+
+def breeder_unchanged_on_server(breeder_data: Dict[str, Any], existing_user: Any) -> bool:
+    """Vergleicht die Breeder-Felder mit dem geladenen Serverstand des Users (Breeder-Relation)."""
+    for key, new_val in breeder_data.items():
+        old_val = get_strapi_attr(existing_user, BREEDER_USER_ATTRS[key])
+        if key == 'IsActive':
+            if bool(new_val) != bool(old_val):
+                return False
+        elif (new_val or None) != (old_val or None):
+            return False
+    return True
+
+
+def remember_breeder(state: Optional[SyncStateStore], c_id: Optional[int], document_id: Optional[str],
+                     kennel_name: Optional[str]) -> None:
+    """Merkt sich den Breeder im Sync-Status, in derselben Form wie der Hunde-Import (nur kennelName)."""
+    if state is not None:
+        state.set('breeder', c_id, document_id, payload_hash(breeder_payload(kennel_name)) if kennel_name else None)
+
+
 def block_conflicting_email(client: WebsiteClient, real_email: str,
                           website_users_by_email: Dict[str, Any], dry_run: bool) -> None:
     """
@@ -166,7 +197,8 @@ def _try_register_user_after_email_conflict(
 def import_member_process(client: WebsiteClient, member: ChromosoftMember,
                           website_users_by_cid: Dict[int, Any],
                           website_users_by_email: Dict[str, Any],
-                          dry_run: bool = False) -> bool:
+                          dry_run: bool = False,
+                          state: Optional[SyncStateStore] = None) -> bool:
 
     # 1. Identify User
     c_id = member.cId
@@ -249,11 +281,6 @@ def import_member_process(client: WebsiteClient, member: ChromosoftMember,
 
     # 6. Execute
     if existing_user_doc_id:
-        # Check if update needed
-        if not has_changes(member, existing_user_data):
-            # print(f"No changes for {username}")
-            return True
-
         # Bestehende Identität: cId nie überschreiben, wenn schon gesetzt.
         if get_strapi_attr(existing_user_data, 'cId') is not None:
             user_data.pop('cId', None)
@@ -262,9 +289,23 @@ def import_member_process(client: WebsiteClient, member: ChromosoftMember,
         ex_blocked = bool(get_strapi_attr(existing_user_data, 'blocked'))
         if not ex_blocked and not strapi_is_breeder(existing_user_data):
             user_data.pop('email', None)
+        user_hash = payload_hash(user_data)
+
+        # Check if update needed
+        if not has_changes(member, existing_user_data):
+            # print(f"No changes for {username}")
+            if state is not None and not dry_run:
+                state.set('user', c_id, existing_user_doc_id, user_hash)
+            return True
 
+        # has_changes vergleicht auch die Breeder-Felder und normalisiert anders, als Strapi speichert.
+        # Wurde genau dieser Payload bereits gesendet und der User seitdem nicht geändert, entfällt das Update.
+        if state is not None and state.is_unchanged_since(
+            'user', c_id, existing_user_doc_id, user_hash, get_strapi_attr(existing_user_data, 'updatedAt')
+        ):
+            print(f"User {username} unchanged since last sync")
         # UPDATE
-        if not dry_run:
+        elif not dry_run:
             if _try_update_user_admin_after_email_conflict(
                 client,
                 existing_user_doc_id,
@@ -272,6 +313,8 @@ def import_member_process(client: WebsiteClient, member: ChromosoftMember,
                 exclude_document_id=existing_user_doc_id,
             ):
                 print(f"Updated user {username} (ID: {existing_user_doc_id})")
+                if state is not None:
+                    state.set('user', c_id, existing_user_doc_id, user_hash)
             else:
                 print(f"Failed to update user {username}")
         else:
@@ -288,17 +331,26 @@ def import_member_process(client: WebsiteClient, member: ChromosoftMember,
              breeder_data = {k: v for k, v in breeder_data.items() if v is not None}
 
              if existing_breeder_id:
-                 # Check breeder changes? (Optional optimization)
-                 # For now, update if breeder
-                 if not dry_run:
-                     client.update_breeder(existing_breeder_id, breeder_data)
-                     print(f"Updated breeder profile for user {username}")
+                 # Maßgeblich ist der geladene Serverstand (direkte Änderungen in Strapi werden korrigiert)
+                 if breeder_unchanged_on_server(breeder_data, existing_user_data):
+                     if not dry_run:
+                         remember_breeder(state, c_id, existing_breeder_id, member.kennelName)
+                 elif not dry_run:
+                     if client.update_breeder(existing_breeder_id, breeder_data):
+                         remember_breeder(state, c_id, existing_breeder_id, member.kennelName)
+                         print(f"Updated breeder profile for user {username}")
+                     else:
+                         print(f"Failed to update breeder profile for user {username}")
              else:
                  breeder_data['member'] = existing_user_doc_id
                  breeder_data['cId'] = c_id
                  if not dry_run:
-                     client.create_breeder(breeder_data)
-                     print(f"Created new breeder profile for existing user {username}")
+                     new_breeder_id = client.create_breeder(breeder_data)
+                     if new_breeder_id:
+                         remember_breeder(state, c_id, new_breeder_id, member.kennelName)
+                         print(f"Created new breeder profile for existing user {username}")
+                     else:
+                         print(f"Failed to create breeder profile for user {username}")
 
     else:
         # CREATE
@@ -315,6 +367,8 @@ def import_member_process(client: WebsiteClient, member: ChromosoftMember,
                     exclude_document_id=new_doc_id,
                 ):
                      print(f"Registered and updated {username}")
+                     if state is not None:
+                         state.set('user', c_id, new_doc_id, payload_hash(user_data))
 
                      if member.cFlagBreeder:
                          b_data = {
@@ -324,8 +378,12 @@ def import_member_process(client: WebsiteClient, member: ChromosoftMember,
                              'kennelName': member.kennelName
                          }
                          b_data = {k: v for k, v in b_data.items() if v is not None}
-                         client.create_breeder(b_data)
-                         print(f"Created breeder profile for new user {username}")
+                         new_breeder_id = client.create_breeder(b_data)
+                         if new_breeder_id:
+                             remember_breeder(state, c_id, new_breeder_id, member.kennelName)
+                             print(f"Created breeder profile for new user {username}")
+                         else:
+                             print(f"Failed to create breeder profile for new user {username}")
                 else:
                      print(f"Failed to update profile for new user {username}")
             else:
@@ -344,7 +402,39 @@ def main():
         default=',',
         help='CSV-Trennzeichen (Standard: Komma)',
     )
+    parser.add_argument(
+        '--since-snapshot',
+        default=None,
+        help='Vorheriger Export; importiert werden nur neue und geänderte Zeilen (Schlüssel "ID Person")',
+    )
+    parser.add_argument(
+        '--state-db',
+        default=None,
+        help='SQLite-Datei mit dem Sync-Status früherer Läufe (cId -> documentId, Payload-Hash); bereits gesendete, seitdem in Strapi unveränderte User werden nicht erneut aktualisiert',
+    )
+    parser.add_argument(
+        '--user-snapshot',
+        default=None,
+        help='Snapshot-Datei der Website-User des letzten Laufs; ohne Änderungen in Strapi entfällt der Abruf, sonst werden nur geänderte User geladen (updatedAt)',
+    )
+    parser.add_argument(
+        '--journal',
+        default=None,
+        help='Journal-Datei (JSON Lines) der erledigten Mitglieder; ermöglicht --resume nach einem Abbruch',
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Abgebrochenen Lauf fortsetzen: im --journal erledigte Mitglieder überspringen',
+    )
+    parser.add_argument(
+        '--metrics-json',
+        default=None,
+        help='Laufzeiten je Phase/GraphQL-Operation (Anzahl, Summe, p50, p95, max) als JSON schreiben',
+    )
     args = parser.parse_args()
+    if args.resume and not args.journal:
+        parser.error('--resume benötigt --journal')
 
     api_url = os.getenv('ENDPOINT')
     api_token = os.getenv('TOKEN')
@@ -353,33 +443,56 @@ def main():
         print("Error: ENDPOINT and TOKEN environment variables must be set.")
         return
 
-    client = WebsiteClient(api_url, api_token)
+    timings = StageTimings()
+    client = WebsiteClient(api_url, api_token, timings=timings)
 
-    # 1. Read CSV
+    # 1. Read & Parse CSV
+    # Zeilen werden direkt beim Lesen geparst; die Rohzeilen werden nicht zusätzlich gehalten
     print(f"Reading CSV file: {args.csv_file}")
-    rows = []
+    members = []
+    header = []
     try:
         with open(args.csv_file, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f, delimiter=args.csv_delimiter)
-            rows = list(reader)
+            header = list(reader.fieldnames or [])
+            for row in reader:
+                if not any(row.values()): continue
+                try:
+                    with timings.stage('csv.parse'):
+                        m = ChromosoftMember.from_csv_row(row)
+                    members.append(m)
+                except Exception as e:
+                    print(f"Error parsing row: {e}")
     except Exception as e:
         print(f"Error reading CSV: {e}")
         return
 
-    # 2. Parse & Sanitize
-    members = []
-    print("Parsing CSV data...")
-    for row in rows:
-        if not any(row.values()): continue
-        try:
-            m = ChromosoftMember.from_csv_row(row)
-            members.append(m)
-        except Exception as e:
-            print(f"Error parsing row: {e}")
+    # 2. Sanitize
+
+    # E-Mail-Konflikte werden immer über alle Mitglieder aufgelöst, auch bei --since-snapshot
+    with timings.stage('members.sanitize'):
+        sanitize_chromosoft_users(members)
+        resolve_email_conflicts(members)
+        validate_chromosoft_users(members)
 
-    sanitize_chromosoft_users(members)
-    resolve_email_conflicts(members)
-    validate_chromosoft_users(members)
+    members_to_import = members
+    if args.since_snapshot:
+        try:
+            diff = diff_csv(args.since_snapshot, args.csv_file, MEMBER_KEY_COLUMN, args.csv_delimiter)
+            # Die Konfliktauflösung hängt von allen Mitgliedern mit derselben E-Mail ab; der vorherige
+            # Export wird genauso aufgelöst, damit auch unveränderte Zeilen mit neuer E-Mail importiert werden
+            with timings.stage('members.sanitize'):
+                previous_members = read_chromosoft_members(args.since_snapshot, args.csv_delimiter)
+                sanitize_chromosoft_users(previous_members)
+                resolve_email_conflicts(previous_members)
+        except (OSError, ValueError) as e:
+            print(f"Error comparing with snapshot: {e}")
+            return
+        changed_cids = {ChromosoftMember.parse_integer(key) for key in diff.upserted}
+        # Zeilen ohne cId lassen sich nicht vergleichen und werden weiterhin importiert
+        members_to_import = select_delta_members(members, changed_cids, previous_members)
+        print(f"Delta since {args.since_snapshot}: {diff.summary()} "
+              f"-> {len(members_to_import)} members to import")
 
     if members:
         m0 = members[0]
@@ -389,7 +502,7 @@ def main():
             and not m0.lastName
             and not m0.cEmail
         ):
-            keys = list(rows[0].keys()) if rows else []
+            keys = header
             print(
                 'WARNUNG: Erste Zeile liefert fast keine Felder — '
                 'Spaltennamen/Trennzeichen passen vermutlich nicht.'
@@ -402,7 +515,12 @@ def main():
 
     # 3. Fetch Existing Data
     print("Fetching existing users from Website...")
-    all_users = client.fetch_all_users()
+    # Users inkl. Breeder-Info (für die deterministische Auflösung von E-Mail-Konflikten)
+    with timings.stage('fetch.users'):
+        if args.user_snapshot:
+            all_users = client.fetch_all_users_incremental(UserSnapshot(args.user_snapshot))
+        else:
+            all_users = client.fetch_all_users_with_breeders()
 
     # Normalized access
     def get_attr(obj, attr):
@@ -410,23 +528,6 @@ def main():
             return obj.get(attr)
         return getattr(obj, attr, None)
 
-    # Enrich with Breeder Info (needed for deterministic email conflict resolution)
-    breeders = client.fetch_all_breeders()
-    for u in all_users:
-        uid = get_attr(u, 'documentId')
-        if uid in breeders:
-            b_info = breeders[uid]
-            if isinstance(u, dict):
-                u['cFlagBreeder'] = True
-                u['IsActiveBreeder'] = b_info['IsActive']
-                u['breederDocumentId'] = b_info['breederId']
-                u['kennelName'] = b_info['kennelName']
-            else:
-                u.cFlagBreeder = True
-                u.IsActiveBreeder = b_info['IsActive']
-                u.breederDocumentId = b_info['breederId']
-                u.kennelName = b_info['kennelName']
-
     # 4. Build Lookup Maps
     website_users_by_cid = {}
     website_users_by_email = {}
@@ -471,12 +572,46 @@ def main():
 
     # 5. Run Import
     print(f"Starting Import Process (Dry Run: {args.dry_run})...")
+    state = SyncStateStore(args.state_db) if args.state_db else None
+    journal = None
+    if args.journal and not args.dry_run:
+        journal = ImportJournal(args.journal, fingerprint_files([args.csv_file]), resume=args.resume)
+        if journal.resumed:
+            print(f"Resuming from {args.journal} ({journal.completed('member')} members already done)")
     count = 0
-    for m in members:
-        if import_member_process(client, m, website_users_by_cid, website_users_by_email, args.dry_run):
-            count += 1
-
+    resumed = 0
+    try:
+        for m in members_to_import:
+            # Schlüssel im Journal: cId, ersatzweise der Benutzername
+            journal_key = m.cId if m.cId is not None else m.username
+            if journal is not None and journal_key and journal.is_done('member', journal_key):
+                resumed += 1
+                continue
+            with timings.stage('member.process'):
+                ok = import_member_process(client, m, website_users_by_cid, website_users_by_email, args.dry_run, state)
+            if ok:
+                count += 1
+                outcome = 'processed'
+            else:
+                outcome = 'failed'
+            if journal is not None and journal_key:
+                journal.record('member', journal_key, outcome)
+        if journal is not None:
+            journal.finish()
+    finally:
+        if journal is not None:
+            journal.close()
+        if state is not None:
+            state.close()
+
+    if resumed:
+        print(f"Skipped {resumed} members already done in the interrupted run.")
     print(f"Import process completed. Processed {count} members.")
+    print("Laufzeiten je Phase:")
+    print(timings.format_table())
+    if args.metrics_json:
+        timings.write_json(args.metrics_json, {'stats': {'processed': count, 'resumed': resumed}})
+        print(f"Laufzeiten nach {args.metrics_json} geschrieben.")
 
 if __name__ == '__main__':
     main()
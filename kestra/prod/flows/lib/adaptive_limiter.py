@@ -0,0 +1,173 @@
+"""
+Adaptive Begrenzung gleichzeitiger GraphQL-Anfragen (AIMD).
+
+Statt einer festen Pause zwischen den Anfragen (--delay) regelt der Limiter, wie viele
+Anfragen gleichzeitig an Strapi gehen dürfen: Solange die Antwortzeiten stabil sind,
+steigt das Limit langsam (additiv, etwa +1 je Runde). Bei 429, 5xx, Verbindungsfehlern
+oder deutlich steigenden Antwortzeiten wird es sofort halbiert (multiplikativ). Ein
+Retry-After des Servers hält alle Anfragen bis zum angegebenen Zeitpunkt an. So läuft
+der Import nachts schnell und bremst von selbst, wenn Redakteure in Strapi arbeiten.
+"""
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+# Antworten, bei denen der Server Überlast signalisiert (Limit halbieren, Retry-After beachten)
+THROTTLE_STATUSES = (429, 503)
+
+# Längste beachtete Wartezeit aus Retry-After in Sekunden
+MAX_RETRY_AFTER = 300.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After als Sekunden (Zahl oder HTTP-Datum); None, wenn nicht vorhanden/ungültig."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    if math.isnan(seconds):
+        return None
+    return min(max(0.0, seconds), MAX_RETRY_AFTER)
+
+
+class AdaptiveLimiter:
+    """Thread-sicheres AIMD-Limit für gleichzeitige Anfragen.
+
+    Die Grundlatenz ist ein gleitender Wert, der Verbesserungen sofort und
+    Verschlechterungen nur langsam übernimmt. Eine Antwort gilt als Latenzspitze,
+    wenn sie um latency_factor über der Grundlatenz und mindestens min_spike
+    Sekunden darüber liegt. Nach einer Absenkung wird erst nach einer vollen Runde
+    (so viele Antworten wie das Limit) erneut abgesenkt, damit die Antworten der
+    bereits laufenden Anfragen das Limit nicht mehrfach halbieren.
+    """
+
+    def __init__(
+        self,
+        initial: float = 2.0,
+        min_limit: float = 1.0,
+        max_limit: float = 16.0,
+        decrease: float = 0.5,
+        latency_factor: float = 2.0,
+        min_spike: float = 0.05,
+        baseline_alpha: float = 0.05,
+    ):
+        self.min_limit = max(1.0, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.min_spike = min_spike
+        self.baseline_alpha = baseline_alpha
+        self.baseline: Optional[float] = None
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._since_decrease = math.inf
+        # Kennzahlen für die Zusammenfassung
+        self.peak_limit = self.limit
+        self.decreases = 0
+        self.throttled = 0
+        self.errors = 0
+        self.spikes = 0
+        self.paused = 0.0
+
+    def acquire(self) -> float:
+        """Wartet auf einen freien Platz (und ein evtl. Retry-After); gibt den Startzeitpunkt zurück."""
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                elif self._in_flight >= int(self.limit):
+                    self._cond.wait()
+                else:
+                    break
+            self._in_flight += 1
+        return time.perf_counter()
+
+    def release(self, started: float, status: Optional[int], retry_after: Optional[float] = None) -> None:
+        """Meldet das Ergebnis einer Anfrage (HTTP-Status, None = Verbindungsfehler)."""
+        latency = time.perf_counter() - started
+        with self._cond:
+            self._in_flight -= 1
+            self._since_decrease += 1
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+                self._decrease()
+            elif status is None or status >= 500:
+                self.errors += 1
+                self._decrease()
+            elif self._is_spike(latency):
+                self.spikes += 1
+                self._decrease()
+            else:
+                # Additiv: zusammen etwa +1 pro Runde von `limit` Antworten
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self.peak_limit = max(self.peak_limit, self.limit)
+            if retry_after:
+                self._pause_locked(retry_after)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Hält alle neuen Anfragen für `seconds` an (z. B. aus Retry-After)."""
+        with self._cond:
+            self._pause_locked(seconds)
+            self._cond.notify_all()
+
+    def _pause_locked(self, seconds: float) -> None:
+        now = time.monotonic()
+        until = now + seconds
+        if until > self._paused_until:
+            self.paused += until - max(now, self._paused_until)
+            self._paused_until = until
+
+    def _is_spike(self, latency: float) -> bool:
+        baseline = self.baseline
+        if baseline is None or latency < baseline:
+            self.baseline = latency
+            return False
+        spike = latency > baseline * self.latency_factor and latency - baseline > self.min_spike
+        if not spike:
+            self.baseline = baseline + self.baseline_alpha * (latency - baseline)
+        return spike
+
+    def _decrease(self) -> None:
+        if self._since_decrease < self.limit:
+            return
+        self.limit = max(self.min_limit, self.limit * self.decrease)
+        self.decreases += 1
+        self._since_decrease = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'limit': round(self.limit, 2),
+                'peakLimit': round(self.peak_limit, 2),
+                'maxLimit': self.max_limit,
+                'baselineMs': round(self.baseline * 1000, 1) if self.baseline is not None else None,
+                'decreases': self.decreases,
+                'throttled': self.throttled,
+                'errors': self.errors,
+                'latencySpikes': self.spikes,
+                'pausedSeconds': round(self.paused, 3),
+            }
+
+    def format_summary(self) -> str:
+        s = self.snapshot()
+        return (
+            f'Adaptives Limit: aktuell {s["limit"]}, Höchststand {s["peakLimit"]} (max. {s["maxLimit"]:g}), '
+            f'{s["decreases"]} Absenkungen ({s["throttled"]}x 429/503, {s["errors"]}x Fehler, '
+            f'{s["latencySpikes"]}x Latenzspitze), {s["pausedSeconds"]} s Retry-After-Pause'
+        )
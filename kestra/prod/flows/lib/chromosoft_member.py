@@ -1,8 +1,11 @@
+import csv
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set
 from datetime import datetime
 import re
 
+from lib.date_parsing import DateParser
+
 # Mapping of country names to ISO 3166-1 alpha-2 codes
 COUNTRY_CODES = {
     'Deutschland': 'DE', 'Germany': 'DE',
@@ -10,6 +13,15 @@ COUNTRY_CODES = {
     'Schweiz': 'CH', 'Switzerland': 'CH',
 }
 
+MEMBER_DATE_FORMATS = ('%d/%m/%Y', '%Y-%m-%d')
+
+# Je Datumsspalte ein eigener Parser (Formaterkennung + Cache), Ausgabe wie bisher per strftime
+_parse_any_date = DateParser(MEMBER_DATE_FORMATS, output_format='%Y-%m-%d')
+_parse_date_of_birth = DateParser(MEMBER_DATE_FORMATS, output_format='%Y-%m-%d')
+_parse_date_of_death = DateParser(MEMBER_DATE_FORMATS, output_format='%Y-%m-%d')
+_parse_date_of_joining = DateParser(MEMBER_DATE_FORMATS, output_format='%Y-%m-%d')
+_parse_date_of_leaving = DateParser(MEMBER_DATE_FORMATS, output_format='%Y-%m-%d')
+
 REGION_MAPPING = {
     'Nord': 'Nord', 'Süd': 'Sued', 'Ost': 'Ost',
     'West': 'West', 'Mitte': 'Mitte'
@@ -42,15 +54,7 @@ class ChromosoftMember:
 
     @staticmethod
     def parse_date(date_str: str) -> Optional[str]:
-        if not date_str or date_str.strip() in ['-', '']:
-            return None
-        try:
-            return datetime.strptime(date_str.strip(), '%d/%m/%Y').strftime('%Y-%m-%d')
-        except ValueError:
-            try:
-                return datetime.strptime(date_str.strip(), '%Y-%m-%d').strftime('%Y-%m-%d')
-            except ValueError:
-                return None
+        return _parse_any_date(date_str)
 
     @staticmethod
     def parse_boolean(value: str) -> Optional[bool]:
@@ -172,14 +176,14 @@ class ChromosoftMember:
             'mitgliedsnummer', 'member number', 'membership_no'))
         username = str(membership_no) if membership_no else None
 
-        dob = cls.parse_date(cls._cell(
+        dob = _parse_date_of_birth(cls._cell(
             nr, 'date of birth', 'date_of_birth', 'birth date',
             'geburtsdatum', 'geburtstag'))
-        dod = cls.parse_date(cls._cell(
+        dod = _parse_date_of_death(cls._cell(
             nr, 'date of death', 'date_of_death', 'sterbedatum'))
-        member_since = cls.parse_date(cls._cell(
+        member_since = _parse_date_of_joining(cls._cell(
             nr, 'date of joining', 'joining date', 'eintrittsdatum', 'beitritt'))
-        cancellation_on = cls.parse_date(cls._cell(
+        cancellation_on = _parse_date_of_leaving(cls._cell(
             nr, 'date of leaving', 'leaving date', 'austrittsdatum', 'austritt'))
 
         is_member = cls.parse_boolean(cls._cell(
@@ -366,6 +370,35 @@ def resolve_email_conflicts(members: List[ChromosoftMember]) -> None:
     print(f"Resolved {renamed + cleared} email conflicts "
           f"(renamed={renamed}, cleared={cleared}).")
 
+def read_chromosoft_members(path: str, delimiter: str = ',') -> List[ChromosoftMember]:
+    """Liest einen Mitgliederexport; leere und nicht lesbare Zeilen werden übersprungen."""
+    members = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f, delimiter=delimiter):
+            if not any(row.values()):
+                continue
+            try:
+                members.append(ChromosoftMember.from_csv_row(row))
+            except Exception as e:
+                print(f"Error parsing row: {e}")
+    return members
+
+
+def select_delta_members(members: List[ChromosoftMember], changed_cids: Set[Optional[int]],
+                         previous_members: List[ChromosoftMember]) -> List[ChromosoftMember]:
+    """
+    Mitglieder für einen Delta-Import: neue und geänderte Zeilen (changed_cids), Zeilen ohne
+    cId sowie unveränderte Zeilen, denen resolve_email_conflicts jetzt eine andere E-Mail
+    gibt als im vorherigen Export (z. B. weil ein neues Mitglied dieselbe Adresse hat).
+    Beide Listen müssen bereits sanitize_chromosoft_users/resolve_email_conflicts durchlaufen haben.
+    """
+    previous_emails = {m.cId: m.cEmail for m in previous_members if m.cId is not None}
+    return [
+        m for m in members
+        if m.cId is None or m.cId in changed_cids or previous_emails.get(m.cId) != m.cEmail
+    ]
+
+
 def validate_chromosoft_users(members: List[ChromosoftMember]) -> bool:
     print(f"Validating {len(members)} members...")
     # Add validation logic here matching original script
@@ -0,0 +1,76 @@
+"""
+Tests für lib/chromosoft_member.py.
+
+# python -m pytest lib/chromosoft_member_test.py
+"""
+import csv
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lib.chromosoft_member import (  # noqa: E402
+    ChromosoftMember, read_chromosoft_members, resolve_email_conflicts, sanitize_chromosoft_users,
+    select_delta_members,
+)
+from lib.csv_diff import MEMBER_KEY_COLUMN, diff_csv  # noqa: E402
+
+HEADER = ['ID Person', 'Lastname', 'Email', 'Person is a breeder', 'Membership number']
+
+
+def _write_export(path: Path, rows) -> None:
+    with path.open('w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+
+
+def _delta_cids(tmp_path: Path, previous_rows, current_rows):
+    previous, current = tmp_path / 'previous.csv', tmp_path / 'current.csv'
+    _write_export(previous, previous_rows)
+    _write_export(current, current_rows)
+    diff = diff_csv(previous, current, MEMBER_KEY_COLUMN)
+    changed_cids = {ChromosoftMember.parse_integer(key) for key in diff.upserted}
+    selected = []
+    members = read_chromosoft_members(str(current))
+    previous_members = read_chromosoft_members(str(previous))
+    for export in (members, previous_members):
+        sanitize_chromosoft_users(export)
+        resolve_email_conflicts(export)
+    for m in select_delta_members(members, changed_cids, previous_members):
+        selected.append(m.cId)
+    return changed_cids, sorted(selected)
+
+
+def test_new_member_with_shared_email_selects_unchanged_member(tmp_path):
+    breeder = ['1002', 'Züchter', 'familie@example.com', 'ja', '2002']
+    other = ['1003', 'Andere', 'andere@example.com', 'nein', '2003']
+    new = ['1001', 'Neu', 'familie@example.com', 'nein', '2001']
+
+    changed, selected = _delta_cids(tmp_path, [breeder, other], [new, breeder, other])
+
+    # Nur die neue Zeile ist geändert, der Breeder bekommt aber jetzt eine umbenannte E-Mail
+    assert changed == {1001}
+    assert selected == [1001, 1002]
+
+
+def test_member_leaving_shared_email_selects_remaining_member(tmp_path):
+    breeder = ['1002', 'Züchter', 'familie@example.com', 'ja', '2002']
+    before = ['1001', 'Alt', 'familie@example.com', 'nein', '2001']
+    after = ['1001', 'Alt', 'eigene@example.com', 'nein', '2001']
+
+    changed, selected = _delta_cids(tmp_path, [before, breeder], [after, breeder])
+
+    # Der Breeder erhält seine E-Mail wieder unverändert
+    assert changed == {1001}
+    assert selected == [1001, 1002]
+
+
+def test_unrelated_unchanged_members_stay_out_of_the_delta(tmp_path):
+    rows = [['1001', 'Eins', 'eins@example.com', 'nein', '2001'], ['1002', 'Zwei', 'zwei@example.com', 'ja', '2002']]
+    changed_row = ['1001', 'Eins geändert', 'eins@example.com', 'nein', '2001']
+
+    changed, selected = _delta_cids(tmp_path, rows, [changed_row, rows[1]])
+
+    assert changed == {1001}
+    assert selected == [1001]
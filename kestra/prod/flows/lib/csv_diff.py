@@ -0,0 +1,104 @@
+"""
+Zeilenweiser Vergleich zweier Chromosoft-Exporte.
+
+Jede Zeile wird über ihre Schlüsselspalte (``ID Animal`` bzw. ``ID Person``)
+identifiziert und über einen Hash aller Zellen verglichen. So müssen die
+Importer nur noch neue und geänderte Zeilen verarbeiten.
+"""
+import csv
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+DOG_KEY_COLUMN = 'ID Animal'
+MEMBER_KEY_COLUMN = 'ID Person'
+
+PathLike = Union[str, Path]
+
+
+@dataclass
+class CsvDiff:
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def upserted(self) -> Set[str]:
+        """Schlüssel aller Zeilen, die importiert werden müssen (neu oder geändert)."""
+        return set(self.added) | set(self.changed)
+
+    def summary(self) -> str:
+        return f'{len(self.added)} neu, {len(self.changed)} geändert, {len(self.removed)} entfernt'
+
+
+def _normalize_header(name: Optional[str]) -> str:
+    return str(name or '').strip().lstrip('\ufeff').lower()
+
+
+def find_key_column(fieldnames: Optional[List[str]], key_column: str) -> str:
+    """Tatsächlicher Spaltenname der Schlüsselspalte (ohne BOM, unabhängig von Groß-/Kleinschreibung)."""
+    wanted = _normalize_header(key_column)
+    for name in fieldnames or []:
+        if _normalize_header(name) == wanted:
+            return name
+    raise ValueError(f'Schlüsselspalte "{key_column}" nicht im CSV-Header gefunden.')
+
+
+def row_hash(row: Dict[Optional[str], Optional[str]]) -> str:
+    """Hash über alle Zellen einer Zeile (Spaltenreihenfolge spielt keine Rolle)."""
+    normalized = {_normalize_header(k): (v if isinstance(v, str) else json.dumps(v)) for k, v in row.items()}
+    canonical = json.dumps(normalized, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def iter_keyed_rows(
+    path: PathLike, key_column: str, delimiter: str = ','
+) -> Iterator[Tuple[str, Dict[Optional[str], Optional[str]]]]:
+    """Liefert (Schlüssel, Zeile) für alle Zeilen mit nicht-leerem Schlüssel."""
+    with open(path, 'r', encoding='utf-8', newline='') as handle:
+        reader = csv.DictReader(handle, delimiter=delimiter)
+        key_name = find_key_column(reader.fieldnames, key_column)
+        for row in reader:
+            key = (row.get(key_name) or '').strip()
+            if key and key != '-':
+                yield key, row
+
+
+def load_row_hashes(path: PathLike, key_column: str, delimiter: str = ',') -> Dict[str, str]:
+    return {key: row_hash(row) for key, row in iter_keyed_rows(path, key_column, delimiter)}
+
+
+def diff_csv(previous: PathLike, current: PathLike, key_column: str, delimiter: str = ',') -> CsvDiff:
+    """Vergleicht den aktuellen Export mit dem vorherigen Snapshot."""
+    old_hashes = load_row_hashes(previous, key_column, delimiter)
+    diff = CsvDiff()
+    seen: Set[str] = set()
+    for key, row in iter_keyed_rows(current, key_column, delimiter):
+        seen.add(key)
+        old = old_hashes.get(key)
+        if old is None:
+            diff.added.append(key)
+        elif old != row_hash(row):
+            diff.changed.append(key)
+    diff.removed = [key for key in old_hashes if key not in seen]
+    return diff
+
+
+def write_rows(
+    source: PathLike, target: PathLike, keys: Set[str], key_column: str, delimiter: str = ','
+) -> int:
+    """Schreibt Header und alle Zeilen aus source, deren Schlüssel in keys liegt. Gibt die Anzahl zurück."""
+    written = 0
+    with open(source, 'r', encoding='utf-8', newline='') as src, \
+            open(target, 'w', encoding='utf-8', newline='') as dst:
+        reader = csv.DictReader(src, delimiter=delimiter)
+        key_name = find_key_column(reader.fieldnames, key_column)
+        writer = csv.DictWriter(dst, fieldnames=reader.fieldnames, delimiter=delimiter, extrasaction='ignore')
+        writer.writeheader()
+        for row in reader:
+            if (row.get(key_name) or '').strip() in keys:
+                writer.writerow(row)
+                written += 1
+    return written
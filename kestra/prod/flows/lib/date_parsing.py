@@ -0,0 +1,88 @@
+"""
+Schnelles Parsen der Datumsspalten aus den Chromosoft-Exporten.
+
+Statt für jede Zelle nacheinander mehrere strptime-Formate zu probieren, wird jedes
+Format einmal in einen regulären Ausdruck übersetzt (dieselben Teilmuster wie
+datetime.strptime für %d, %m und %Y). Pro Spalte wird das zuerst passende Format
+gemerkt und danach zuerst versucht; wiederkehrende Werte wie '-' oder häufige
+Daten kommen aus einem Cache. Das Ergebnis ist identisch zu strptime.
+"""
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Callable, List, Optional, Pattern, Sequence, Tuple
+
+# Teilmuster wie in datetime._strptime (TimeRE)
+_DIRECTIVES = {
+    'd': r'(?P<d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])',
+    'm': r'(?P<m>1[0-2]|0[1-9]|[1-9])',
+    'Y': r'(?P<Y>\d\d\d\d)',
+}
+
+CACHE_SIZE = 4096
+
+
+def compile_date_format(fmt: str) -> Pattern[str]:
+    """Übersetzt ein strptime-Format aus %d, %m, %Y und festen Trennzeichen in einen regulären Ausdruck."""
+    parts: List[str] = []
+    index = 0
+    while index < len(fmt):
+        char = fmt[index]
+        if char == '%':
+            directive = fmt[index + 1:index + 2]
+            if directive not in _DIRECTIVES:
+                raise ValueError(f'Nicht unterstütztes Datumsformat: {fmt}')
+            parts.append(_DIRECTIVES[directive])
+            index += 2
+        elif char.isspace():
+            raise ValueError(f'Nicht unterstütztes Datumsformat: {fmt}')
+        else:
+            parts.append(re.escape(char))
+            index += 1
+    return re.compile(''.join(parts), re.IGNORECASE)
+
+
+class DateParser:
+    """Parst die Werte einer Datumsspalte und gibt sie als ISO-Datum zurück.
+
+    formats werden wie bisher der Reihe nach probiert. Sie müssen sich gegenseitig
+    ausschließen (wie '%d/%m/%Y' und '%Y-%m-%d'), damit das Vorziehen des zuletzt
+    erkannten Formats das Ergebnis nicht verändert. output_format=None liefert
+    date.isoformat(), sonst date.strftime(output_format).
+    """
+
+    def __init__(self, formats: Sequence[str], output_format: Optional[str] = None, cache_size: int = CACHE_SIZE):
+        self.formats = tuple(formats)
+        self.output_format = output_format
+        self._patterns: List[Tuple[str, Pattern[str]]] = [(fmt, compile_date_format(fmt)) for fmt in self.formats]
+        self._cached: Callable[[str], Optional[str]] = lru_cache(maxsize=cache_size)(self._parse)
+
+    @property
+    def detected_format(self) -> Optional[str]:
+        """Zuletzt erkanntes Format der Spalte (wird als erstes versucht)."""
+        return self._patterns[0][0] if self._patterns else None
+
+    def __call__(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return self._cached(value)
+
+    def _parse(self, value: str) -> Optional[str]:
+        value = value.strip()
+        if not value or value == '-':
+            return None
+        patterns = self._patterns
+        for position, (fmt, pattern) in enumerate(patterns):
+            # match + Längenprüfung wie strptime ("unconverted data remains")
+            found = pattern.match(value)
+            if found is None or found.end() != len(value):
+                continue
+            try:
+                parsed = date(int(found.group('Y')), int(found.group('m')), int(found.group('d')))
+            except ValueError:
+                continue
+            if position:
+                # Format dieser Spalte erkannt: künftig zuerst versuchen
+                self._patterns = [patterns[position]] + patterns[:position] + patterns[position + 1:]
+            return parsed.isoformat() if self.output_format is None else parsed.strftime(self.output_format)
+        return None
@@ -0,0 +1,148 @@
+"""
+Absturzsicheres Journal für die Chromosoft-Importe.
+
+Jeder abgeschlossene Datensatz wird als JSON-Zeile (Art, Schlüssel, Ergebnis,
+documentId) an die Journal-Datei angehängt und in Blöcken per fsync gesichert.
+Bricht ein Lauf ab (OOM, Pod-Eviction, Strapi-Neustart), überspringt der nächste
+Lauf mit --resume alle bereits erledigten Datensätze. Die erste Zeile enthält einen
+Fingerabdruck der Eingabedateien; passt er nicht mehr oder wurde der vorige Lauf
+vollständig beendet, beginnt das Journal von vorn.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+PathLike = Union[str, Path]
+
+# Anzahl Einträge, nach denen das Journal per fsync auf die Platte geschrieben wird
+FSYNC_EVERY = 100
+
+# Ergebnisse, die beim Fortsetzen erneut versucht werden
+RETRY_OUTCOMES = ('failed',)
+
+
+def fingerprint_files(paths: Iterable[PathLike]) -> str:
+    """SHA-256 über Namen und Inhalt der Eingabedateien."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).name.encode('utf-8'))
+        with open(path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class ImportJournal:
+    """Append-only Journal (JSON Lines) erledigter Datensätze."""
+
+    def __init__(self, path: PathLike, run_key: str, resume: bool = False, fsync_every: int = FSYNC_EVERY):
+        self.path = Path(path)
+        self.run_key = run_key
+        self.fsync_every = max(1, fsync_every)
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._done: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Ende der letzten vollständigen Zeile (Bytes); dahinter liegt ggf. eine halb geschriebene
+        self._valid_end = 0
+        self.resumed = resume and self._load()
+        if self.resumed:
+            # Halb geschriebene letzte Zeile abschneiden, sonst verschmilzt der nächste Eintrag mit ihr
+            os.truncate(self.path, self._valid_end)
+            self._handle = open(self.path, 'a', encoding='utf-8')
+        else:
+            self._done = {}
+            self._handle = open(self.path, 'w', encoding='utf-8')
+            self._write({'event': 'start', 'run': run_key, 'at': _now()})
+            self.sync()
+
+    def __enter__(self) -> 'ImportJournal':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _load(self) -> bool:
+        """Liest ein vorhandenes Journal. False, wenn es nicht fortgesetzt werden kann."""
+        if not self.path.is_file():
+            return False
+        started = False
+        with open(self.path, 'rb') as handle:
+            for line in handle:
+                if not line.endswith(b'\n'):
+                    # Beim Absturz halb geschriebene letzte Zeile
+                    break
+                self._valid_end += len(line)
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                event = entry.get('event')
+                if event == 'start':
+                    if entry.get('run') != self.run_key:
+                        print(f'Journal {self.path} gehört zu anderen Eingabedateien; beginne von vorn.')
+                        return False
+                    started = True
+                elif event == 'finished':
+                    print(f'Journal {self.path}: voriger Lauf wurde vollständig beendet; beginne von vorn.')
+                    return False
+                elif started and 'kind' in entry and 'key' in entry:
+                    self._done.setdefault(entry['kind'], {})[str(entry['key'])] = entry
+        return started
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._handle.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    def completed(self, kind: str) -> int:
+        """Anzahl bereits erledigter Datensätze einer Art (ohne fehlgeschlagene)."""
+        return sum(1 for entry in self._done.get(kind, {}).values() if entry.get('outcome') not in RETRY_OUTCOMES)
+
+    def get(self, kind: str, key: Any) -> Optional[Dict[str, Any]]:
+        """Journal-Eintrag eines erledigten Datensatzes oder None (auch bei Fehlschlag)."""
+        entry = self._done.get(kind, {}).get(str(key))
+        if entry is None or entry.get('outcome') in RETRY_OUTCOMES:
+            return None
+        return entry
+
+    def is_done(self, kind: str, key: Any) -> bool:
+        return self.get(kind, key) is not None
+
+    def record(self, kind: str, key: Any, outcome: str, document_id: Optional[str] = None) -> None:
+        """Hängt das Ergebnis eines Datensatzes an; fsync nach jeweils fsync_every Einträgen."""
+        entry: Dict[str, Any] = {'kind': kind, 'key': str(key), 'outcome': outcome}
+        if document_id:
+            entry['documentId'] = document_id
+        with self._lock:
+            self._done.setdefault(kind, {})[str(key)] = entry
+            self._write(entry)
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every:
+                self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._unsynced = 0
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync_locked()
+
+    def finish(self) -> None:
+        """Markiert den Lauf als vollständig; ein späteres --resume beginnt dann von vorn."""
+        with self._lock:
+            self._write({'event': 'finished', 'at': _now()})
+            self._sync_locked()
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self.sync()
+        self._handle.close()
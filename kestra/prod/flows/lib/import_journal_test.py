@@ -0,0 +1,63 @@
+"""
+Tests für lib/import_journal.py.
+
+# python -m pytest lib/import_journal_test.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lib.import_journal import ImportJournal  # noqa: E402
+
+
+def _write_crashed_run(path: Path) -> None:
+    journal = ImportJournal(path, 'run-1')
+    for key in (1, 2, 3):
+        journal.record('dog', key, 'created', f'doc-{key}')
+    journal.close()
+    # Absturz mitten im Schreiben des nächsten Eintrags
+    with path.open('a', encoding='utf-8') as handle:
+        handle.write('{"kind":"dog","key":"4","outc')
+
+
+def test_resume_after_torn_line_keeps_new_entries(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    _write_crashed_run(path)
+
+    journal = ImportJournal(path, 'run-1', resume=True)
+    assert journal.resumed
+    assert journal.completed('dog') == 3
+    journal.record('dog', 4, 'created', 'doc-4')
+    journal.close()
+
+    resumed = ImportJournal(path, 'run-1', resume=True)
+    assert resumed.is_done('dog', 4)
+    assert resumed.get('dog', 4)['documentId'] == 'doc-4'
+    assert resumed.completed('dog') == 4
+    resumed.close()
+
+
+def test_finish_after_torn_line_is_not_lost(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    _write_crashed_run(path)
+
+    journal = ImportJournal(path, 'run-1', resume=True)
+    journal.finish()
+    journal.close()
+
+    # Der vorige Lauf gilt als beendet: --resume beginnt von vorn
+    assert not ImportJournal(path, 'run-1', resume=True).resumed
+
+
+def test_resume_without_torn_line_keeps_all_entries(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = ImportJournal(path, 'run-1')
+    journal.record('dog', 1, 'created', 'doc-1')
+    journal.record('dog', 2, 'failed')
+    journal.close()
+
+    resumed = ImportJournal(path, 'run-1', resume=True)
+    assert resumed.is_done('dog', 1)
+    assert not resumed.is_done('dog', 2)
+    resumed.close()
@@ -0,0 +1,245 @@
+"""
+Read-Through-Cache für idempotente GraphQL-Queries.
+
+Während eines Imports werden dieselben Breeder-, Besitzer- und Elterntiere immer
+wieder per cId nachgeschlagen. Der Cache hält die Antworten von Queries (Schlüssel:
+Query und Variablen) mit Größen- (LRU) und Zeitgrenze (TTL). Gleichzeitige identische
+Abfragen werden nur einmal gesendet (Single-Flight); die übrigen Worker warten auf
+das Ergebnis.
+
+Mutationen invalidieren die Einträge derselben Entität (Hund, Breeder, User), deren
+Variablen einen Wert aus der Mutation enthalten (z. B. cId oder Zuchtbuchnummer) oder
+deren Ergebnis eine der betroffenen documentIds enthält; Listen ohne Filterwert
+(seitenweise Indizes) werden immer verworfen. Unbekannte Mutationen leeren den
+gesamten Cache. Zurückgegebene Antworten werden geteilt und dürfen nicht verändert
+werden.
+"""
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+# Wurzelfelder der Queries bzw. Mutationen je Entität
+QUERY_ROOTS = {
+    'hzdPluginDog': 'dog',
+    'hzdPluginBreeder': 'breeder',
+    'usersPermissionsUser': 'user',
+}
+MUTATION_ROOTS = {
+    'HzdPluginDog': 'dog',
+    'HzdPluginBreeder': 'breeder',
+    'UsersPermissionsUser': 'user',
+}
+USER_MUTATIONS = ('register', 'updateUserAdmin')
+
+# Variablen, die nur die Seite auswählen und keinen Datensatz bezeichnen
+PAGINATION_VARIABLES = ('page', 'pageSize', 'start', 'limit')
+
+_OPERATION = re.compile(r'^\s*(query|mutation)\b')
+_QUERY_ROOT = re.compile(r'\b(hzdPluginDog|hzdPluginBreeder|usersPermissionsUser)s?(?:_connection)?\s*[({]')
+_MUTATION_ROOT = re.compile(r'\b(?:create|update|delete)(HzdPluginDog|HzdPluginBreeder|UsersPermissionsUser)\s*\(')
+_USER_MUTATION = re.compile(r'\b(?:register|updateUserAdmin)\s*\(')
+
+# Tag für Einträge, die bei jeder Mutation der Entität verworfen werden
+ANY = '*'
+
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def is_query(query: str) -> bool:
+    match = _OPERATION.match(query)
+    return match is None or match.group(1) == 'query'
+
+
+def query_entities(query: str) -> Set[str]:
+    return {QUERY_ROOTS[name] for name in _QUERY_ROOT.findall(query)}
+
+
+def mutation_entities(query: str) -> Optional[Set[str]]:
+    """Betroffene Entitäten einer Mutation; None, wenn sie sich nicht zuordnen lässt."""
+    entities = {MUTATION_ROOTS[name] for name in _MUTATION_ROOT.findall(query)}
+    if _USER_MUTATION.search(query):
+        entities.add('user')
+    return entities or None
+
+
+def _scalars(value: Any) -> Iterator[Any]:
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _scalars(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _scalars(item)
+    elif value is not None and not isinstance(value, bool):
+        yield value
+
+
+def _document_ids(value: Any) -> Iterator[str]:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == 'documentId' and isinstance(item, str):
+                yield item
+            else:
+                yield from _document_ids(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _document_ids(item)
+
+
+class _Entry:
+    __slots__ = ('value', 'expires', 'tags')
+
+    def __init__(self, value: Any, expires: float, tags: Set[Tuple[str, Any]]):
+        self.value = value
+        self.expires = expires
+        self.tags = tags
+
+
+class QueryCache:
+    """LRU-Cache mit TTL, Single-Flight und Invalidierung je Entität (thread-sicher)."""
+
+    def __init__(self, ttl: float, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._tagged: Dict[Tuple[str, Any], Set[str]] = {}
+        self._in_flight: Dict[str, Future] = {}
+        # Je Entität bei jeder Invalidierung erhöht; Antworten laufender Abfragen werden dann nicht gespeichert
+        self._generation: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.invalidated = 0
+
+    @staticmethod
+    def key(query: str, variables: Optional[Dict[str, Any]]) -> str:
+        return json.dumps([' '.join(query.split()), variables or {}], sort_keys=True, default=str)
+
+    def get_or_load(self, query: str, variables: Optional[Dict[str, Any]], load: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Antwort aus dem Cache oder über load(); gleichzeitige gleiche Aufrufe teilen sich einen load()."""
+        entities = query_entities(query)
+        if not entities:
+            return load()
+        key = self.key(query, variables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            if entry is not None:
+                self._drop(key)
+            waiting = self._in_flight.get(key)
+            if waiting is not None:
+                self.shared += 1
+            else:
+                self.misses += 1
+                future: Future = Future()
+                self._in_flight[key] = future
+                generation = self._generations(entities)
+        if waiting is not None:
+            return waiting.result()
+
+        try:
+            value = load()
+        except BaseException as exc:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._in_flight.pop(key, None)
+            # Fehlerhafte Antworten und Antworten, die eine Mutation überholt hat, nicht speichern
+            if generation == self._generations(entities) and not value.get('errors'):
+                self._store(key, value, self._tags(entities, variables, value))
+        future.set_result(value)
+        return value
+
+    def invalidate(self, query: str, variables: Optional[Dict[str, Any]]) -> None:
+        """Verwirft die von einer Mutation betroffenen Einträge."""
+        entities = mutation_entities(query)
+        if entities is None:
+            self.clear()
+            return
+        with self._lock:
+            self._bump(entities)
+            values = set(_scalars(variables or {}))
+            keys: Set[str] = set()
+            for entity in entities:
+                keys |= self._tagged.get((entity, ANY), set())
+                for value in values:
+                    keys |= self._tagged.get((entity, value), set())
+            for key in keys:
+                self._drop(key)
+            self.invalidated += len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bump(QUERY_ROOTS.values())
+            self.invalidated += len(self._entries)
+            self._entries.clear()
+            self._tagged.clear()
+
+    def _generations(self, entities: Set[str]) -> Tuple[int, ...]:
+        return tuple(self._generation.get(entity, 0) for entity in sorted(entities))
+
+    def _bump(self, entities: Iterable[str]) -> None:
+        for entity in entities:
+            self._generation[entity] = self._generation.get(entity, 0) + 1
+
+    def _tags(self, entities: Set[str], variables: Optional[Dict[str, Any]], value: Dict[str, Any]) -> Set[Tuple[str, Any]]:
+        filters = {
+            item
+            for name, variable in (variables or {}).items()
+            if name not in PAGINATION_VARIABLES
+            for item in _scalars(variable)
+        }
+        values: Set[Any] = filters | set(_document_ids(value.get('data')))
+        tags = {(entity, item) for entity in entities for item in values}
+        if not filters:
+            # Seitenweise Listen und Indizes ändern sich mit jedem neuen Datensatz
+            tags |= {(entity, ANY) for entity in entities}
+        return tags
+
+    def _store(self, key: str, value: Any, tags: Set[Tuple[str, Any]]) -> None:
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = _Entry(value, time.monotonic() + self.ttl, tags)
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'shared': self.shared,
+                'invalidated': self.invalidated,
+            }
+
+    def format_summary(self) -> str:
+        s = self.snapshot()
+        lookups = s['hits'] + s['misses'] + s['shared']
+        rate = (s['hits'] + s['shared']) / lookups * 100 if lookups else 0.0
+        return (
+            f'Query-Cache: {s["hits"]} Treffer, {s["shared"]} geteilt, {s["misses"]} Anfragen '
+            f'({rate:.0f} % eingespart), {s["invalidated"]} invalidiert, {s["entries"]} Einträge'
+        )
@@ -0,0 +1,137 @@
+"""
+Laufzeitmessung der Import-Phasen.
+
+Jede Phase (CSV-Parsing, Lookups, Mutationen, Pausen, ...) und jede GraphQL-Operation
+wird mit Anzahl, Summe, p50, p95 und Maximum erfasst. Die Zusammenfassung wird als
+Tabelle ausgegeben und kann als JSON für die Kestra-Outputs geschrieben werden, sodass
+Regressionen von Lauf zu Lauf sichtbar werden.
+
+Je Phase werden nur Anzahl, Summe und Maximum sowie eine Stichprobe fester Größe
+(Reservoir Sampling) gehalten, damit der Speicher auch bei Millionen Zeilen nicht wächst;
+bis RESERVOIR_SIZE Messungen sind die Perzentile exakt, darüber geschätzt.
+"""
+import json
+import math
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+# Gehaltene Messungen je Phase für p50/p95
+RESERVOIR_SIZE = 1024
+
+_OPERATION_NAME = re.compile(r'^\s*(query|mutation)\s+(\w+)')
+
+
+def operation_name(query: str) -> str:
+    """Name einer GraphQL-Operation ("query DogByCId(...)" -> "DogByCId")."""
+    match = _OPERATION_NAME.match(query)
+    return match.group(2) if match else 'anonymous'
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-Rank-Perzentil einer aufsteigend sortierten Liste."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class _Stage:
+    __slots__ = ('count', 'total', 'max', 'reservoir')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.reservoir: List[float] = []
+
+
+class StageTimings:
+    """Thread-sichere Sammlung von Laufzeiten je Phase (Speicher je Phase begrenzt)."""
+
+    def __init__(self, reservoir_size: int = RESERVOIR_SIZE) -> None:
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _Stage] = {}
+        self.reservoir_size = max(1, reservoir_size)
+        # Fester Seed: gleiche Messreihen ergeben gleiche Stichproben
+        self._random = random.Random(0)
+        self.started = time.perf_counter()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = _Stage()
+            entry.count += 1
+            entry.total += seconds
+            entry.max = max(entry.max, seconds)
+            if len(entry.reservoir) < self.reservoir_size:
+                entry.reservoir.append(seconds)
+            else:
+                # Algorithmus R: jede Messung ist mit gleicher Wahrscheinlichkeit in der Stichprobe
+                slot = self._random.randrange(entry.count)
+                if slot < self.reservoir_size:
+                    entry.reservoir[slot] = seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def sleep(self, seconds: float, stage: str = 'sleep') -> None:
+        """time.sleep mit Erfassung der bewussten Pausen."""
+        if seconds <= 0:
+            return
+        with self.stage(stage):
+            time.sleep(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            stages = {
+                stage: (entry.count, entry.total, entry.max, sorted(entry.reservoir))
+                for stage, entry in self._stages.items()
+            }
+        return {
+            stage: {
+                'count': count,
+                'total': total,
+                'p50': _percentile(values, 0.50),
+                'p95': _percentile(values, 0.95),
+                'max': maximum,
+            }
+            for stage, (count, total, maximum, values) in sorted(stages.items())
+        }
+
+    def format_table(self) -> str:
+        rows = self.summary()
+        width = max([len('Phase')] + [len(stage) for stage in rows])
+        lines = [
+            f'{"Phase":<{width}} {"Anzahl":>8} {"Summe s":>10} {"p50 ms":>9} {"p95 ms":>9} {"max ms":>9}',
+        ]
+        for stage, row in rows.items():
+            lines.append(
+                f'{stage:<{width}} {row["count"]:>8} {row["total"]:>10.3f} '
+                f'{row["p50"] * 1000:>9.1f} {row["p95"] * 1000:>9.1f} {row["max"] * 1000:>9.1f}'
+            )
+        lines.append(f'Gesamtlaufzeit: {time.perf_counter() - self.started:.3f} s')
+        return '\n'.join(lines)
+
+    def write_json(self, path: Union[str, Path], extra: Optional[Dict[str, Any]] = None) -> None:
+        """Schreibt die Zusammenfassung (Sekunden) und optionale Zusatzdaten, z. B. die Import-Statistik."""
+        document: Dict[str, Any] = {
+            'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'wallTime': time.perf_counter() - self.started,
+            'stages': self.summary(),
+        }
+        if extra:
+            document.update(extra)
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(document, handle, ensure_ascii=False, indent=2)
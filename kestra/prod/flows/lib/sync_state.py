@@ -0,0 +1,148 @@
+"""
+Persistenter Sync-Status für die Chromosoft-Importe.
+
+Speichert pro Entität (dog, dog_parents, breeder, user) und Chromosoft-ID die Strapi-documentId,
+den Hash des zuletzt gesendeten Payloads und den Zeitpunkt der Synchronisation.
+Die SQLite-Datei kann zwischen Kestra-Ausführungen als Namespace-File erhalten
+bleiben, sodass Folgeläufe nur noch die Änderungen an Strapi senden. Hunde- und
+Mitglieder-Import teilen sich die Einträge; für Breeder hashen beide breeder_payload().
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+KINDS = ('dog', 'dog_parents', 'breeder', 'user')
+
+# Anzahl Schreibvorgänge, nach denen automatisch committet wird
+COMMIT_EVERY = 200
+
+
+def payload_hash(payload: Dict[str, Any]) -> str:
+    """Kanonischer Hash eines Payloads (unabhängig von der Reihenfolge der Schlüssel)."""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def breeder_payload(kennel_name: Optional[str]) -> Dict[str, Any]:
+    """Gemeinsame Form des Breeder-Payloads für payload_hash (nur der kennelName)."""
+    return {'kennelName': kennel_name}
+
+
+@dataclass
+class SyncState:
+    document_id: str
+    payload_hash: Optional[str] = None
+    synced_at: Optional[str] = None
+
+
+class SyncStateStore:
+    """SQLite-Ablage des Sync-Status; Lesezugriffe laufen über einen In-Memory-Spiegel."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sync_state (
+                kind TEXT NOT NULL,
+                c_id INTEGER NOT NULL,
+                document_id TEXT NOT NULL,
+                payload_hash TEXT,
+                synced_at TEXT NOT NULL,
+                PRIMARY KEY (kind, c_id)
+            )
+            """
+        )
+        self._conn.commit()
+        self._uncommitted = 0
+        self._states: Dict[str, Dict[int, SyncState]] = {kind: {} for kind in KINDS}
+        for kind, c_id, document_id, p_hash, synced_at in self._conn.execute(
+            'SELECT kind, c_id, document_id, payload_hash, synced_at FROM sync_state'
+        ):
+            if kind in self._states:
+                self._states[kind][c_id] = SyncState(document_id, p_hash, synced_at)
+
+    def __enter__(self) -> 'SyncStateStore':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(len(states) for states in self._states.values())
+
+    def get(self, kind: str, c_id: Optional[int]) -> Optional[SyncState]:
+        if c_id is None:
+            return None
+        return self._states[kind].get(c_id)
+
+    def document_id(self, kind: str, c_id: Optional[int]) -> Optional[str]:
+        state = self.get(kind, c_id)
+        return state.document_id if state else None
+
+    def is_unchanged(self, kind: str, c_id: Optional[int], document_id: Optional[str], p_hash: str) -> bool:
+        """True, wenn für dieselbe documentId zuletzt genau dieser Payload-Hash synchronisiert wurde."""
+        state = self.get(kind, c_id)
+        return bool(state and document_id and state.document_id == document_id and state.payload_hash == p_hash)
+
+    def is_unchanged_since(self, kind: str, c_id: Optional[int], document_id: Optional[str], p_hash: str,
+                           updated_at: Optional[str]) -> bool:
+        """
+        Wie is_unchanged, zusätzlich darf die Entität in Strapi seit dem Sync nicht mehr geändert
+        worden sein (updatedAt aus Strapi, ISO 8601). Ohne updatedAt immer False.
+        """
+        state = self.get(kind, c_id)
+        if not updated_at or not state or not state.synced_at or not self.is_unchanged(kind, c_id, document_id, p_hash):
+            return False
+        try:
+            updated = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
+            synced = datetime.fromisoformat(state.synced_at)
+        except ValueError:
+            return False
+        # synced_at ist auf Sekunden gekürzt und wird erst nach der Antwort von Strapi gesetzt
+        return updated < synced + timedelta(seconds=1)
+
+    def set(self, kind: str, c_id: Optional[int], document_id: Optional[str], p_hash: Optional[str] = None) -> None:
+        """Merkt sich documentId (und optional den Payload-Hash) einer Entität."""
+        if c_id is None or not document_id:
+            return
+        synced_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        with self._lock:
+            previous = self._states[kind].get(c_id)
+            if p_hash is None and previous and previous.document_id == document_id:
+                # Nur documentId bekannt: vorhandenen Hash nicht verwerfen
+                p_hash = previous.payload_hash
+            self._states[kind][c_id] = SyncState(document_id, p_hash, synced_at)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sync_state (kind, c_id, document_id, payload_hash, synced_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (kind, c_id, document_id, p_hash, synced_at),
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= COMMIT_EVERY:
+                self._conn.commit()
+                self._uncommitted = 0
+
+    def forget(self, kind: str, c_id: Optional[int]) -> None:
+        """Entfernt einen (z. B. veralteten) Eintrag."""
+        if c_id is None:
+            return
+        with self._lock:
+            if self._states[kind].pop(c_id, None) is not None:
+                self._conn.execute('DELETE FROM sync_state WHERE kind = ? AND c_id = ?', (kind, c_id))
+                self._uncommitted += 1
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        self.commit()
+        self._conn.close()
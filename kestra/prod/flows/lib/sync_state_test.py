@@ -0,0 +1,44 @@
+"""
+Tests für lib/sync_state.py.
+
+# python -m pytest lib/sync_state_test.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lib.sync_state import SyncStateStore, breeder_payload, payload_hash  # noqa: E402
+
+
+def _store_with_user(tmp_path: Path) -> SyncStateStore:
+    store = SyncStateStore(tmp_path / 'state.db')
+    store.set('user', 1001, 'doc-1', payload_hash({'city': 'Berlin'}))
+    store.get('user', 1001).synced_at = '2026-10-18T10:00:00+00:00'
+    return store
+
+
+def test_unchanged_since_sync(tmp_path):
+    with _store_with_user(tmp_path) as store:
+        p_hash = payload_hash({'city': 'Berlin'})
+        # Eigenes Update in derselben Sekunde wie der (gekürzte) Sync-Zeitpunkt
+        assert store.is_unchanged_since('user', 1001, 'doc-1', p_hash, '2026-10-18T10:00:00.850Z')
+        assert store.is_unchanged_since('user', 1001, 'doc-1', p_hash, '2026-10-17T08:00:00.000Z')
+
+
+def test_changed_in_strapi_or_payload(tmp_path):
+    with _store_with_user(tmp_path) as store:
+        p_hash = payload_hash({'city': 'Berlin'})
+        # In Strapi nach dem Sync geändert
+        assert not store.is_unchanged_since('user', 1001, 'doc-1', p_hash, '2026-10-18T10:00:05.000Z')
+        assert not store.is_unchanged_since('user', 1001, 'doc-1', p_hash, None)
+        assert not store.is_unchanged_since('user', 1001, 'doc-1', payload_hash({'city': 'Hamburg'}), '2026-10-18T09:00:00Z')
+        assert not store.is_unchanged_since('user', 1001, 'doc-2', p_hash, '2026-10-18T09:00:00Z')
+
+
+def test_breeder_hash_is_shared_between_importers(tmp_path):
+    with SyncStateStore(tmp_path / 'state.db') as store:
+        store.set('breeder', 7, 'breeder-7', payload_hash(breeder_payload('vom Hof')))
+    # Neuer Lauf mit derselben Datei: Eintrag aus SQLite, gleicher Hash für beide Importe
+    with SyncStateStore(tmp_path / 'state.db') as store:
+        assert store.is_unchanged('breeder', 7, 'breeder-7', payload_hash(breeder_payload('vom Hof')))
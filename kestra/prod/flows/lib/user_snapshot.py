@@ -0,0 +1,129 @@
+"""
+Lokaler Stand der Website-User für inkrementelle Mitglieder-Importe.
+
+Die Datei enthält alle User (inklusive Breeder-Info, also das Ergebnis von
+fetch_all_users_with_breeders) aus dem letzten Lauf sowie die Wasserstände:
+Anzahl und neuestes updatedAt der User bzw. Breeder zum Zeitpunkt des Abrufs.
+WebsiteClient.fetch_all_users_incremental verwendet den Stand unverändert, wenn die
+Probe-Abfragen dieselben Werte liefern, und lädt sonst nur die seither geänderten
+User nach. Wie die SQLite-Datei von --state-db kann die Datei als Kestra-Namespace-File
+zwischen den Läufen erhalten bleiben.
+
+Gespeichert wird kompakt als gzip-komprimiertes JSON mit einer Liste je User (die
+Feldnamen stehen einmal im Kopf), damit auch 10k User schnell geladen sind. JSON statt
+Pickle, weil die Datei im gemeinsamen Speicher liegt und beim Laden keinen Code
+ausführen darf; eine beschädigte oder fremde Datei gilt als fehlender Stand.
+"""
+import gzip
+import json
+import os
+from dataclasses import fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from lib.website_user import CollectionProbe, WebsiteUser
+
+# Bei inkompatiblen Änderungen erhöhen; ältere Dateien werden dann ignoriert
+SNAPSHOT_VERSION = 3
+
+# Felder, die nur über die Breeder-Relation gesetzt werden
+BREEDER_ATTRIBUTES = ('cFlagBreeder', 'IsActiveBreeder', 'breederDocumentId', 'kennelName')
+
+
+class UserSnapshot:
+    """User nach documentId mit Wasserständen; load() beim Erzeugen, save() schreibt atomar."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.users: Dict[str, WebsiteUser] = {}
+        self.users_watermark: Optional[str] = None
+        self.breeders_watermark: Optional[str] = None
+        self.users_total: Optional[int] = None
+        self.breeders_total: Optional[int] = None
+        self.load()
+
+    def load(self) -> bool:
+        """Liest die Datei; False (leerer Stand), wenn sie fehlt, unlesbar oder veraltet ist."""
+        if not self.path.is_file():
+            return False
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as handle:
+                document = json.load(handle)
+            if not isinstance(document, dict) or document.get('version') != SNAPSHOT_VERSION:
+                return False
+            names = document['fields']
+            if any(len(row) != len(names) for row in document['users']):
+                raise ValueError('Zeilenlänge passt nicht zu den Feldnamen')
+            current = [f.name for f in fields(WebsiteUser)]
+            if names == current:
+                users = [WebsiteUser(*row) for row in document['users']]
+            else:
+                # Neue Felder von WebsiteUser bleiben leer, entfallene werden ignoriert
+                known = set(current)
+                users = [
+                    WebsiteUser(**{key: value for key, value in zip(names, row) if key in known})
+                    for row in document['users']
+                ]
+        except (OSError, EOFError, ValueError, TypeError, KeyError) as e:
+            # Auch ein gültiges JSON mit falschem Aufbau gilt als fehlender Stand
+            print(f"User-Snapshot {self.path} nicht lesbar ({e}), lade alle User")
+            return False
+        self.users = {user.documentId: user for user in users}
+        self.users_watermark = document.get('usersWatermark')
+        self.breeders_watermark = document.get('breedersWatermark')
+        self.users_total = document.get('usersTotal')
+        self.breeders_total = document.get('breedersTotal')
+        return True
+
+    def matches(self, users_probe: CollectionProbe, breeders_probe: CollectionProbe) -> bool:
+        """True, wenn sich laut Probe seit dem Speichern weder User noch Breeder geändert haben."""
+        return (
+            self.users_watermark is not None
+            and len(self.users) == self.users_total == users_probe.total
+            and self.users_watermark == users_probe.updatedAt
+            and self.breeders_total == breeders_probe.total
+            and self.breeders_watermark == breeders_probe.updatedAt
+        )
+
+    def values(self) -> List[WebsiteUser]:
+        return list(self.users.values())
+
+    def replace(self, users: Iterable[WebsiteUser]) -> None:
+        self.users = {user.documentId: user for user in users if user.documentId}
+
+    def merge(self, changed: Iterable[WebsiteUser]) -> None:
+        """Übernimmt geänderte User; ein Breeder gehört danach nur noch zu seinem neuen User."""
+        for user in changed:
+            if not user.documentId:
+                continue
+            if user.breederDocumentId:
+                for other in self.users.values():
+                    if other.documentId != user.documentId and other.breederDocumentId == user.breederDocumentId:
+                        for attribute in BREEDER_ATTRIBUTES:
+                            setattr(other, attribute, getattr(WebsiteUser, attribute))
+            self.users[user.documentId] = user
+
+    def update_watermarks(self, users_probe: CollectionProbe, breeders_probe: CollectionProbe) -> None:
+        self.users_watermark = users_probe.updatedAt
+        self.breeders_watermark = breeders_probe.updatedAt
+        self.users_total = users_probe.total
+        self.breeders_total = breeders_probe.total
+
+    def save(self) -> None:
+        names = [f.name for f in fields(WebsiteUser)]
+        document: Dict[str, Any] = {
+            'version': SNAPSHOT_VERSION,
+            'savedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'usersWatermark': self.users_watermark,
+            'breedersWatermark': self.breeders_watermark,
+            'usersTotal': self.users_total,
+            'breedersTotal': self.breeders_total,
+            'fields': names,
+            'users': [[getattr(user, name) for name in names] for user in self.users.values()],
+        }
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        # Stufe 1: kaum größer als Stufe 9, aber deutlich schneller
+        with gzip.open(tmp, 'wt', encoding='utf-8', compresslevel=1) as handle:
+            json.dump(document, handle, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, self.path)
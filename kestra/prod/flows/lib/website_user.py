@@ -1,8 +1,58 @@
 import re
+import threading
 import requests
-from typing import Dict, Optional, Any, List
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Dict, Optional, Any, List
 from dataclasses import dataclass, field
 
+from lib.stage_timings import StageTimings, operation_name
+
+if TYPE_CHECKING:
+    from lib.user_snapshot import UserSnapshot
+
+# Offene Keep-Alive-Verbindungen zu Strapi (gemeinsam für alle Threads)
+DEFAULT_POOL_SIZE = 10
+
+# Seitengröße (maxLimit in backend/config/api.ts) und parallele Seitenabrufe in _fetch_pages
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_FETCH_WORKERS = 8
+
+# Felder eines Users in fetch_all_users_with_breeders / fetch_users_changed_since
+USER_FIELDS = """
+                    documentId
+                    cEmail
+                    cId
+                    blocked
+                    firstName
+                    lastName
+                    title
+                    sex
+                    address1
+                    zip
+                    city
+                    region
+                    countryCode
+                    phone
+                    membershipNumber
+                    dateOfBirth
+                    dateOfDeath
+                    memberSince
+                    cancellationOn
+                    updatedAt
+"""
+
+# Breeder-Relation eines Users in fetch_all_users_with_breeders / fetch_users_changed_since;
+# nach Anlage sortiert, damit wie beim früheren Abgleich über alle Breeder der zuletzt angelegte gilt
+USER_BREEDER_FIELDS = """
+                    breeders(sort: "createdAt:asc") {
+                        documentId
+                        IsActive
+                        kennelName
+                    }
+"""
+
 @dataclass
 class Breeder:
     documentId: str
@@ -11,6 +61,11 @@ class Breeder:
     member_documentId: str = ""
     kennelName: Optional[str] = None
 
+@dataclass
+class CollectionProbe:
+    total: int
+    updatedAt: Optional[str] = None
+
 @dataclass
 class WebsiteUser:
     documentId: str
@@ -34,26 +89,72 @@ class WebsiteUser:
     dateOfDeath: Optional[str] = None
     memberSince: Optional[str] = None
     cancellationOn: Optional[str] = None
+    updatedAt: Optional[str] = None
     cFlagBreeder: bool = False
     IsActiveBreeder: bool = False
     breederDocumentId: Optional[str] = None
     kennelName: Optional[str] = None
 
 class WebsiteClient:
-    def __init__(self, api_url: str, api_token: Optional[str] = None):
+    def __init__(
+        self,
+        api_url: str,
+        api_token: Optional[str] = None,
+        timings: Optional[StageTimings] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = 60,
+        fetch_workers: int = DEFAULT_FETCH_WORKERS,
+    ):
         self.api_url = api_url
-        self.headers = {'Content-Type': 'application/json'}
+        self.timeout = timeout
+        # Nicht mehr parallele Seitenabrufe als Verbindungen im Pool
+        self.fetch_workers = max(1, min(fetch_workers, pool_size))
+        self.headers = {
+            'Content-Type': 'application/json',
+            # Antworten (v. a. die großen Seiten von _fetch_pages) komprimiert übertragen; requests entpackt sie
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
         if api_token:
             self.headers['Authorization'] = f'Bearer {api_token}'
+        # Optional: Laufzeit je GraphQL-Operation erfassen
+        self.timings = timings
+        # Ein Verbindungspool für alle Threads; wer keinen freien Platz bekommt, wartet (pool_block),
+        # statt eine zusätzliche Verbindung ohne Keep-Alive aufzubauen
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), pool_block=True)
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """Session des aktuellen Threads (Cookies/Header getrennt, Verbindungen aus dem gemeinsamen Pool)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', self._adapter)
+            session.mount('https://', self._adapter)
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    def close(self) -> None:
+        """Schließt alle Verbindungen des Pools."""
+        self._adapter.close()
+
+    def __enter__(self) -> 'WebsiteClient':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def _post(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        stage = self.timings.stage(f'graphql.{operation_name(query)}') if self.timings else nullcontext()
         try:
-            response = requests.post(
-                self.api_url,
-                json={'query': query, 'variables': variables or {}},
-                headers=self.headers,
-                timeout=60
-            )
+            with stage:
+                response = self.session.post(
+                    self.api_url,
+                    json={'query': query, 'variables': variables or {}},
+                    timeout=self.timeout
+                )
             if response.status_code == 200:
                 result = response.json()
                 if 'errors' in result:
@@ -67,126 +168,234 @@ class WebsiteClient:
             print(f"Request Exception: {e}")
             return None
 
-    def fetch_all_users(self) -> List[WebsiteUser]:
-        all_users = []
-        page = 1
-        page_size = 100
-        has_more = True
-
-        print("Fetching all users from GraphQL...")
-        
-        while has_more:
-            query = """
-            query GetAllUsers($page: Int!, $pageSize: Int!) {
-                usersPermissionsUsers(pagination: { page: $page, pageSize: $pageSize }) {
-                    documentId
-                    cEmail
-                    cId
-                    blocked
-                    firstName
-                    lastName
-                    title
-                    sex
-                    address1
-                    zip
-                    city
-                    region
-                    countryCode
-                    phone
-                    membershipNumber
-                    dateOfBirth
-                    dateOfDeath
-                    memberSince
-                    cancellationOn
-                }
-            }
-            """
-            data = self._post(query, {'page': page, 'pageSize': page_size})
-            if not data:
+    def _fetch_pages(
+        self,
+        query: str,
+        root: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        variables: Optional[Dict[str, Any]] = None,
+        allow_partial: bool = True,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Alle Knoten einer _connection-Query: Seite 1 liefert pageInfo.pageCount, die übrigen
+        Seiten werden parallel (höchstens fetch_workers gleichzeitig) geladen und in
+        Seitenreihenfolge zusammengesetzt. Schlägt eine Seite fehl, endet das Ergebnis wie
+        bisher vor dieser Seite (mit allow_partial=False: None).
+        """
+        def fetch(page: int) -> Optional[Dict[str, Any]]:
+            data = self._post(query, {**(variables or {}), 'page': page, 'pageSize': page_size})
+            return data.get(root) if data else None
+
+        first = fetch(1)
+        if not first:
+            return [] if allow_partial else None
+        page_info = first.get('pageInfo') or {}
+        page_count = page_info.get('pageCount') or 1
+        print(f"  {page_info.get('total', len(first.get('nodes') or []))} Einträge auf {page_count} Seiten")
+        pages = [first]
+        if page_count > 1:
+            workers = min(self.fetch_workers, page_count - 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pages.extend(executor.map(fetch, range(2, page_count + 1)))
+
+        nodes: List[Dict[str, Any]] = []
+        for page, connection in enumerate(pages, start=1):
+            if connection is None:
+                print(f"  Seite {page} von {page_count} konnte nicht geladen werden, Abbruch nach {len(nodes)} Einträgen")
+                if not allow_partial:
+                    return None
                 break
+            nodes.extend(connection.get('nodes') or [])
+        return nodes
 
-            users_data = data.get('usersPermissionsUsers', [])
-            if not users_data:
-                has_more = False
-            else:
-                for u in users_data:
-                    user = WebsiteUser(
-                        documentId=u.get('documentId'),
-                        username=u.get('username'),
-                        email=u.get('email'),
-                        cEmail=u.get('cEmail'),
-                        cId=u.get('cId'),
-                        blocked=u.get('blocked', False),
-                        firstName=u.get('firstName'),
-                        lastName=u.get('lastName'),
-                        title=u.get('title'),
-                        sex=u.get('sex'),
-                        address1=u.get('address1'),
-                        zip=u.get('zip'),
-                        city=u.get('city'),
-                        region=u.get('region'),
-                        countryCode=u.get('countryCode'),
-                        phone=u.get('phone'),
-                        membershipNumber=u.get('membershipNumber'),
-                        dateOfBirth=u.get('dateOfBirth'),
-                        dateOfDeath=u.get('dateOfDeath'),
-                        memberSince=u.get('memberSince'),
-                        cancellationOn=u.get('cancellationOn')
-                    )
-                    all_users.append(user)
-                    
-                print(f"  Fetched {len(users_data)} users (Total: {len(all_users)})")
-                if len(users_data) < page_size:
-                    has_more = False
-                else:
-                    page += 1
+    @staticmethod
+    def _user_from_node(u: Dict[str, Any]) -> WebsiteUser:
+        user = WebsiteUser(
+            documentId=u.get('documentId'),
+            username=u.get('username'),
+            email=u.get('email'),
+            cEmail=u.get('cEmail'),
+            cId=u.get('cId'),
+            blocked=u.get('blocked', False),
+            firstName=u.get('firstName'),
+            lastName=u.get('lastName'),
+            title=u.get('title'),
+            sex=u.get('sex'),
+            address1=u.get('address1'),
+            zip=u.get('zip'),
+            city=u.get('city'),
+            region=u.get('region'),
+            countryCode=u.get('countryCode'),
+            phone=u.get('phone'),
+            membershipNumber=u.get('membershipNumber'),
+            dateOfBirth=u.get('dateOfBirth'),
+            dateOfDeath=u.get('dateOfDeath'),
+            memberSince=u.get('memberSince'),
+            cancellationOn=u.get('cancellationOn'),
+            updatedAt=u.get('updatedAt')
+        )
+        # Nur bei fetch_all_users_with_breeders/fetch_users_changed_since abgefragt. Bei mehreren
+        # Breedern gilt wie beim früheren Abgleich (letzter Treffer je member) der zuletzt angelegte
+        breeders = u.get('breeders') or []
+        if breeders:
+            breeder = breeders[-1]
+            user.cFlagBreeder = True
+            user.IsActiveBreeder = breeder.get('IsActive', False)
+            user.breederDocumentId = breeder.get('documentId')
+            user.kennelName = breeder.get('kennelName')
+        return user
+
+    def fetch_all_users_with_breeders(self) -> List[WebsiteUser]:
+        """
+        Alle User mit der Breeder-Relation in derselben Abfrage: cFlagBreeder, IsActiveBreeder,
+        breederDocumentId und kennelName sind bereits gesetzt (kein eigener Abruf der Breeder
+        und kein Abgleich per member.documentId).
+        """
+        print("Fetching all users with breeders from GraphQL...")
+        query = """
+        query GetAllUsersWithBreeders($page: Int!, $pageSize: Int!) {
+            usersPermissionsUsers_connection(pagination: { page: $page, pageSize: $pageSize }) {
+                nodes {""" + USER_FIELDS + USER_BREEDER_FIELDS + """                }
+                pageInfo {
+                    total
+                    pageCount
+                }
+            }
+        }
+        """
+        all_users = [self._user_from_node(u) for u in self._fetch_pages(query, 'usersPermissionsUsers_connection')]
+        print(f"  Fetched {len(all_users)} users ({sum(u.cFlagBreeder for u in all_users)} breeders)")
         return all_users
-        
-    def fetch_all_breeders(self) -> Dict[str, Dict[str, Any]]:
-        # Similar logic for breeders
-        breeder_map = {}
-        page = 1
-        page_size = 100
-        has_more = True
-        
-        print("Fetching all breeders from GraphQL...")
-        while has_more:
-            query = """
-            query GetAllBreeders($page: Int!, $pageSize: Int!) {
-                hzdPluginBreeders(pagination: { page: $page, pageSize: $pageSize }) {
+
+    def probe_collection(self, root: str) -> Optional[CollectionProbe]:
+        """Anzahl und neuestes updatedAt einer Collection (z. B. usersPermissionsUsers) mit einer kleinen Abfrage."""
+        query = """
+        query ProbeCollection {
+            %s_connection(sort: "updatedAt:desc", pagination: { page: 1, pageSize: 1 }) {
+                nodes {
+                    updatedAt
+                }
+                pageInfo {
+                    total
+                }
+            }
+        }
+        """ % root
+        data = self._post(query)
+        if not data:
+            return None
+        connection = data.get(f'{root}_connection') or {}
+        nodes = connection.get('nodes') or []
+        return CollectionProbe(
+            total=(connection.get('pageInfo') or {}).get('total') or 0,
+            updatedAt=nodes[0].get('updatedAt') if nodes else None,
+        )
+
+    def fetch_breeders_changed_since(self, ts: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Breeder (documentId, createdAt), die seit ts (updatedAt, inklusive) angelegt oder geändert
+        wurden. None, wenn nicht alle Seiten geladen werden konnten.
+        """
+        query = """
+        query GetBreedersChangedSince($ts: DateTime!, $page: Int!, $pageSize: Int!) {
+            hzdPluginBreeders_connection(filters: { updatedAt: { gte: $ts } }, pagination: { page: $page, pageSize: $pageSize }) {
+                nodes {
                     documentId
-                    IsActive
-                    kennelName
-                    member {
-                        documentId
-                    }
+                    createdAt
+                }
+                pageInfo {
+                    total
+                    pageCount
                 }
             }
-            """
-            data = self._post(query, {'page': page, 'pageSize': page_size})
-            if not data:
-                break
-                
-            breeders_data = data.get('hzdPluginBreeders', [])
-            if not breeders_data:
-                has_more = False
-            else:
-                for breeder in breeders_data:
-                    member = breeder.get('member')
-                    if member and member.get('documentId'):
-                        user_doc_id = member.get('documentId')
-                        breeder_map[user_doc_id] = {
-                            'breederId': breeder.get('documentId'),
-                            'IsActive': breeder.get('IsActive', False),
-                            'kennelName': breeder.get('kennelName'),
-                            'cFlagBreeder': True
-                        }
-                print(f"  Fetched {len(breeders_data)} breeders")
-                if len(breeders_data) < page_size:
-                    has_more = False
-                else:
-                    page += 1
-        return breeder_map
+        }
+        """
+        return self._fetch_pages(query, 'hzdPluginBreeders_connection', variables={'ts': ts}, allow_partial=False)
+
+    def fetch_users_changed_since(self, ts: str, breeders_since: Optional[str] = None,
+                                  document_ids: Optional[List[str]] = None) -> Optional[List[WebsiteUser]]:
+        """
+        User (mit Breeder-Info), die seit ts (updatedAt, inklusive) geändert wurden, deren
+        Breeder seit breeders_since geändert wurde oder deren documentId in document_ids steht.
+        None, wenn nicht alle Seiten geladen werden konnten.
+        """
+        query = """
+        query GetUsersChangedSince($filters: UsersPermissionsUserFiltersInput, $page: Int!, $pageSize: Int!) {
+            usersPermissionsUsers_connection(filters: $filters, pagination: { page: $page, pageSize: $pageSize }) {
+                nodes {""" + USER_FIELDS + USER_BREEDER_FIELDS + """                }
+                pageInfo {
+                    total
+                    pageCount
+                }
+            }
+        }
+        """
+        # gte statt gt: Änderungen in derselben Millisekunde wie der Wasserstand gehen nicht verloren
+        conditions: List[Dict[str, Any]] = [{'updatedAt': {'gte': ts}}]
+        if breeders_since:
+            conditions.append({'breeders': {'updatedAt': {'gte': breeders_since}}})
+        if document_ids:
+            conditions.append({'documentId': {'in': list(document_ids)}})
+        filters = conditions[0] if len(conditions) == 1 else {'or': conditions}
+        nodes = self._fetch_pages(
+            query, 'usersPermissionsUsers_connection', variables={'filters': filters}, allow_partial=False
+        )
+        if nodes is None:
+            return None
+        return [self._user_from_node(u) for u in nodes]
+
+    def fetch_all_users_incremental(self, snapshot: 'UserSnapshot') -> List[WebsiteUser]:
+        """
+        Wie fetch_all_users_with_breeders, aber mit einem lokalen Stand (UserSnapshot): Liefern
+        die Probes dieselbe Anzahl und dasselbe neueste updatedAt wie beim Speichern, wird der
+        Stand ohne weiteren Abruf verwendet; sonst werden nur die seit dem letzten Lauf
+        geänderten User nachgeladen und der zusammengeführte Stand gespeichert.
+
+        Die Wasserstände stammen aus probe_collection vor dem Abruf, damit während des Abrufs
+        geänderte User im nächsten Lauf erneut geladen werden. Bisherige Inhaber seither geänderter
+        Breeder werden mitgeladen, da deren member-Relation geleert oder umgehängt sein kann.
+        Gelöschte User bzw. Breeder (Anzahl passt nicht mehr) oder ein fehlgeschlagener Abruf
+        führen zum vollständigen Abruf.
+        """
+        users_probe = self.probe_collection('usersPermissionsUsers')
+        breeders_probe = self.probe_collection('hzdPluginBreeders')
+        if users_probe is None or breeders_probe is None:
+            print("Probe fehlgeschlagen, lade alle User")
+            return self.fetch_all_users_with_breeders()
+
+        if snapshot.matches(users_probe, breeders_probe):
+            print(f"User-Snapshot aktuell ({len(snapshot.users)} User), kein Abruf nötig")
+            return snapshot.values()
+
+        changed = None
+        if snapshot.users_watermark:
+            print(f"Fetching users changed since {snapshot.users_watermark} from GraphQL...")
+            # Ohne Breeder beim letzten Lauf: neue Breeder sind jünger als der Wasserstand der User
+            breeders_since = snapshot.breeders_watermark or snapshot.users_watermark
+            changed_breeders = self.fetch_breeders_changed_since(breeders_since)
+            # Der Zuwachs muss genau den neu angelegten Breedern entsprechen, sonst wurden Breeder gelöscht
+            # (createdAt und Wasserstand haben dasselbe ISO-Format und lassen sich als Text vergleichen)
+            created = sum(1 for b in changed_breeders or [] if (b.get('createdAt') or '') > breeders_since)
+            if changed_breeders is not None and (snapshot.breeders_total or 0) + created == breeders_probe.total:
+                changed_ids = {b['documentId'] for b in changed_breeders}
+                previous_owners = [u.documentId for u in snapshot.values() if u.breederDocumentId in changed_ids]
+                changed = self.fetch_users_changed_since(snapshot.users_watermark, breeders_since, previous_owners)
+            elif changed_breeders is not None:
+                print(f"  Strapi hat {breeders_probe.total} Breeder, erwartet {(snapshot.breeders_total or 0) + created}: vollständiger Abruf")
+            if changed is not None:
+                snapshot.merge(changed)
+                if len(snapshot.users) == users_probe.total:
+                    print(f"  {len(changed)} geänderte User übernommen ({len(snapshot.users)} gesamt)")
+                    snapshot.update_watermarks(users_probe, breeders_probe)
+                    snapshot.save()
+                    return snapshot.values()
+                print(f"  Lokaler Stand hat {len(snapshot.users)} User, Strapi {users_probe.total}: vollständiger Abruf")
+
+        all_users = self.fetch_all_users_with_breeders()
+        snapshot.replace(all_users)
+        snapshot.update_watermarks(users_probe, breeders_probe)
+        snapshot.save()
+        return all_users
 
     def find_users_by_strapi_email(self, email: str) -> List[Dict[str, Any]]:
         """Users whose Strapi-Loginfeld ``email`` dieser Adresse entspricht (eqi)."""